@@ -1,14 +1,22 @@
+import os
 from flask import Flask, redirect
 from flask_restx import Api
 from flask_cors import CORS
 from app.persistence.repository import SQLAlchemyRepository
-from app.extensions import db, bcrypt, jwt
+from app.extensions import db, bcrypt, jwt, cache, limiter, migrate
+from app.hashing import HasherBusy, password_hasher
+from app.logging_setup import REQUEST_ID_HEADER, configure_logging
+from app.tokens import token_blocklist
 from app.api.v1.users import api as users_ns
 from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.api.v1.auth import api as auth_ns
 from app.api.v1.protector import api as protected_ns
+from app.commands import register_commands
+from app.persistence import routing, search_index, sqlite_pragmas
+from app import metrics, request_timing
+from app.serializers.encoding import output_json
 from config import DevelopmentConfig
 
 def create_app(config_class=DevelopmentConfig):
@@ -17,18 +25,58 @@ def create_app(config_class=DevelopmentConfig):
     
     # Load the configuration
     app.config.from_object(config_class)
+
+    # Non-blocking structured logs with request id correlation
+    configure_logging(app)
     
     # Enable CORS for frontend communication
-    CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
+    CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True,
+         expose_headers=['X-Next-Cursor', 'Link', 'ETag', REQUEST_ID_HEADER])
+
+    # Pool options and optional read replica bind, read by db.init_app
+    routing.configure(app.config)
 
     # Initialize extensions
     db.init_app(app)
+    # Schema migrations (flask db upgrade), scripts in part3/migrations
+    migrate.init_app(app, db, directory=os.path.join(os.path.dirname(app.root_path), 'migrations'))
     bcrypt.init_app(app)
     jwt.init_app(app)
+    token_blocklist.init_app(app, jwt)
+    cache.init_app(app)
+    limiter.init_app(app)
+    password_hasher.init_app(app)
 
     with app.app_context():
-        # Database tables will be created
-        db.create_all()
+        # Per-connection SQLite pragma profile, then a check of what SQLite applied
+        pragmas = app.config.get('SQLITE_PRAGMAS')
+        if sqlite_pragmas.install(db.engine, pragmas):
+            sqlite_pragmas.self_check(db.engine, pragmas)
+        # A SQLite replica is opened read-only: a misrouted write fails loudly
+        if routing.REPLICA in db.engines:
+            replica_pragmas = dict(pragmas or {}, query_only=True)
+            if sqlite_pragmas.install(db.engines[routing.REPLICA], replica_pragmas):
+                sqlite_pragmas.self_check(db.engines[routing.REPLICA], replica_pragmas)
+        # Dev / tests: tables created from the models (primary only: a replica gets its
+        # schema by replication). Production: the schema comes from `flask db upgrade`
+        if app.config.get('DB_AUTO_CREATE', True):
+            db.create_all(bind_key=None)
+            # Full-text index of places (FTS5 table + sync triggers), as in migration 0008
+            search_index.create()
+        # Whether the full-text index is there, checked once (LIKE fallback otherwise)
+        search_index.install()
+        # SQL / serialization timings per request (Server-Timing, slow-request log)
+        request_timing.init_app(app)
+        # Prometheus /metrics: route latency, status codes, DB / bcrypt pools, cache
+        metrics.init_app(app)
+
+    # Read-your-writes stickiness lasts for one request only
+    @app.before_request
+    def reset_replica_routing():
+        routing.reset(db.session)
+
+    # Maintenance CLI commands (flask rebuild-rating-stats, ...)
+    register_commands(app)
 
     #  Configuration JWT pour Swagger UI (ajoute le bouton Authorize)
     authorizations = {
@@ -52,6 +100,15 @@ def create_app(config_class=DevelopmentConfig):
         authorizations=authorizations,  #  Active les autorisations JWT
         security='Bearer'  #  Active la sécurité JWT par défaut
     )
+    # Encodeur JSON rapide (orjson si disponible) pour toutes les réponses
+    # Fast JSON encoder (orjson when available) for every response
+    api.representations['application/json'] = request_timing.timed_representation(output_json)
+
+    # Hachage bcrypt saturé : refus immédiat plutôt qu'une file qui s'allonge
+    # Saturated bcrypt hashing: refuse right away rather than grow a queue
+    @api.errorhandler(HasherBusy)
+    def handle_hasher_busy(error):
+        return {'error': str(error)}, 503, {'Retry-After': '1'}
 
     # Register the namespaces
     api.add_namespace(users_ns, path='/api/v1/users')
@@ -1,6 +1,11 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt
+from flask_jwt_extended import jwt_required
 from app.api.v1 import facade  # Import the shared facade instance
+from app.extensions import cache
+from app.api.v1.bulk import bulk_chunk_size, read_bulk_rows
+from app.api.v1.authorization import is_admin
+from app.serializers.amenity import AMENITY_COLUMNS, serialize_amenity
+from app.conditional import conditional, is_not_modified, precondition_failed, resource_validators
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -9,11 +14,6 @@ amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity')
 })
 
-# Helper function to check admin privileges
-def is_admin_user():
-    claims = get_jwt()  # Retrieve the JWT claims
-    return claims.get('is_admin', False)
-
 
 @api.route('/')
 class AmenityList(Resource):
@@ -26,27 +26,51 @@ class AmenityList(Resource):
         amenity_data = api.payload
         try:
             new_amenity = facade.create_amenity(amenity_data)
-            return {'id': new_amenity.id, 'name': new_amenity.name}, 201
+            return serialize_amenity(new_amenity), 201
         except ValueError as e:
             return {'error': str(e)}, 400
 
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(304, 'Not modified')
+    @conditional
+    @cache.cached('amenities')
     def get(self):
         """Retrieve a list of all amenities"""
-        amenities = facade.get_all_amenities()
-        return [{'id': amenity.id, 'name': amenity.name} for amenity in amenities], 200
+        amenities = facade.get_all_amenities(columns=AMENITY_COLUMNS)
+        return serialize_amenity.many(amenities), 200
+
+
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @jwt_required()
+    @api.expect([amenity_model])
+    @api.response(200, 'Batch processed (per-row results in ids / errors)')
+    @api.response(400, 'Unreadable body or too many rows')
+    def post(self):
+        """Create many amenities, JSON array or NDJSON (All authenticated users); known names return their id"""
+        try:
+            rows = read_bulk_rows()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return facade.bulk_upsert_amenities(rows, bulk_chunk_size()).to_dict(), 200
 
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Not modified')
     @api.response(404, 'Amenity not found')
+    @conditional
+    @cache.cached('amenity:{amenity_id}')
     def get(self, amenity_id):
         """Get amenity details by ID"""
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
-        return {'id': amenity.id, 'name': amenity.name}, 200
+        headers = resource_validators(amenity)
+        if is_not_modified(headers):
+            return None, 304, headers
+        return serialize_amenity(amenity), 200, headers
 
     @jwt_required()
     @api.expect(amenity_model)
@@ -54,17 +78,22 @@ class AmenityResource(Resource):
     @api.response(404, 'Amenity not found')
     @api.response(400, 'Invalid input data')
     @api.response(403, 'Admin privileges required')
+    @api.response(412, 'Amenity has been modified since it was read (If-Match)')
     def put(self, amenity_id):
         """Update an amenity's information (Admin only)"""
-        if not is_admin_user():
+        if not is_admin():
             return {'error': 'Admin privileges required'}, 403
 
+        amenity = facade.get_amenity_for_update(amenity_id)
+        if not amenity:
+            return {'error': 'Amenity not found'}, 404
+        if precondition_failed(amenity):
+            return {'error': 'Amenity has been modified since it was read'}, 412
+
         amenity_data = api.payload
         try:
             updated_amenity = facade.update_amenity(amenity_id, amenity_data)
-            if not updated_amenity:
-                return {'error': 'Amenity not found'}, 404
-            return {'id': updated_amenity.id, 'name': updated_amenity.name}, 200
+            return serialize_amenity(updated_amenity), 200, resource_validators(updated_amenity)
         except ValueError as e:
             return {'error': str(e)}, 400
 
@@ -74,10 +103,10 @@ class AmenityResource(Resource):
     @api.response(403, 'Admin privileges required')
     def delete(self, amenity_id):
         """Delete an amenity (Admin only)"""
-        if not is_admin_user():
+        if not is_admin():
             return {'error': 'Admin privileges required'}, 403
 
-        amenity = facade.get_amenity(amenity_id)
+        amenity = facade.get_amenity_for_update(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
 
@@ -1,7 +1,11 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import (create_access_token, create_refresh_token, get_jwt,
+                                get_jwt_identity, jwt_required)
 from flask import request
 from app.services import facade
+from app.extensions import limiter
+from app.ratelimit import client_ip, json_field
+from app.tokens import token_blocklist
 
 api = Namespace('auth', description='Authentication operations')
 
@@ -10,20 +14,71 @@ login_model = api.model('Login', {
     'password': fields.String(required=True, description='User password')
 })
 
+
+def issue_tokens(user):
+    """
+    Paire jeton d'accès (court) + jeton de rafraîchissement pour `user`
+    Access token (short-lived) + refresh token pair for `user`
+    """
+    claims = {"is_admin": user.is_admin}
+    return {
+        'access_token': create_access_token(identity=str(user.id), additional_claims=claims),
+        'refresh_token': create_refresh_token(identity=str(user.id), additional_claims=claims),
+    }
+
+
 @api.route('/login')
 class Login(Resource):
     @api.expect(login_model, validate=True)
     @api.response(200, 'Login successful')
     @api.response(401, 'Invalid credentials')
+    @api.response(429, 'Too many login attempts (see Retry-After)')
+    @api.response(503, 'Password hashing saturated, retry later')
+    @limiter.limit('login_ip', client_ip)
+    @limiter.limit('login_email', json_field('email'))
     def post(self):
         data = request.get_json() or {}
         email = (data.get('email') or '').strip()
         password = data.get('password') or ''
-        user = facade.get_user_by_email(email)
-        if not user or not user.verify_password(password):
+        user = facade.authenticate(email, password)
+        if not user:
             return {'error': 'Invalid credentials'}, 401
         
-        access_token = create_access_token(
-           identity=str(user.id),
-            additional_claims={"is_admin": user.is_admin})
-        return {'access_token': access_token}, 200
+        # Les échecs précédents ne comptent plus contre ce compte
+        limiter.reset('login_email', email.lower())
+
+        return issue_tokens(user), 200
+
+
+@api.route('/refresh')
+class Refresh(Resource):
+    @api.response(200, 'New access and refresh tokens')
+    @api.response(401, 'Missing, expired or revoked refresh token')
+    @jwt_required(refresh=True)
+    def post(self):
+        """
+        Rotation : le jeton de rafraîchissement présenté est révoqué et une
+        nouvelle paire est émise ; le rejouer ensuite donne 401.
+        Rotation: the presented refresh token is revoked and a new pair is
+        issued; replaying it afterwards gives 401.
+        """
+        # Relu en base : un compte supprimé ou rétrogradé ne se renouvelle pas
+        user = facade.get_user(get_jwt_identity())
+        if not user:
+            return {'error': 'User not found'}, 401
+        token_blocklist.revoke(get_jwt())
+        return issue_tokens(user), 200
+
+
+@api.route('/logout')
+class Logout(Resource):
+    @api.response(200, 'Token revoked')
+    @api.response(401, 'Missing, expired or revoked token')
+    @jwt_required(verify_type=False)
+    def post(self):
+        """
+        Révoque le jeton présenté (accès ou rafraîchissement)
+        Revoke the presented token (access or refresh)
+        """
+        token_blocklist.revoke(get_jwt())
+        return {'message': 'Token revoked'}, 200
@@ -0,0 +1,59 @@
+"""
+Règles d'autorisation partagées, évaluées depuis le JWT
+Shared authorization rules, evaluated from the JWT
+
+L'identité et la claim is_admin viennent du token : aucune décision ne
+charge l'utilisateur courant. Pour une ressource possédée, seule la colonne
+owner_id / user_id est comparée (déjà sur la ligne chargée, ou lue seule
+via facade.get_place_owner_id), jamais la relation owner / user.
+Identity and the is_admin claim come from the token: no decision loads
+the current user. For an owned resource only the owner_id / user_id
+column is compared (already on the loaded row, or read alone through
+facade.get_place_owner_id), never the owner / user relationship.
+"""
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+
+def current_user_id():
+    """
+    ID de l'utilisateur authentifié (entier), None si l'identité est invalide
+    Authenticated user ID (integer), None if the identity is invalid
+    """
+    return _as_id(get_jwt_identity())
+
+
+def is_admin():
+    """Claim is_admin du JWT / is_admin claim of the JWT"""
+    return bool(get_jwt().get('is_admin', False))
+
+
+def is_self(user_id):
+    """
+    Vrai si `user_id` (chemin de l'URL, str ou int) désigne l'utilisateur authentifié
+    True if `user_id` (URL path, str or int) is the authenticated user
+    """
+    current = current_user_id()
+    return current is not None and _as_id(user_id) == current
+
+
+def is_self_or_admin(user_id):
+    """Règle des routes /users/<id> : soi-même ou admin / Self or admin."""
+    return is_admin() or is_self(user_id)
+
+
+def can_modify(owner_id):
+    """
+    Règle des ressources possédées (places, avis) : propriétaire ou admin
+    Rule for owned resources (places, reviews): owner or admin
+
+    Args:
+        owner_id: Colonne owner_id / user_id de la ressource / The resource's owner column
+    """
+    return is_admin() or is_self(owner_id)
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
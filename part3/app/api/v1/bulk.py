@@ -0,0 +1,48 @@
+"""
+Lecture du corps des endpoints d'import en lot
+Body parsing for the bulk import endpoints
+
+Accepte un tableau JSON ou du NDJSON (Content-Type: application/x-ndjson).
+Accepts a JSON array or NDJSON (Content-Type: application/x-ndjson).
+"""
+import json
+from flask import current_app, request
+from app.serializers.encoding import NDJSON_MIMETYPE
+
+
+def read_bulk_rows():
+    """
+    Retourne la liste des lignes du corps de la requête.
+    Return the list of rows of the request body.
+
+    Une ligne NDJSON illisible devient None : elle est rapportée en erreur
+    par la facade sans faire échouer les autres lignes.
+    An unreadable NDJSON line becomes None: the facade reports it as an
+    error without failing the other rows.
+
+    :raises ValueError: Corps illisible ou trop de lignes / Unreadable body or too many rows.
+    """
+    if request.mimetype == NDJSON_MIMETYPE:
+        rows = [_parse_line(line) for line in request.get_data().splitlines() if line.strip()]
+    else:
+        rows = request.get_json(silent=True)
+        if not isinstance(rows, list):
+            raise ValueError("Body must be a JSON array or NDJSON (application/x-ndjson)")
+    if not rows:
+        raise ValueError("Body contains no rows")
+    max_rows = current_app.config['BULK_MAX_ROWS']
+    if len(rows) > max_rows:
+        raise ValueError(f"Too many rows: {len(rows)} (maximum {max_rows} per request)")
+    return rows
+
+
+def bulk_chunk_size():
+    """Lignes insérées par tranche / Rows inserted per chunk."""
+    return current_app.config['BULK_CHUNK_SIZE']
+
+
+def _parse_line(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
@@ -0,0 +1,94 @@
+"""
+Pagination keyset partagée par les endpoints de collection
+Keyset pagination shared by collection endpoints
+"""
+import base64
+import json
+from urllib.parse import urlencode
+from flask import current_app, request
+from app.serializers.encoding import dumps
+
+
+def add_pagination_arguments(parser):
+    """
+    Ajoute les paramètres limit / after à un parser de requête
+    Add the limit / after query parameters to a request parser
+    """
+    parser.add_argument('limit', type=int, location='args',
+                        help='Page size (default API_PAGE_SIZE, capped at API_MAX_PAGE_SIZE)')
+    parser.add_argument('after', type=int, location='args',
+                        help='Cursor: value of the X-Next-Cursor header of the previous page')
+    return parser
+
+
+def page_limit(requested):
+    """
+    Retourne la taille de page effective, bornée par la configuration
+    Return the effective page size, bounded by configuration
+
+    Raises:
+        ValueError: Si la taille demandée n'est pas positive / If not positive
+    """
+    if requested is None:
+        return current_app.config['API_PAGE_SIZE']
+    if requested < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(requested, current_app.config['API_MAX_PAGE_SIZE'])
+
+
+def next_page_headers(next_cursor, param='after'):
+    """
+    En-têtes X-Next-Cursor et Link (rel="next") pour la page suivante
+    X-Next-Cursor and Link (rel="next") headers for the next page
+
+    Args:
+        param: Paramètre de requête portant le curseur / Query parameter carrying the cursor
+    """
+    if next_cursor is None:
+        return {}
+    next_args = request.args.to_dict(flat=False)
+    next_args[param] = [next_cursor]
+    return {
+        'X-Next-Cursor': next_cursor,
+        'Link': f'<{request.base_url}?{urlencode(next_args, doseq=True)}>; rel="next"',
+    }
+
+
+def encode_cursor(values):
+    """
+    Curseur opaque d'une pagination triée : (valeur de la clé, id) en JSON base64url
+    Opaque cursor of a sorted pagination: (key value, id) as base64url JSON
+    """
+    return base64.urlsafe_b64encode(dumps(list(values))).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(token):
+    """
+    Inverse de encode_cursor ; None si pas de curseur
+    Inverse of encode_cursor; None when there is no cursor
+
+    Raises:
+        ValueError: Curseur illisible / Unreadable cursor
+    """
+    if token is None:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def id_cursor(token):
+    """
+    Curseur de la pagination sur l'id (entier) ; None si pas de curseur
+    Cursor of the id pagination (an integer); None when there is no cursor
+    """
+    if token is None:
+        return None
+    try:
+        return int(token)
+    except ValueError:
+        raise ValueError('Invalid cursor: after must be an integer')
@@ -6,9 +6,19 @@ Ce module gère les opérations CRUD pour les lieux (places) avec authentificati
 This module handles CRUD operations for places with JWT authentication
 """
 import logging
+from flask import current_app
 from flask_restx import Namespace, Resource, fields
 from app.api.v1 import facade  # Import the shared facade instance
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from app.extensions import cache
+from app.conditional import conditional, is_not_modified, precondition_failed, resource_validators
+from app.api.v1.bulk import bulk_chunk_size, read_bulk_rows
+from app.api.v1.pagination import (add_pagination_arguments, decode_cursor, encode_cursor, id_cursor,
+                                   next_page_headers, page_limit)
+from app.services.geo import parse_bbox
+from app.serializers.place import serialize_place
+from app.serializers.encoding import ndjson_response, wants_ndjson
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.v1.authorization import can_modify, current_user_id, is_admin
 
 # Configuration du logger pour le debugging
 # Logger configuration for debugging
@@ -46,6 +56,47 @@ place_update_model = api.model('PlaceUpdate', {
 })
 
 
+# Tris de la liste, servis par un index (clé, id) ; distance : recherche par anneaux
+# List sorts, served by a (key, id) index; distance: ring search
+PLACE_SORTS = ('price', '-price', 'rating', '-rating', 'created_at', '-created_at', 'distance')
+
+# Paramètres de requête pour la liste paginée des places
+# Query parameters for the paginated list of places
+place_list_parser = add_pagination_arguments(api.parser())
+place_list_parser.add_argument('min_price', type=float, location='args', help='Minimum price per night')
+place_list_parser.add_argument('max_price', type=float, location='args', help='Maximum price per night')
+place_list_parser.add_argument('owner_id', type=int, location='args', help='Only places of this owner')
+place_list_parser.add_argument('amenity', type=int, location='args', action='append',
+                               help='Amenity ID (repeatable, places must have all of them)')
+place_list_parser.add_argument('stream', type=str, location='args',
+                               help='1 to stream every matching place as NDJSON (same as Accept: application/x-ndjson)')
+place_list_parser.add_argument('sort', type=str, location='args', choices=PLACE_SORTS,
+                               help='Sort order (default: id); with a sort, after is an opaque cursor')
+place_list_parser.add_argument('lat', type=float, location='args', help='sort=distance: latitude of the point')
+place_list_parser.add_argument('lng', type=float, location='args', help='sort=distance: longitude of the point')
+place_list_parser.add_argument('radius_km', type=float, location='args',
+                               help='sort=distance: only places within this radius')
+# Avec un tri, le curseur after est opaque (valeur de la clé, id)
+# With a sort, the after cursor is opaque (key value, id)
+place_list_parser.replace_argument('after', type=str, location='args',
+                                   help='Cursor: value of the X-Next-Cursor header of the previous page')
+
+
+# Paramètres de la recherche géographique
+# Geo search query parameters
+place_search_parser = api.parser()
+place_search_parser.add_argument('q', type=str, location='args', help='Full-text query on title and description')
+place_search_parser.add_argument('offset', type=int, location='args',
+                                 help='Full-text search only: value of the X-Next-Cursor header of the previous page')
+place_search_parser.add_argument('lat', type=float, location='args', help='Latitude of the center (with lng and radius_km)')
+place_search_parser.add_argument('lng', type=float, location='args', help='Longitude of the center (with lat and radius_km)')
+place_search_parser.add_argument('radius_km', type=float, location='args', help='Search radius in kilometers')
+place_search_parser.add_argument('bbox', type=str, location='args',
+                                 help='Bounding box "min_lng,min_lat,max_lng,max_lat" (alternative to lat/lng/radius_km)')
+place_search_parser.add_argument('limit', type=int, location='args',
+                                 help='Maximum number of results (default API_PAGE_SIZE)')
+
+
 # ==================== ROUTES COLLECTION /places/ ====================
 
 @api.route('/')
@@ -104,43 +155,65 @@ class PlaceList(Resource):
 
             # Retour du place créé avec status 201 (Created)
             # Return created place with status 201 (Created)
-            return {
-                'id': new_place.id,
-                'title': new_place.title,
-                'description': new_place.description,
-                'price': new_place.price,
-                'latitude': new_place.latitude,
-                'longitude': new_place.longitude,
-                'owner_id': new_place.owner.id,
-                'amenities': [amenity.id for amenity in new_place.amenities]
-            }, 201
+            return serialize_place(new_place), 201
             
         except ValueError as e:
             # Erreur de validation (ex: prix négatif, coordonnées invalides)
             # Validation error (e.g., negative price, invalid coordinates)
-            logger.error(f"Validation error while creating place: {str(e)}")
+            logger.error("Validation error while creating place: %s", e)
             return {'error': str(e)}, 400
         
         except Exception as e:
             # Erreur inattendue
             # Unexpected error
-            logger.error(f"Unexpected error while creating place: {str(e)}")
+            logger.error("Unexpected error while creating place: %s", e)
             return {'error': 'Internal server error'}, 500
 
     # ==================== GET - Lister tous les places ====================
     
     @api.doc('list_places')  # Pas de security='Bearer' car endpoint public
+    @api.expect(place_list_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(304, 'Not modified (If-None-Match)')
+    @api.response(400, 'Invalid query parameters')
+    @conditional
+    @cache.cached('places')  # Invalidé par la facade à chaque écriture / Invalidated by facade writes
     def get(self):
         """
-        Retrieve a list of all places
-        Récupérer la liste de tous les lieux
+        Retrieve a page of places
+        Récupérer une page de lieux
         
         Authentification requise : NON (endpoint public)
         Authentication required: NO (public endpoint)
         
+        Pagination keyset sur l'id : passer la valeur de l'en-tête
+        X-Next-Cursor dans le paramètre `after` pour obtenir la page suivante.
+        Keyset pagination on id: pass the X-Next-Cursor header value as the
+        `after` parameter to fetch the next page.
+        
+        Tri côté serveur : sort=price|-price|rating|-rating|created_at|-created_at
+        (pagination keyset sur (clé, id), coût constant quelle que soit la
+        page) ou sort=distance avec lat, lng et éventuellement radius_km
+        (champ distance_km ajouté). La note des lieux sans avis vaut 0.
+        Server-side sort: sort=price|-price|rating|-rating|created_at|-created_at
+        (keyset pagination on (key, id), constant cost whatever the page) or
+        sort=distance with lat, lng and optionally radius_km (adds a
+        distance_km field). Places without reviews rate 0.
+        
+        Export NDJSON : `Accept: application/x-ndjson` ou `?stream=1` envoie
+        toutes les places filtrées en flux, une par ligne (reprise avec after).
+        NDJSON export: `Accept: application/x-ndjson` or `?stream=1` streams
+        every filtered place, one per line (resume with after).
+        
+        Query parameters:
+            limit, after, min_price, max_price, owner_id, amenity (repeatable), stream,
+            sort, lat, lng, radius_km
+        
         Returns:
-            200: Liste de tous les places / List of all places
+            200: Page de places / Page of places
+                 Headers X-Next-Cursor et Link (rel="next") si une page suit
+                 X-Next-Cursor and Link (rel="next") headers when a page follows
+            400: Paramètres invalides / Invalid query parameters
         
         Example response:
             [
@@ -152,27 +225,171 @@ class PlaceList(Resource):
                     "latitude": 45.5,
                     "longitude": -73.6,
                     "owner_id": 2,
-                    "amenities": [1, 3, 5]
+                    "amenities": [1, 3, 5],
+                    "review_count": 4,
+                    "average_rating": 4.25,
+                    "rating_histogram": {"1": 0, "2": 0, "3": 1, "4": 1, "5": 2}
                 },
                 ...
             ]
         """
-        # Récupération de tous les places via la facade
-        # Retrieve all places through the facade
-        places = facade.get_all_places()
-        
-        # Sérialisation de chaque place en dictionnaire
-        # Serialize each place to dictionary
-        return [{
-            'id': place.id,
-            'title': place.title,
-            'description': place.description,
-            'price': place.price,
-            'latitude': place.latitude,
-            'longitude': place.longitude,
-            'owner_id': place.owner.id,
-            'amenities': [amenity.id for amenity in place.amenities]
-        } for place in places], 200
+        args = place_list_parser.parse_args()
+        filters = {
+            'min_price': args['min_price'],
+            'max_price': args['max_price'],
+            'owner_id': args['owner_id'],
+            'amenity_ids': args['amenity'],
+        }
+
+        sort = args['sort']
+
+        try:
+            # Export en flux : toutes les places filtrées, une par ligne (limit ignoré)
+            # Streaming export: every filtered place, one per line (limit ignored)
+            if wants_ndjson():
+                if sort is not None:
+                    return {'error': 'sort is not supported with the NDJSON export'}, 400
+                batch_size = current_app.config['STREAM_BATCH_SIZE']
+                return ndjson_response(facade.stream_places(batch_size, after=id_cursor(args['after']),
+                                                            **filters), serialize_place)
+
+            # Taille de page bornée par la configuration
+            # Page size bounded by configuration
+            limit = page_limit(args['limit'])
+
+            if sort == 'distance':
+                if args['lat'] is None or args['lng'] is None:
+                    return {'error': 'sort=distance requires lat and lng'}, 400
+                results, next_cursor = facade.get_places_by_distance(
+                    args['lat'], args['lng'], limit, after=decode_cursor(args['after']),
+                    radius_km=args['radius_km'], **filters)
+                return [dict(serialize_place(place), distance_km=round(distance, 3))
+                        for place, distance in results], 200, \
+                    next_page_headers(encode_cursor(next_cursor) if next_cursor else None)
+
+            # Récupération d'une page de places via la facade (filtrée et triée en SQL)
+            # Retrieve one page of places through the facade (filtered and sorted in SQL)
+            if sort is None:
+                places, next_cursor = facade.get_places_page(limit, after=id_cursor(args['after']), **filters)
+            else:
+                places, next_cursor = facade.get_places_page(limit, after=decode_cursor(args['after']),
+                                                             sort=sort, **filters)
+                next_cursor = encode_cursor(next_cursor) if next_cursor else None
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        # Sérialisation de la page (fonction précompilée)
+        # Serialize the page (precompiled function)
+        return serialize_place.many(places), 200, next_page_headers(next_cursor)
+
+
+# ==================== ROUTE IMPORT EN LOT /places/bulk ====================
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    """
+    Import de places en lot
+    Bulk import of places
+    """
+
+    @api.doc('bulk_create_places', security='Bearer')
+    @jwt_required()
+    @api.expect([place_model])
+    @api.response(200, 'Batch processed (per-row results in ids / errors)')
+    @api.response(400, 'Unreadable body or too many rows')
+    @api.response(401, 'Unauthorized - Missing or invalid JWT token')
+    def post(self):
+        """
+        Create many places in one request
+        Créer plusieurs lieux en une requête
+        
+        Authentification requise : OUI (JWT Bearer token)
+        Authentication required: YES (JWT Bearer token)
+        
+        Corps : tableau JSON ou NDJSON (Content-Type: application/x-ndjson).
+        Les places appartiennent à l'utilisateur authentifié ; un admin peut
+        fixer owner_id ligne par ligne.
+        Body: JSON array or NDJSON (Content-Type: application/x-ndjson).
+        Places belong to the authenticated user; an admin may set owner_id
+        row by row.
+        
+        Returns:
+            200: {"created", "updated", "unchanged", "failed", "ids", "errors"}
+                 ids est aligné sur l'entrée (None pour une ligne en erreur)
+                 ids is aligned with the input (None for a failed row)
+            400: Corps illisible ou trop de lignes / Unreadable body or too many rows
+        """
+        try:
+            rows = read_bulk_rows()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        report = facade.bulk_create_places(
+            rows, current_user_id(), bulk_chunk_size(), allow_owner_override=is_admin())
+        return report.to_dict(), 200
+
+
+# ==================== ROUTE RECHERCHE /places/search ====================
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    """
+    Recherche de places
+    Place search
+    """
+
+    @api.doc('search_places')  # Endpoint public
+    @api.expect(place_search_parser)
+    @api.response(200, 'Places ordered by distance')
+    @api.response(304, 'Not modified (If-None-Match)')
+    @api.response(400, 'Invalid query parameters')
+    @conditional
+    @cache.cached('places')
+    def get(self):
+        """
+        Search places by text, around a point or inside a bounding box
+        Rechercher des lieux par texte, autour d'un point ou dans une zone
+        
+        Authentification requise : NON (endpoint public)
+        Authentication required: NO (public endpoint)
+        
+        Modes:
+            - ?q= : recherche plein texte classée BM25, avec extrait et
+                    pagination par offset (X-Next-Cursor)
+                    full-text search ranked by BM25, with snippet and
+                    offset pagination (X-Next-Cursor)
+            - ?lat=&lng=&radius_km= : places dans le rayon / places within the radius
+            - ?bbox=min_lng,min_lat,max_lng,max_lat : places dans la zone / places in the box
+        
+        Les résultats géographiques sont triés par distance (au point, ou au
+        centre de la zone) et portent un champ distance_km.
+        Geo results are ordered by distance (to the point, or to the box
+        center) and carry a distance_km field.
+        
+        Returns:
+            200: Liste de places / List of places
+            400: Paramètres invalides / Invalid query parameters
+        """
+        args = place_search_parser.parse_args()
+
+        try:
+            limit = page_limit(args['limit'])
+            if args['q'] is not None:
+                hits, next_offset = facade.search_places_text(args['q'], limit, args['offset'] or 0)
+                return [dict(serialize_place(place), snippet=snippet) for place, snippet in hits], \
+                    200, next_page_headers(next_offset, param='offset')
+            if args['bbox'] is not None:
+                lat_range, lng_ranges, center = parse_bbox(args['bbox'])
+                results = facade.search_places_in_bbox(lat_range, lng_ranges, center, limit)
+            elif None not in (args['lat'], args['lng'], args['radius_km']):
+                results = facade.search_places_near(args['lat'], args['lng'], args['radius_km'], limit)
+            else:
+                return {'error': 'Provide q, lat/lng/radius_km, or bbox'}, 400
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return [dict(serialize_place(place), distance_km=round(distance, 3))
+                for place, distance in results], 200
 
 
 # ==================== ROUTES RESSOURCE /places/<place_id> ====================
@@ -188,7 +405,10 @@ class PlaceResource(Resource):
     
     @api.doc('get_place')  # Pas de security='Bearer' car endpoint public
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(304, 'Not modified (If-None-Match / If-Modified-Since)')
     @api.response(404, 'Place not found')
+    @conditional
+    @cache.cached('place:{place_id}')
     def get(self, place_id):
         """
         Get place details by ID
@@ -201,7 +421,8 @@ class PlaceResource(Resource):
             place_id (int): ID du place / Place ID
         
         Returns:
-            200: Détails du place / Place details
+            200: Détails du place / Place details (headers ETag, Last-Modified)
+            304: Représentation inchangée / Representation unchanged
             404: Place non trouvé / Place not found
         """
         # Recherche du place par son ID
@@ -213,17 +434,15 @@ class PlaceResource(Resource):
         if not place:
             return {'error': 'Place not found'}, 404
 
+        # Validateurs calculés depuis (id, updated_at) : 304 sans sérialiser
+        # Validators computed from (id, updated_at): 304 without serializing
+        headers = resource_validators(place)
+        if is_not_modified(headers):
+            return None, 304, headers
+
         # Retour des détails du place avec status 200
         # Return place details with status 200
-        return {
-            'id': place.id,
-            'title': place.title,
-            'description': place.description,
-            'price': place.price,
-            'latitude': place.latitude,
-            'longitude': place.longitude,
-            'amenities': [amenity.id for amenity in place.amenities]
-        }, 200
+        return serialize_place(place), 200, headers
 
     # ==================== PUT - Mettre à jour un place ====================
     
@@ -235,6 +454,7 @@ class PlaceResource(Resource):
     @api.response(403, 'Unauthorized action - You are not the owner')
     @api.response(400, 'Invalid input data')
     @api.response(401, 'Unauthorized - Missing or invalid JWT token')
+    @api.response(412, 'Precondition failed - If-Match does not match the current ETag')
     def put(self, place_id):
         """
         Update a place's information
@@ -257,39 +477,36 @@ class PlaceResource(Resource):
             403: Non autorisé (pas le propriétaire) / Unauthorized (not the owner)
             404: Place non trouvé / Place not found
             400: Données invalides / Invalid input data
+            412: If-Match ne correspond plus / If-Match no longer matches
         """
-        # Récupération de l'identité de l'utilisateur authentifié
-        # Get the authenticated user's identity (returns user ID as string)
-        current_user = get_jwt_identity()
-        
-        # Récupération des claims JWT (contient is_admin, etc.)
-        # Get JWT claims (contains is_admin, etc.)
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
-
         try:
             # Vérification de l'existence du place
             # Check if place exists
-            place = facade.get_place(place_id)
+            place = facade.get_place_for_update(place_id)
             if not place:
                 return {'error': "Place not found"}, 404
             
             # ✅ CONTRÔLE D'ACCÈS / ACCESS CONTROL
-            # Vérifier que l'utilisateur est soit :
-            # Check that the user is either:
-            # 1. Le propriétaire du place (owner)
-            # 2. Un administrateur (admin bypass)
-            if not is_admin and str(place.owner.id) != current_user:
+            # Propriétaire ou admin, d'après le JWT et la colonne owner_id
+            # (pas de chargement de la relation owner)
+            # Owner or admin, from the JWT and the owner_id column
+            # (the owner relationship is not loaded)
+            if not can_modify(place.owner_id):
                 logger.warning(
-                    f"Unauthorized update attempt on place {place_id} "
-                    f"by user {current_user}"
+                    "Unauthorized update attempt on place %s by user %s",
+                    place_id, get_jwt_identity()
                 )
                 return {'error': "Unauthorized action"}, 403
 
+            # Mise à jour concurrente : le client a modifié une version périmée
+            # Concurrent update: the client edited a stale version
+            if precondition_failed(place):
+                return {'error': "Place has been modified since it was read"}, 412
+
             # Récupération des données de mise à jour
             # Get update data
             update_data = api.payload
-            logger.debug(f"Updating place {place_id} with data: {update_data}")
+            logger.debug("Updating place %s with data: %s", place_id, update_data)
 
             # Mise à jour du place via la facade
             # Update place through facade
@@ -297,27 +514,18 @@ class PlaceResource(Resource):
             
             # Retour du place mis à jour avec status 200
             # Return updated place with status 200
-            return {
-                'id': updated_place.id,
-                'title': updated_place.title,
-                'description': updated_place.description,
-                'price': updated_place.price,
-                'latitude': updated_place.latitude,
-                'longitude': updated_place.longitude,
-                'owner_id': updated_place.owner.id,
-                'amenities': [amenity.id for amenity in updated_place.amenities]
-            }, 200
+            return serialize_place(updated_place), 200, resource_validators(updated_place)
 
         except ValueError as e:
             # Erreur de validation métier
             # Business validation error
-            logger.error(f"Validation error while updating place: {str(e)}")
+            logger.error("Validation error while updating place: %s", e)
             return {'error': str(e)}, 400
         
         except Exception as e:
             # Erreur inattendue
             # Unexpected error
-            logger.error(f"Unexpected error while updating place: {str(e)}")
+            logger.error("Unexpected error while updating place: %s", e)
             return {'error': "Internal server error"}, 500
 
     # ==================== DELETE - Supprimer un place ====================
@@ -350,33 +558,24 @@ class PlaceResource(Resource):
             403: Non autorisé (pas le propriétaire) / Unauthorized (not the owner)
             404: Place non trouvé / Place not found
         """
-        # Récupération de l'identité de l'utilisateur authentifié
-        # Get the authenticated user's identity (returns user ID as string)
-        current_user = get_jwt_identity()
-        
-        # Récupération des claims JWT
-        # Get JWT claims
-        claims = get_jwt()
-        is_admin = claims.get('is_admin', False)
-
         try:
             # Vérification de l'existence du place
             # Check if place exists
-            place = facade.get_place(place_id)
+            place = facade.get_place_for_update(place_id)
             if not place:
                 return {'error': "Place not found"}, 404
             
             # ✅ CONTRÔLE D'ACCÈS / ACCESS CONTROL
-            # Vérifier que l'utilisateur est soit le propriétaire soit admin
-            # Check that the user is either the owner or admin
-            if not is_admin and str(place.owner.id) != current_user:
+            # Propriétaire ou admin (colonne owner_id, sans lazy load)
+            # Owner or admin (owner_id column, no lazy load)
+            if not can_modify(place.owner_id):
                 logger.warning(
-                    f"Unauthorized deletion attempt on place {place_id} "
-                    f"by user {current_user}"
+                    "Unauthorized deletion attempt on place %s by user %s",
+                    place_id, get_jwt_identity()
                 )
                 return {'error': "Unauthorized action"}, 403
 
-            logger.debug(f"Deleting place {place_id}")
+            logger.debug("Deleting place %s", place_id)
 
             # Suppression du place via la facade
             # Delete place through facade
@@ -389,5 +588,5 @@ class PlaceResource(Resource):
         except Exception as e:
             # Erreur inattendue
             # Unexpected error
-            logger.error(f"Unexpected error while deleting a place: {str(e)}")
+            logger.error("Unexpected error while deleting a place: %s", e)
             return {'error': "Internal server error"}, 500
\ No newline at end of file
@@ -1,15 +1,18 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required
 from app.services.facade import HBnBFacade
+from app.extensions import cache
+from flask import current_app
+from app.serializers.encoding import ndjson_response, wants_ndjson
+from app.serializers.review import REVIEW_COLUMNS, serialize_review, serialize_place_review
+from app.conditional import conditional, is_not_modified, precondition_failed, resource_validators
+from app.api.v1.bulk import bulk_chunk_size, read_bulk_rows
+from app.api.v1.authorization import can_modify, current_user_id, is_self
+from app.api.v1.pagination import add_pagination_arguments, page_limit, next_page_headers
 
 api = Namespace('reviews', description='Review operations')
 facade = HBnBFacade()
 
-# Helper function to check admin privileges
-def is_admin_user():
-    claims = get_jwt()
-    return claims.get('is_admin', False)
-
 # Define the review model for input validation and documentation
 review_model = api.model('Review', {
     'text': fields.String(required=True, description='Text of the review'),
@@ -23,6 +26,9 @@ review_update_model = api.model('ReviewUpdate', {
     'rating': fields.Integer(description='Rating of the place (1-5)')
 })
 
+# Query parameters for the paginated reviews of a place
+place_reviews_parser = add_pagination_arguments(api.parser())
+
 @api.route('/')
 class ReviewList(Resource):
     @jwt_required()  # Require authentication to create a review
@@ -30,15 +36,19 @@ class ReviewList(Resource):
     @api.response(201, 'Review successfully created')
     @api.response(400, 'Invalid input data')
     @api.response(403, "You cannot review your own place")
+    @api.response(404, 'Place not found')
     def post(self):
         """Register a new review"""
-        current_user = get_jwt_identity()  # Get the authenticated user's identity (user ID)
+        current_user = current_user_id()  # Get the authenticated user's identity (user ID)
         review_data = api.payload
 
         try:
             # Validate that the user is not reviewing their own place
-            place = facade.get_place(review_data['place_id'])
-            if place.owner.id == current_user:
+            # (single-column owner_id query, the place itself is not loaded)
+            owner_id = facade.get_place_owner_id(review_data['place_id'])
+            if owner_id is None:
+                return {'error': "Place not found"}, 404
+            if is_self(owner_id):
                 return {'error': "You cannot review your own place"}, 403
 
             # Validate that the user has not already reviewed this place
@@ -50,72 +60,85 @@ class ReviewList(Resource):
 
             # Create the review using the facade
             new_review = facade.create_review(review_data)
-            return {
-                'id': new_review.id,
-                'text': new_review.text,
-                'rating': new_review.rating,
-                'user_id': new_review.user.id,
-                'place_id': new_review.place.id
-            }, 201
+            return serialize_review(new_review), 201
         except ValueError as e:
             return {'error': str(e)}, 400
 
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(304, 'Not modified')
+    @conditional
     def get(self):
-        """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
-        return [{'id': review.id,
-                 'text': review.text,
-                 'rating': review.rating,
-                 'user_id': review.user.id,
-                 'place_id': review.place.id} for review in reviews], 200
+        """Retrieve a list of all reviews (NDJSON stream with Accept: application/x-ndjson or ?stream=1)"""
+        if wants_ndjson():
+            batch_size = current_app.config['STREAM_BATCH_SIZE']
+            return ndjson_response(facade.stream_reviews(REVIEW_COLUMNS, batch_size), serialize_review)
+        reviews = facade.get_all_reviews(columns=REVIEW_COLUMNS)
+        return serialize_review.many(reviews), 200
+
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    @jwt_required()
+    @api.expect([review_model])
+    @api.response(200, 'Batch processed (per-row results in ids / errors)')
+    @api.response(400, 'Unreadable body or too many rows')
+    @api.response(404, 'User not found')
+    def post(self):
+        """Create or update many reviews of the current user, JSON array or NDJSON (upsert on place_id)"""
+        try:
+            rows = read_bulk_rows()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        try:
+            report = facade.bulk_upsert_reviews(rows, current_user_id(), bulk_chunk_size())
+        except ValueError as e:
+            # Compte supprimé, jeton encore valide / Deleted account, token still valid
+            return {'error': str(e)}, 404
+        return report.to_dict(), 200
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(304, 'Not modified')
     @api.response(404, 'Review not found')
+    @conditional
     def get(self, review_id):
         """Get review details by ID"""
         review = facade.get_review(review_id)
         if not review:
             return {'error': 'Review not found'}, 404
-        return {
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            'user_id': review.user.id,
-            'place_id': review.place.id
-        }, 200
+        headers = resource_validators(review)
+        if is_not_modified(headers):
+            return None, 304, headers
+        return serialize_review(review), 200, headers
 
     @jwt_required()  # Require authentication to update a review
     @api.expect(review_update_model)
     @api.response(200, 'Review updated successfully')
     @api.response(404, 'Review not found')
     @api.response(403, "Unauthorized action")
+    @api.response(412, 'Review has been modified since it was read (If-Match)')
     def put(self, review_id):
         """Update a review's information"""
-        current_user = get_jwt_identity()  # Get the authenticated user's identity (user ID)
         try:
             # Retrieve the existing review
-            review = facade.get_review(review_id)
+            review = facade.get_review_for_update(review_id)
             if not review:
                 return {'error': "Review not found"}, 404
 
             # Check if the current user is the creator of the review OR is admin
-            if str(review.user.id) != current_user and not is_admin_user():
+            # (user_id column of the loaded row, no lazy load of review.user)
+            if not can_modify(review.user_id):
                 return {'error': "Unauthorized action"}, 403
 
+            # If-Match: refuse to overwrite a version the client has not seen
+            if precondition_failed(review):
+                return {'error': "Review has been modified since it was read"}, 412
+
             update_data = api.payload
 
             # Update the review using the facade
             updated_review = facade.update_review(review_id, update_data)
-            return {
-                'id': updated_review.id,
-                'text': updated_review.text,
-                'rating': updated_review.rating,
-                'user_id': updated_review.user.id,
-                'place_id': updated_review.place.id
-            }, 200
+            return serialize_review(updated_review), 200, resource_validators(updated_review)
 
         except ValueError as e:
             return {'error': str(e)}, 400
@@ -126,15 +149,15 @@ class ReviewResource(Resource):
     @api.response(403, "Unauthorized action - You are not the review author or admin")
     def delete(self, review_id):
         """Delete a review (Owner or Admin)"""
-        current_user = get_jwt_identity()  # Get the authenticated user's identity (user ID)
         try:
             # Retrieve the existing review
-            review = facade.get_review(review_id)
+            review = facade.get_review_for_update(review_id)
             if not review:
                 return {'error': "Review not found"}, 404
 
             # Check if the current user is the creator of the review OR is admin
-            if str(review.user.id) != current_user and not is_admin_user():
+            # (user_id column of the loaded row, no lazy load of review.user)
+            if not can_modify(review.user_id):
                 return {'error': "Unauthorized action"}, 403
 
             # Delete the review using the facade
@@ -146,16 +169,22 @@ class ReviewResource(Resource):
 
 @api.route('/places/<place_id>/reviews')
 class PlaceReviewList(Resource):
-    @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.expect(place_reviews_parser)
+    @api.response(200, 'Page of reviews for the place retrieved successfully')
+    @api.response(400, 'Invalid query parameters')
+    @api.response(304, 'Not modified')
     @api.response(404, 'Place not found')
+    @conditional
+    @cache.cached('place_reviews', 'place_reviews:{place_id}')
     def get(self, place_id):
-        """Get all reviews for a specific place"""
+        """Get a page of reviews for a specific place (next page cursor in X-Next-Cursor)"""
+        args = place_reviews_parser.parse_args()
+        try:
+            limit = page_limit(args['limit'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
         try:
-            reviews = facade.get_reviews_by_place(place_id)
-            return [{'id': review.id,
-                     'text': review.text,
-                     'rating': review.rating,
-                     'user_id': review.user.id,
-                     'user_name': f"{review.user.first_name} {review.user.last_name}".strip() or review.user.email} for review in reviews], 200
+            reviews, next_cursor = facade.get_reviews_page_by_place(place_id, limit, after=args['after'])
+            return serialize_place_review.many(reviews), 200, next_page_headers(next_cursor)
         except ValueError as e:
             return {'error': str(e)}, 404
@@ -7,9 +7,13 @@ This module handles CRUD operations for users with JWT authentication and RBAC
 """
 
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from flask import request
+from flask_jwt_extended import jwt_required
+from flask import current_app, request
 from app.api.v1 import facade  # Import du module façade partagé
+from app.serializers.encoding import ndjson_response, wants_ndjson
+from app.serializers.user import USER_COLUMNS, serialize_user
+from app.conditional import conditional, is_not_modified, precondition_failed, resource_validators
+from app.api.v1.authorization import is_admin, is_self_or_admin
 
 # Création du namespace pour regrouper les routes des users
 # Create namespace to group user routes
@@ -36,32 +40,6 @@ user_update_model = api.model('UserUpdate', {
 })
 
 
-# ==================== HELPERS / FONCTIONS UTILITAIRES ====================
-
-def is_admin_user():
-    """
-    Récupère la claim is_admin dans le JWT
-    Get the is_admin claim from JWT
-    
-    Returns:
-        bool: True si l'utilisateur est admin, False sinon
-              True if user is admin, False otherwise
-    """
-    claims = get_jwt()
-    return claims.get('is_admin', False)
-
-
-def _current_user_id():
-    """
-    Retourne l'ID utilisateur courant sous forme de string
-    Returns current user ID as string
-    
-    Returns:
-        str: ID de l'utilisateur authentifié / Authenticated user ID
-    """
-    return str(get_jwt_identity())
-
-
 # ==================== ROUTES COLLECTION /users/ ====================
 
 @api.route('/')
@@ -77,6 +55,7 @@ class UserList(Resource):
     @api.response(201, 'User successfully created')
     @api.response(400, 'Email already registered')
     @api.response(403, 'Forbidden - Only admins can create admin users')
+    @api.response(503, 'Password hashing saturated, retry later')
     def post(self):
         """
         Register a new user
@@ -133,7 +112,7 @@ class UserList(Resource):
                 
                 # Vérifie si l'utilisateur courant est admin
                 # Check if current user is admin
-                if not is_admin_user():
+                if not is_admin():
                     return {
                         'error': 'Only admins can create admin users'
                     }, 403
@@ -175,6 +154,8 @@ class UserList(Resource):
     @api.response(200, 'List of users retrieved successfully')
     @api.response(401, 'Unauthorized - Missing or invalid JWT token')
     @api.response(403, 'Forbidden - Admin access required')
+    @api.response(304, 'Not modified')
+    @conditional
     def get(self):
         """
         List all users (admin only)
@@ -188,30 +169,33 @@ class UserList(Resource):
             - Seuls les administrateurs peuvent voir la liste complète des utilisateurs
             - Only administrators can see the complete list of users
         
+        Export NDJSON en flux avec `Accept: application/x-ndjson` ou `?stream=1`
+        Streaming NDJSON export with `Accept: application/x-ndjson` or `?stream=1`
+        
         Returns:
             200: Liste des utilisateurs / List of users
             401: Non authentifié / Unauthorized
             403: Accès refusé (pas admin) / Forbidden (not admin)
         """
         # ✅ VÉRIFICATION ADMIN / ADMIN CHECK
-        if not is_admin_user():
+        if not is_admin():
             return {
                 'error': 'Admin access required'
             }, 403
         
+        # Export en flux : un utilisateur par ligne, mémoire constante
+        # Streaming export: one user per line, constant memory
+        if wants_ndjson():
+            batch_size = current_app.config['STREAM_BATCH_SIZE']
+            return ndjson_response(facade.stream_users(USER_COLUMNS, batch_size), serialize_user)
+        
         # Récupération de tous les utilisateurs via la facade
         # Get all users through facade
-        users = facade.get_all_users()
-        
-        # Sérialisation de la liste des utilisateurs
-        # Serialize user list
-        return [{
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email,
-            'is_admin': user.is_admin
-        } for user in users], 200
+        users = facade.get_all_users(columns=USER_COLUMNS)
+        
+        # Sérialisation de la liste des utilisateurs (tuples Row, sans hash)
+        # Serialize user list (Row tuples, no password hash)
+        return serialize_user.many(users), 200
 
 
 # ==================== ROUTES RESSOURCE /users/<user_id> ====================
@@ -231,6 +215,8 @@ class UserResource(Resource):
     @api.response(404, 'User not found')
     @api.response(401, 'Unauthorized - Missing or invalid JWT token')
     @api.response(403, 'Forbidden - Can only access own data unless admin')
+    @api.response(304, 'Not modified')
+    @conditional
     def get(self, user_id):
         """
         Get user details by ID (self or admin)
@@ -249,10 +235,21 @@ class UserResource(Resource):
             user_id (int): ID de l'utilisateur / User ID
         
         Returns:
-            200: Détails de l'utilisateur / User details
+            200: Détails de l'utilisateur / User details (headers ETag, Last-Modified)
+            304: Représentation inchangée / Representation unchanged
             403: Accès refusé / Forbidden
             404: Utilisateur non trouvé / User not found
         """
+        # ✅ CONTRÔLE D'ACCÈS / ACCESS CONTROL
+        # Autoriser si : l'utilisateur accède à ses propres données OU est admin
+        # Décidé depuis le JWT seul, avant toute requête SQL
+        # Allow if: user accessing own data OR is admin
+        # Decided from the JWT alone, before any SQL query
+        if not is_self_or_admin(user_id):
+            return {
+                'error': 'Access denied. You can only view your own profile.'
+            }, 403
+
         # Récupération de l'utilisateur
         # Get the user
         user = facade.get_user(user_id)
@@ -260,24 +257,15 @@ class UserResource(Resource):
         if not user:
             return {'error': 'User not found'}, 404
         
-        # ✅ CONTRÔLE D'ACCÈS / ACCESS CONTROL
-        # Autoriser si : l'utilisateur accède à ses propres données OU est admin
-        # Allow if: user accessing own data OR is admin
-        current_id = _current_user_id()
-        if str(user_id) != current_id and not is_admin_user():
-            return {
-                'error': 'Access denied. You can only view your own profile.'
-            }, 403
+        # Validateurs depuis (id, updated_at) : 304 sans sérialiser
+        # Validators from (id, updated_at): 304 without serializing
+        headers = resource_validators(user)
+        if is_not_modified(headers):
+            return None, 304, headers
         
         # Retour des détails de l'utilisateur
         # Return user details
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email,
-            'is_admin': user.is_admin
-        }, 200
+        return serialize_user(user), 200, headers
     
     # ==================== PUT - Mettre à jour un utilisateur ====================
     
@@ -289,6 +277,7 @@ class UserResource(Resource):
     @api.response(401, 'Unauthorized - Missing or invalid JWT token')
     @api.response(403, 'Forbidden - Can only update own data unless admin')
     @api.response(400, 'Invalid input data')
+    @api.response(412, 'Precondition failed - If-Match does not match the current ETag')
     def put(self, user_id):
         """
         Update user information (self or admin)
@@ -311,20 +300,25 @@ class UserResource(Resource):
             403: Accès refusé / Forbidden
             404: Utilisateur non trouvé / User not found
             400: Données invalides / Invalid input data
+            412: If-Match ne correspond plus / If-Match no longer matches
         """
+        # ✅ CONTRÔLE D'ACCÈS / ACCESS CONTROL (JWT seul / JWT only)
+        if not is_self_or_admin(user_id):
+            return {
+                'error': 'Access denied. You can only update your own profile.'
+            }, 403
+
         # Récupération de l'utilisateur
         # Get the user
-        user = facade.get_user(user_id)
+        user = facade.get_user_for_update(user_id)
         
         if not user:
             return {'error': 'User not found'}, 404
         
-        # ✅ CONTRÔLE D'ACCÈS / ACCESS CONTROL
-        current_id = _current_user_id()
-        if str(user_id) != current_id and not is_admin_user():
-            return {
-                'error': 'Access denied. You can only update your own profile.'
-            }, 403
+        # Mise à jour concurrente : version lue par le client périmée
+        # Concurrent update: the version the client read is stale
+        if precondition_failed(user):
+            return {'error': 'User has been modified since it was read'}, 412
         
         # Récupération des données de mise à jour
         # Get update data
@@ -335,13 +329,7 @@ class UserResource(Resource):
             # Update through facade
             updated_user = facade.update_user(user_id, update_data)
             
-            return {
-                'id': updated_user.id,
-                'first_name': updated_user.first_name,
-                'last_name': updated_user.last_name,
-                'email': updated_user.email,
-                'is_admin': updated_user.is_admin
-            }, 200
+            return serialize_user(updated_user), 200, resource_validators(updated_user)
             
         except ValueError as e:
             return {'error': str(e)}, 400
@@ -376,20 +364,19 @@ class UserResource(Resource):
             403: Accès refusé / Forbidden
             404: Utilisateur non trouvé / User not found
         """
+        # ✅ CONTRÔLE D'ACCÈS / ACCESS CONTROL (JWT seul / JWT only)
+        if not is_self_or_admin(user_id):
+            return {
+                'error': 'Access denied. You can only delete your own account.'
+            }, 403
+
         # Récupération de l'utilisateur
         # Get the user
-        user = facade.get_user(user_id)
+        user = facade.get_user_for_update(user_id)
         
         if not user:
             return {'error': 'User not found'}, 404
         
-        # ✅ CONTRÔLE D'ACCÈS / ACCESS CONTROL
-        current_id = _current_user_id()
-        if str(user_id) != current_id and not is_admin_user():
-            return {
-                'error': 'Access denied. You can only delete your own account.'
-            }, 403
-        
         # Suppression via la facade
         # Delete through facade
         facade.delete_user(user_id)
@@ -439,11 +426,11 @@ class AdminUserUpdate(Resource):
             - Can modify all fields including email, password and is_admin
         """
         # ✅ VÉRIFICATION ADMIN
-        if not is_admin_user():
+        if not is_admin():
             return {'error': 'Admin access required'}, 403
         
         # Récupération de l'utilisateur
-        user = facade.get_user(user_id)
+        user = facade.get_user_for_update(user_id)
         if not user:
             return {'error': 'User not found'}, 404
         
@@ -453,21 +440,13 @@ class AdminUserUpdate(Resource):
         try:
             # Vérifier si l'email change et s'il n'existe pas déjà
             if 'email' in update_data and update_data['email'] != user.email:
-                existing = facade.get_user_by_email(update_data['email'])
-                if existing:
+                if facade.email_in_use(update_data['email']):
                     return {'error': 'Email already in use'}, 400
             
-            # Mise à jour via le user_repo directement pour avoir plus de contrôle
-            updated_user = facade.user_repo.update(user_id, update_data)
+            # Mise à jour complète via la facade (email, password, is_admin)
+            updated_user = facade.admin_update_user(user_id, update_data)
             
-            return {
-                'id': updated_user.id,
-                'first_name': updated_user.first_name,
-                'last_name': updated_user.last_name,
-                'email': updated_user.email,
-                'is_admin': updated_user.is_admin,
-                'message': 'User updated successfully by admin'
-            }, 200
+            return dict(serialize_user(updated_user), message='User updated successfully by admin'), 200
             
         except ValueError as e:
             return {'error': str(e)}, 400
\ No newline at end of file
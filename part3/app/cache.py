@@ -0,0 +1,233 @@
+# app/cache.py
+"""
+Cache de réponses en lecture pour les GET publics
+Read-through response cache for public GET endpoints
+
+Invalidation par tags versionnés : chaque entrée mémorise la version de ses
+tags au moment où la lecture a commencé, et invalider un tag incrémente sa
+version. Une entrée dont un tag a changé est ignorée, y compris si elle a
+été calculée pendant une écriture concurrente.
+Invalidation uses versioned tags: each entry records the version of its
+tags when the read started, and invalidating a tag bumps its version. An
+entry whose tags changed is ignored, even one computed while a concurrent
+write was running.
+
+Backends:
+    - 'memory' : LRU en processus avec TTL / in-process LRU with TTL
+    - 'redis'  : tout client parlant le protocole Redis / any Redis-protocol client
+    - 'null'   : cache désactivé / cache disabled
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from app.conditional import add_payload_validators
+from app.metrics import registry as metrics
+from app.serializers.encoding import wants_ndjson
+
+logger = logging.getLogger(__name__)
+
+# Tag implicite de toutes les entrées : l'invalider vide le cache
+# Implicit tag of every entry: invalidating it empties the cache
+ALL = '*'
+
+
+class MemoryCacheBackend:
+    """
+    LRU en processus avec TTL / In-process LRU with TTL.
+
+    Les versions de tags sont aussi bornées (LRU de max_tags). Une version
+    vient d'un compteur global ; un tag évincé prend la plus haute version
+    évincée, donc une entrée qui le porte peut être ignorée à tort (un simple
+    miss), jamais servie après une invalidation.
+    Tag versions are bounded too (LRU of max_tags). A version comes from a
+    global counter; an evicted tag takes the highest evicted version, so an
+    entry carrying it may be ignored needlessly (a plain miss), never served
+    after an invalidation.
+    """
+
+    def __init__(self, max_entries=1024, max_tags=None):
+        self.max_entries = max_entries
+        self.max_tags = max_tags or 4 * max_entries
+        self._entries = OrderedDict()
+        self._tag_versions = OrderedDict()
+        self._clock = 0
+        self._evicted_version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, tag_versions, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value, tag_versions
+
+    def set(self, key, value, tag_versions, ttl):
+        with self._lock:
+            self._entries[key] = (value, tag_versions, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            versions = {}
+            for tag in tags:
+                if tag in self._tag_versions:
+                    self._tag_versions.move_to_end(tag)
+                versions[tag] = self._tag_versions.get(tag, self._evicted_version)
+            return versions
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._clock += 1
+                self._tag_versions[tag] = self._clock
+                self._tag_versions.move_to_end(tag)
+            while len(self._tag_versions) > self.max_tags:
+                _, version = self._tag_versions.popitem(last=False)
+                self._evicted_version = max(self._evicted_version, version)
+
+
+class RedisCacheBackend:
+    """
+    Backend sur un client Redis (redis-py ou tout objet compatible :
+    get / set(ex=) / mget / incr).
+    Backend on a Redis client (redis-py or any compatible object:
+    get / set(ex=) / mget / incr).
+    """
+
+    def __init__(self, client, prefix='hbnb:cache:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return entry['value'], entry['tags']
+
+    def set(self, key, value, tag_versions, ttl):
+        entry = json.dumps({'value': value, 'tags': tag_versions})
+        self.client.set(self.prefix + key, entry, ex=max(1, int(ttl)))
+
+    def tag_versions(self, tags):
+        tags = list(tags)
+        raw = self.client.mget([self._tag_key(tag) for tag in tags])
+        return {tag: int(version or 0) for tag, version in zip(tags, raw)}
+
+    def bump(self, tags):
+        for tag in tags:
+            self.client.incr(self._tag_key(tag))
+
+    def _tag_key(self, tag):
+        return f'{self.prefix}tag:{tag}'
+
+
+class ResponseCache:
+    """
+    Extension Flask : décorateur de mise en cache et invalidation par tags
+    Flask extension: caching decorator and tag-based invalidation
+    """
+
+    def init_app(self, app, backend=None):
+        """
+        Choisit le backend selon CACHE_TYPE ('memory', 'redis', 'null').
+        Un backend déjà construit peut être passé directement (tests).
+        """
+        if backend is None:
+            backend = self._backend_from_config(app.config)
+        app.extensions['response_cache'] = backend
+
+    @staticmethod
+    def _backend_from_config(config):
+        cache_type = config.get('CACHE_TYPE', 'memory')
+        if cache_type == 'null':
+            return None
+        if cache_type == 'memory':
+            return MemoryCacheBackend(config.get('CACHE_MAX_ENTRIES', 1024), config.get('CACHE_MAX_TAGS'))
+        if cache_type == 'redis':
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("CACHE_TYPE='redis' requires the 'redis' package")
+            return RedisCacheBackend(redis.Redis.from_url(config['CACHE_REDIS_URL']))
+        raise ValueError(f"Unknown CACHE_TYPE '{cache_type}'")
+
+    @property
+    def backend(self):
+        return current_app.extensions.get('response_cache')
+
+    def cached(self, *tags, ttl=None):
+        """
+        Met en cache les réponses 200 d'une méthode de Resource.
+        Cache the 200 responses of a Resource method.
+
+        Les tags sont des gabarits formatés avec les arguments de la route,
+        ex. 'place:{place_id}'. La clé est le chemin + la query string triée.
+        Tags are templates formatted with the route arguments, e.g.
+        'place:{place_id}'. The key is the path + the sorted query string.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                backend = self.backend
+                # Les exports NDJSON en flux ne sont jamais mis en cache
+                # Streaming NDJSON exports are never cached
+                if backend is None or wants_ndjson():
+                    return func(*args, **kwargs)
+
+                key = self._request_key()
+                # '05' et '5' désignent la même ressource : tags sur l'id normalisé
+                # '05' and '5' are the same resource: tags use the normalized id
+                tag_args = {name: str(int(value)) if isinstance(value, str) and value.isdigit() else value
+                            for name, value in kwargs.items()}
+                entry_tags = [ALL] + [tag.format(**tag_args) for tag in tags]
+                # Versions lues AVANT de calculer la réponse (course avec les écritures)
+                # Versions read BEFORE computing the response (race with writes)
+                current = backend.tag_versions(entry_tags)
+
+                hit = backend.get(key)
+                if hit is not None and hit[1] == current:
+                    metrics.inc('hbnb_cache_requests_total', result='hit')
+                    body, status, headers = hit[0]
+                    return body, status, headers
+                metrics.inc('hbnb_cache_requests_total', result='miss')
+
+                result = func(*args, **kwargs)
+                if isinstance(result, tuple) and len(result) >= 2 and result[1] == 200:
+                    # ETag calculé une fois, servi tel quel aux hits
+                    # ETag computed once, served as-is on hits
+                    headers = add_payload_validators(result[0], result[2] if len(result) > 2 else None)
+                    backend.set(key, [result[0], 200, headers], current,
+                                ttl or current_app.config.get('CACHE_DEFAULT_TTL', 60))
+                    return result[0], 200, headers
+                return result
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        """Invalide toutes les entrées portant l'un des tags / Invalidate entries carrying any tag."""
+        backend = self.backend
+        if backend is not None and tags:
+            logger.debug("Cache invalidation: %s", tags)
+            backend.bump(tags)
+
+    def clear(self):
+        """Invalide tout le cache / Invalidate the whole cache."""
+        self.invalidate(ALL)
+
+    @staticmethod
+    def _request_key():
+        args = sorted(request.args.items(multi=True))
+        query = '&'.join(f'{name}={value}' for name, value in args)
+        return f'{request.path}?{query}'
@@ -0,0 +1,83 @@
+"""
+Commandes CLI Flask de maintenance
+Flask CLI maintenance commands
+
+Usage:
+    flask --app run rebuild-rating-stats
+    flask --app run rebuild-search-index
+    flask --app run purge-revoked-tokens
+    flask --app run schema-diff [--sql setup.sql] [--query-log slow.log]
+"""
+import os
+import click
+from flask import current_app
+from app.api.v1 import facade
+from app.extensions import db
+from app.persistence import schema_check
+from app.tokens import token_blocklist
+
+
+@click.command('rebuild-rating-stats')
+def rebuild_rating_stats_command():
+    """Recompute the denormalized review aggregates of every place."""
+    repaired = facade.rebuild_rating_stats()
+    click.echo(f"Rating stats rebuilt: {repaired} place(s) repaired")
+
+
+@click.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Create (if needed) and rebuild the full-text index of places."""
+    try:
+        indexed = facade.rebuild_search_index()
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Search index rebuilt: {indexed} place(s) indexed")
+
+
+@click.command('purge-revoked-tokens')
+def purge_revoked_tokens_command():
+    """Delete the rows of revoked tokens that have expired anyway."""
+    purged = token_blocklist.purge_expired()
+    click.echo(f"Revoked tokens purged: {purged} expired row(s) deleted")
+
+
+@click.command('schema-diff')
+@click.option('--sql', 'sql_path', type=click.Path(exists=True, dir_okay=False),
+              help="SQL script to compare with the models (default: setup.sql)")
+@click.option('--query-log', type=click.Path(exists=True, dir_okay=False),
+              help="slow-request log (text or JSON lines) or one SELECT per line")
+def schema_diff_command(sql_path, query_log):
+    """Compare setup.sql with the models and report indexes the query log misses."""
+    sql_path = sql_path or os.path.join(os.path.dirname(current_app.root_path), 'setup.sql')
+    with open(sql_path) as handle:
+        script = handle.read()
+    models = schema_check.engine_from_metadata(db.metadata)
+    try:
+        script_engine = schema_check.engine_from_sql(script)
+    except Exception as e:
+        raise click.ClickException(f"{sql_path} does not run on SQLite: {e}")
+    problems = schema_check.diff_schemas(schema_check.describe(models), schema_check.describe(script_engine))
+    for problem in problems:
+        click.echo(problem)
+    click.echo(f"Schema diff: {len(problems)} difference(s) between {os.path.basename(sql_path)} and the models")
+
+    findings = []
+    if query_log:
+        with open(query_log) as handle:
+            statements = schema_check.read_query_log(handle)
+        findings = schema_check.missing_indexes(models, statements)
+        for statement, executions, notes in findings:
+            click.echo(f"\n[{executions}x] {statement}")
+            for note in notes:
+                click.echo(f"    {note}")
+        click.echo(f"Query log: {len(findings)} of {len(statements)} distinct SELECT(s) without a usable index")
+    if problems or findings:
+        raise SystemExit(1)
+
+
+def register_commands(app):
+    """Enregistre les commandes CLI sur l'application / Register CLI commands on the app"""
+    app.cli.add_command(rebuild_rating_stats_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(purge_revoked_tokens_command)
+    app.cli.add_command(schema_diff_command)
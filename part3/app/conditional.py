@@ -0,0 +1,103 @@
+# app/conditional.py
+"""
+Requêtes HTTP conditionnelles : ETag, Last-Modified, 304 et 412
+HTTP conditional requests: ETag, Last-Modified, 304 and 412
+
+- Ressource seule : ETag fort dérivé de (table, id, updated_at), calculé
+  avant toute sérialisation ; Last-Modified = updated_at.
+- Collection : ETag fort = hash du payload, calculé une fois puis gardé
+  avec l'entrée du cache de réponses ; pas de Last-Modified (une date de
+  génération ferait répondre 304 à If-Modified-Since pour une écriture de
+  la même seconde, et max(updated_at) ignore les suppressions).
+- Single resource: strong ETag derived from (table, id, updated_at),
+  computed before any serialization; Last-Modified = updated_at.
+- Collection: strong ETag = payload hash, computed once and kept with the
+  response cache entry; no Last-Modified (a generation time would answer
+  If-Modified-Since with 304 for a write in the same second, and
+  max(updated_at) misses deletions).
+"""
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import request
+from werkzeug.http import http_date, parse_date
+from app.serializers.encoding import dumps
+
+
+def _quoted(digest):
+    return f'"{digest[:32]}"'
+
+
+def resource_etag(obj):
+    """ETag fort d'une ligne : (table, id, updated_at) / Strong ETag of a row."""
+    stamp = obj.updated_at.isoformat() if obj.updated_at else ''
+    return _quoted(hashlib.sha256(f'{obj.__tablename__}:{obj.id}:{stamp}'.encode()).hexdigest())
+
+
+def payload_etag(payload):
+    """ETag fort d'un payload JSON / Strong ETag of a JSON payload."""
+    return _quoted(hashlib.sha256(dumps(payload, sort_keys=True)).hexdigest())
+
+
+def resource_validators(obj):
+    """En-têtes ETag / Last-Modified d'une ressource / Validator headers of a resource."""
+    headers = {'ETag': resource_etag(obj)}
+    if obj.updated_at is not None:
+        headers['Last-Modified'] = http_date(obj.updated_at.replace(tzinfo=timezone.utc))
+    return headers
+
+
+def add_payload_validators(payload, headers):
+    """
+    Complète les en-têtes d'une réponse 200 avec l'ETag du payload s'il manque.
+    Add the payload ETag to the headers of a 200 response when missing.
+    """
+    headers = dict(headers or {})
+    if 'ETag' not in headers:
+        headers['ETag'] = payload_etag(payload)
+    return headers
+
+
+def is_not_modified(headers):
+    """
+    Évalue If-None-Match (prioritaire) puis If-Modified-Since.
+    Evaluate If-None-Match (takes precedence) then If-Modified-Since.
+    """
+    if 'If-None-Match' in request.headers:
+        return request.if_none_match.contains_weak(headers['ETag'].strip('"'))
+    since = request.if_modified_since
+    last_modified = parse_date(headers.get('Last-Modified'))
+    if since is not None and last_modified is not None:
+        return last_modified <= since
+    return False
+
+
+def precondition_failed(obj):
+    """
+    Vrai si If-Match est présent et ne correspond pas à l'état courant (412).
+    True when If-Match is present and does not match the current state (412).
+    """
+    if 'If-Match' not in request.headers:
+        return False
+    return not request.if_match.contains(resource_etag(obj).strip('"'))
+
+
+def conditional(func):
+    """
+    Décorateur de GET : ajoute les validateurs aux réponses 200 et répond
+    304 quand le client a déjà la représentation courante.
+    GET decorator: adds validators to 200 responses and answers 304 when
+    the client already holds the current representation.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        if not (isinstance(result, tuple) and len(result) >= 2):
+            return result
+        if result[1] != 200:
+            return result
+        headers = add_payload_validators(result[0], result[2] if len(result) > 2 else None)
+        if is_not_modified(headers):
+            return None, 304, headers
+        return result[0], 200, headers
+    return wrapper
@@ -1,7 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
-from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
+from app.cache import ResponseCache
+from app.ratelimit import RateLimiter
+from app.persistence.routing import RoutingSession
+from app.tokens import CachingJWTManager
 
-jwt = JWTManager()
-db = SQLAlchemy()
+jwt = CachingJWTManager()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 bcrypt = Bcrypt()
+migrate = Migrate()
+cache = ResponseCache()
+limiter = RateLimiter()
@@ -0,0 +1,148 @@
+# app/hashing.py
+"""
+Hachage bcrypt dans un pool de threads borné
+bcrypt hashing in a bounded thread pool
+
+bcrypt relâche le GIL pendant le calcul : un pool de threads suffit à
+limiter le nombre de hachages simultanés (PASSWORD_HASH_WORKERS), donc la
+part du CPU qu'ils prennent aux autres requêtes. Au-delà de
+PASSWORD_HASH_QUEUE_SIZE demandes en attente, le pool refuse au lieu
+d'empiler : l'API répond 503 tout de suite plutôt que d'exploser sa latence.
+bcrypt releases the GIL while it works: a thread pool is enough to cap
+the number of concurrent hashes (PASSWORD_HASH_WORKERS), hence the share
+of CPU they take from other requests. Past PASSWORD_HASH_QUEUE_SIZE
+waiting calls the pool refuses instead of piling up: the API answers 503
+right away rather than blowing up its latency.
+
+Le coût (BCRYPT_LOG_ROUNDS) est lu par appel dans la config de l'application.
+The cost (BCRYPT_LOG_ROUNDS) is read per call from the application config.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_app_context
+from app.extensions import bcrypt
+
+logger = logging.getLogger(__name__)
+
+
+class HasherBusy(RuntimeError):
+    """Le pool de hachage est saturé / The hashing pool is saturated."""
+
+
+class HashingPool:
+    """
+    Pool borné : `workers` hachages en parallèle, `queue_size` en attente.
+    Bounded pool: `workers` hashes in parallel, `queue_size` waiting.
+    """
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._stats = dict(in_flight=0, peak_in_flight=0, completed=0, rejected=0,
+                           queue_seconds_total=0.0, hash_seconds_total=0.0)
+
+    def run(self, func, *args):
+        """
+        Exécute func(*args) dans le pool et attend le résultat.
+        Run func(*args) in the pool and wait for the result.
+
+        :raises HasherBusy: Si `capacity` appels sont déjà en cours ou en attente.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            logger.warning("Password hashing pool saturated (%d in flight)", self.capacity)
+            raise HasherBusy("Password hashing is saturated, retry later")
+        with self._lock:
+            self._stats['in_flight'] += 1
+            self._stats['peak_in_flight'] = max(self._stats['peak_in_flight'], self._stats['in_flight'])
+        try:
+            return self._executor.submit(self._timed, time.perf_counter(), func, *args).result()
+        finally:
+            with self._lock:
+                self._stats['in_flight'] -= 1
+            self._slots.release()
+
+    def _timed(self, submitted_at, func, *args):
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._stats['completed'] += 1
+                self._stats['queue_seconds_total'] += started_at - submitted_at
+                self._stats['hash_seconds_total'] += finished_at - started_at
+
+    def stats(self):
+        """
+        Instantané des métriques : in_flight (file + calcul), pic, refus, temps cumulés.
+        Metrics snapshot: in_flight (queued + running), peak, rejections, total times.
+        """
+        with self._lock:
+            return dict(self._stats, workers=self.workers, capacity=self.capacity,
+                        queued=max(0, self._stats['in_flight'] - self.workers))
+
+
+class PasswordHasher:
+    """
+    Extension Flask : hachage / vérification bcrypt via le pool de l'application.
+    Flask extension: bcrypt hash / verify through the application's pool.
+
+    Sans application (scripts, shell), le calcul se fait sur le thread appelant.
+    Without an application (scripts, shell), work runs on the calling thread.
+    """
+
+    def init_app(self, app):
+        workers = app.config.get('PASSWORD_HASH_WORKERS') or min(4, os.cpu_count() or 1)
+        queue_size = app.config.get('PASSWORD_HASH_QUEUE_SIZE', 16)
+        app.extensions['password_hasher'] = HashingPool(workers, queue_size)
+
+    @property
+    def pool(self):
+        return current_app.extensions.get('password_hasher') if has_app_context() else None
+
+    @staticmethod
+    def log_rounds():
+        """Coût bcrypt configuré / Configured bcrypt cost."""
+        if has_app_context():
+            return current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        return 12
+
+    def hash(self, password):
+        """Hache un mot de passe en clair ; retourne le hash en str / Hash a plain password."""
+        rounds = self.log_rounds()
+        return self._run(bcrypt.generate_password_hash, password, rounds).decode('utf-8')
+
+    def verify(self, password_hash, password):
+        """Vérifie un mot de passe contre un hash / Check a password against a hash."""
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """
+        True si le hash a été calculé avec un autre coût que BCRYPT_LOG_ROUNDS.
+        True when the hash was computed with a cost other than BCRYPT_LOG_ROUNDS.
+        """
+        try:
+            return int(password_hash.split('$')[2]) != self.log_rounds()
+        except (AttributeError, IndexError, ValueError):
+            return True
+
+    def stats(self):
+        pool = self.pool
+        return pool.stats() if pool is not None else {}
+
+    def _run(self, func, *args):
+        pool = self.pool
+        if pool is None:
+            return func(*args)
+        return pool.run(func, *args)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,189 @@
+# app/logging_setup.py
+"""
+Configuration des logs de l'application, appelée par create_app
+Application logging configuration, called by create_app
+
+- Écriture non bloquante : les loggers déposent les enregistrements dans
+  une file (QueueHandler) ; un thread (QueueListener) les formate et les
+  écrit. Une requête n'attend jamais le flux de sortie.
+  Non-blocking writes: loggers put records on a queue (QueueHandler); a
+  thread (QueueListener) formats and writes them. A request never waits
+  on the output stream.
+- Sortie JSON, une ligne par enregistrement (LOG_FORMAT = 'json' | 'text').
+  JSON output, one line per record (LOG_FORMAT = 'json' | 'text').
+- Niveau global LOG_LEVEL, niveaux par logger LOG_LEVELS (dict, ou chaîne
+  "app.persistence=DEBUG,werkzeug=WARNING").
+  Global LOG_LEVEL, per-logger LOG_LEVELS (dict, or a
+  "app.persistence=DEBUG,werkzeug=WARNING" string).
+- Identifiant de requête : repris de l'en-tête X-Request-ID ou généré,
+  renvoyé dans la réponse et ajouté à chaque enregistrement.
+  Request id: taken from the X-Request-ID header or generated, sent back
+  in the response and added to every record.
+- Échantillonnage : seule une fraction LOG_DEBUG_SAMPLE_RATE des
+  enregistrements DEBUG est gardée ; INFO et au-delà le sont toujours.
+  Sampling: only a LOG_DEBUG_SAMPLE_RATE fraction of DEBUG records is
+  kept; INFO and above always are.
+
+Les appels de log passent leurs arguments à la manière de `%`
+(logger.debug("Place %s", place_id)) : rien n'est formaté si le niveau est
+coupé ou l'enregistrement écarté par l'échantillonnage.
+Log calls pass `%`-style arguments (logger.debug("Place %s", place_id)):
+nothing is formatted when the level is off or the record is sampled out.
+"""
+import atexit
+import copy
+import logging
+import random
+import re
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from flask import g, has_request_context, request
+from app.serializers.encoding import dumps
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+# Identifiant fourni par le client (proxy, autre service) : court et sans caractères de contrôle
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._:-]{1,128}$')
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'
+
+# (handler, listener) installés par le dernier configure_logging
+_installed = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Ajoute record.request_id (None hors requête) / Add record.request_id."""
+
+    def filter(self, record):
+        record.request_id = g.get('request_id') if has_request_context() else None
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Garde une fraction `rate` des enregistrements DEBUG / Keep a `rate` share of DEBUG records."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement / One JSON line per record."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            entry['request_id'] = request_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return dumps(entry).decode('utf-8')
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler qui garde la trace d'exception à part (champ exc_info du
+    JSON) au lieu de la coller au message.
+    QueueHandler keeping the exception trace apart (exc_info field of the
+    JSON) instead of appending it to the message.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        record.stack_info = None
+        return record
+
+
+def configure_logging(app):
+    """
+    Installe la chaîne de logs sur le logger racine et les hooks d'identifiant
+    de requête. Un nouvel appel (autre application, tests) remplace la chaîne
+    précédente au lieu de l'empiler.
+    Install the log chain on the root logger and the request id hooks. A new
+    call (another application, tests) replaces the previous chain instead of
+    stacking it.
+    """
+    global _installed
+    config = app.config
+    shutdown_logging()
+
+    output = logging.StreamHandler()
+    if config.get('LOG_FORMAT', 'json') == 'json':
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    queue = SimpleQueue()
+    handler = StructuredQueueHandler(queue)
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(DebugSampler(config.get('LOG_DEBUG_SAMPLE_RATE', 1.0)))
+    listener = QueueListener(queue, output)
+    listener.start()
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(config.get('LOG_LEVEL', 'INFO'))
+    for name, level in parse_levels(config.get('LOG_LEVELS')).items():
+        logging.getLogger(name).setLevel(level)
+    _installed = (handler, listener)
+    app.extensions['log_listener'] = listener
+
+    app.before_request(_assign_request_id)
+    app.after_request(_send_request_id)
+
+
+def shutdown_logging():
+    """
+    Retire la chaîne installée et vide la file (aussi appelée à la sortie).
+    Remove the installed chain and drain the queue (also called at exit).
+    """
+    global _installed
+    if _installed is None:
+        return
+    handler, listener = _installed
+    _installed = None
+    logging.getLogger().removeHandler(handler)
+    listener.stop()
+
+
+atexit.register(shutdown_logging)
+
+
+def parse_levels(value):
+    """'app.persistence=DEBUG,werkzeug=WARNING' -> {'app.persistence': 'DEBUG', ...}"""
+    if isinstance(value, dict):
+        return value
+    levels = {}
+    for item in (value or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _assign_request_id():
+    incoming = request.headers.get(REQUEST_ID_HEADER, '')
+    g.request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+
+def _send_request_id(response):
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers[REQUEST_ID_HEADER] = request_id
+    return response
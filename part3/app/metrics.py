@@ -0,0 +1,305 @@
+# app/metrics.py
+"""
+Métriques au format texte Prometheus, exposées sur /metrics
+Prometheus text-format metrics, exposed on /metrics
+
+Registre en processus : compteurs, jauges et histogrammes sous un seul
+verrou tenu le temps d'une addition. Les jauges du pool SQLAlchemy et du
+pool bcrypt sont lues au moment de la collecte.
+In-process registry: counters, gauges and histograms under a single lock
+held for one addition. SQLAlchemy pool and bcrypt pool gauges are read at
+collection time.
+
+Plusieurs processus (serveur prefork) : avec METRICS_MULTIPROC_DIR, chaque
+worker écrit son instantané dans <dir>/metrics-<pid>.json au plus toutes
+les METRICS_FLUSH_SECONDS (et juste avant de répondre à /metrics). Le
+worker qui répond additionne tous les fichiers : compteurs et histogrammes
+de tous les workers, même arrêtés ; jauges des workers vivants seulement.
+Vider le dossier au démarrage du serveur.
+Several processes (prefork server): with METRICS_MULTIPROC_DIR each worker
+writes its snapshot to <dir>/metrics-<pid>.json at most every
+METRICS_FLUSH_SECONDS (and right before answering /metrics). The worker
+that answers adds up every file: counters and histograms of every
+worker, even stopped ones; gauges of live workers only. Empty the
+directory when the server starts.
+"""
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from flask import Response, g, request
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Bornes des histogrammes de latence (secondes) / Latency histogram bounds (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    'hbnb_http_requests_total': ('counter', "HTTP requests by route and status"),
+    'hbnb_http_request_duration_seconds': ('histogram', "HTTP request latency by route"),
+    'hbnb_http_requests_in_flight': ('gauge', "HTTP requests being handled"),
+    'hbnb_db_pool_checkouts_total': ('counter', "Connections checked out of the SQLAlchemy pool"),
+    'hbnb_db_pool_checked_out': ('gauge', "Connections currently checked out"),
+    'hbnb_db_pool_overflow': ('gauge', "Connections open beyond pool_size"),
+    'hbnb_password_hash_in_flight': ('gauge', "bcrypt calls running or queued"),
+    'hbnb_password_hash_queued': ('gauge', "bcrypt calls waiting for a worker"),
+    'hbnb_password_hash_rejected_total': ('counter', "bcrypt calls refused with 503"),
+    'hbnb_cache_requests_total': ('counter', "Response cache lookups by result"),
+}
+
+
+class MetricsRegistry:
+    """Compteurs, jauges et histogrammes d'un processus / One process's metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        # clé -> [compte par borne..., +Inf, somme] / key -> [count per bound..., +Inf, sum]
+        self._histograms = {}
+        self._collectors = []
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def add(self, name, amount, **labels):
+        """Ajoute `amount` (négatif possible) à une jauge / Add `amount` to a gauge."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + amount
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(buckets, value)
+        with self._lock:
+            counts = self._histograms.get(key)
+            if counts is None:
+                counts = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def register_collector(self, collector):
+        """
+        `collector()` retourne des (type, nom, labels, valeur) lus à la collecte,
+        type valant 'counters' ou 'gauges'.
+        `collector()` returns (kind, name, labels, value) read at collection
+        time, kind being 'counters' or 'gauges'.
+        """
+        self._collectors.append(collector)
+
+    def clear_collectors(self):
+        self._collectors = []
+
+    def snapshot(self):
+        """État sérialisable (JSON) du registre / JSON-serializable registry state."""
+        with self._lock:
+            counters = [[name, dict(labels), value] for (name, labels), value in self._counters.items()]
+            gauges = [[name, dict(labels), value] for (name, labels), value in self._gauges.items()]
+            histograms = [[name, dict(labels), list(counts)]
+                          for (name, labels), counts in self._histograms.items()]
+        state = {'counters': counters, 'gauges': gauges, 'histograms': histograms}
+        for collector in self._collectors:
+            for kind, name, labels, value in collector():
+                state[kind].append([name, labels, value])
+        return state
+
+
+def merge(snapshots):
+    """
+    Additionne des instantanés (pid, instantané, vivant) ; jauges des vivants seulement.
+    Add up (pid, snapshot, alive) snapshots; gauges of live ones only.
+    """
+    merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+    for _, snapshot, alive in snapshots:
+        for kind in ('counters', 'gauges'):
+            if kind == 'gauges' and not alive:
+                continue
+            for name, labels, value in snapshot[kind]:
+                key = (name, tuple(sorted(labels.items())))
+                merged[kind][key] = merged[kind].get(key, 0) + value
+        for name, labels, counts in snapshot['histograms']:
+            key = (name, tuple(sorted(labels.items())))
+            total = merged['histograms'].get(key)
+            merged['histograms'][key] = counts if total is None else [a + b for a, b in zip(total, counts)]
+    return merged
+
+
+def render(merged, buckets=LATENCY_BUCKETS):
+    """Format texte Prometheus 0.0.4 / Prometheus text format 0.0.4."""
+    series = {}
+    for kind in ('counters', 'gauges', 'histograms'):
+        for (name, labels), value in merged[kind].items():
+            series.setdefault(name, []).append((labels, value))
+    bounds = [_number(bound) for bound in buckets] + ['+Inf']
+    output = []
+    for name in sorted(series):
+        kind, help_text = METRICS.get(name, ('untyped', name))
+        output.append(f'# HELP {name} {help_text}')
+        output.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(series[name]):
+            if kind != 'histogram':
+                output.append(f'{name}{_labels(labels)} {_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                output.append(f'{name}_bucket{_labels(labels + (("le", bound),))} {cumulative}')
+            output.append(f'{name}_sum{_labels(labels)} {_number(value[-1])}')
+            output.append(f'{name}_count{_labels(labels)} {cumulative}')
+    return '\n'.join(output) + '\n'
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MultiProcessStore:
+    """Un fichier d'instantané par worker / One snapshot file per worker."""
+
+    def __init__(self, directory, flush_seconds=5):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self._next_flush = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def maybe_flush(self, registry):
+        if time.monotonic() >= self._next_flush:
+            self.flush(registry)
+
+    def flush(self, registry):
+        self._next_flush = time.monotonic() + self.flush_seconds
+        path = os.path.join(self.directory, f'metrics-{os.getpid()}.json')
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as handle:
+            json.dump(registry.snapshot(), handle)
+        # Remplacement atomique : un lecteur ne voit jamais un fichier à moitié écrit
+        os.replace(temporary, path)
+
+    def read_all(self):
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+            pid = int(os.path.basename(path)[len('metrics-'):-len('.json')])
+            try:
+                with open(path) as handle:
+                    snapshots.append((pid, json.load(handle), _alive(pid)))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+registry = MetricsRegistry()
+
+
+def route_labels():
+    """
+    (namespace, route) de la requête : gabarit de la route, jamais le chemin
+    réel, pour borner le nombre de séries.
+    (namespace, route) of the request: the route template, never the actual
+    path, to bound the number of series.
+    """
+    rule = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+    parts = rule.split('/')
+    namespace = parts[3] if rule.startswith('/api/v1/') and len(parts) > 3 else '-'
+    return namespace, rule
+
+
+def init_app(app):
+    """
+    Hooks de requête, événements de pool, collecteurs et route /metrics
+    (dans un contexte d'application, après db.init_app).
+    Request hooks, pool events, collectors and the /metrics route (inside
+    an app context, after db.init_app).
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return False
+    from sqlalchemy import event
+    from app.extensions import db
+
+    directory = app.config.get('METRICS_MULTIPROC_DIR')
+    store = MultiProcessStore(directory, app.config.get('METRICS_FLUSH_SECONDS', 5)) if directory else None
+    app.extensions['metrics_store'] = store
+
+    engines = {'primary' if key is None else key: engine for key, engine in db.engines.items()}
+    for name, engine in engines.items():
+        event.listen(engine.pool, 'checkout',
+                     lambda *args, engine_name=name: registry.inc('hbnb_db_pool_checkouts_total',
+                                                                 engine=engine_name))
+
+    def collect_pools():
+        for name, engine in engines.items():
+            pool = engine.pool
+            # Les pools sans file (StaticPool, SingletonThreadPool) n'ont pas ces compteurs
+            if hasattr(pool, 'checkedout') and hasattr(pool, 'overflow'):
+                yield 'gauges', 'hbnb_db_pool_checked_out', {'engine': name}, pool.checkedout()
+                yield 'gauges', 'hbnb_db_pool_overflow', {'engine': name}, max(0, pool.overflow())
+
+    def collect_hashing():
+        hashing_pool = app.extensions.get('password_hasher')
+        if hashing_pool is not None:
+            stats = hashing_pool.stats()
+            yield 'gauges', 'hbnb_password_hash_in_flight', {}, stats['in_flight']
+            yield 'gauges', 'hbnb_password_hash_queued', {}, stats['queued']
+            yield 'counters', 'hbnb_password_hash_rejected_total', {}, stats['rejected']
+
+    # Un seul jeu de collecteurs : celui de la dernière application créée
+    registry.clear_collectors()
+    registry.register_collector(collect_pools)
+    registry.register_collector(collect_hashing)
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        registry.add('hbnb_http_requests_in_flight', 1)
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('metrics_started')
+        if started is not None and request.endpoint != 'metrics':
+            namespace, route = route_labels()
+            registry.inc('hbnb_http_requests_total', namespace=namespace, route=route,
+                         method=request.method, status=str(response.status_code))
+            registry.observe('hbnb_http_request_duration_seconds', time.perf_counter() - started,
+                             namespace=namespace, route=route, method=request.method)
+        if store is not None:
+            store.maybe_flush(registry)
+        return response
+
+    @app.teardown_request
+    def end_request_metrics(exc):
+        if g.pop('metrics_started', None) is not None:
+            registry.add('hbnb_http_requests_in_flight', -1)
+
+    def metrics():
+        if store is None:
+            merged = merge([(os.getpid(), registry.snapshot(), True)])
+        else:
+            store.flush(registry)
+            merged = merge(store.read_all())
+        return Response(render(merged), content_type=CONTENT_TYPE)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
+    return True
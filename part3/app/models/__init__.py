@@ -7,4 +7,5 @@ from .base_model import BaseModel
 from .user import User
 from .place import Place
 from .review import Review
-from .amenity import Amenity  # ✅ Ajout si l'amenity est aussi un modèle
\ No newline at end of file
+from .amenity import Amenity  # ✅ Ajout si l'amenity est aussi un modèle
+from .revoked_token import RevokedToken
\ No newline at end of file
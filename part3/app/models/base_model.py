@@ -1,6 +1,7 @@
 # app/models/base_model.py
 from datetime import datetime
 from app.extensions import db
+from app.persistence.unit_of_work import commit
 from sqlalchemy import Column, DateTime
 
 class BaseModel(db.Model):
@@ -13,14 +14,16 @@ class BaseModel(db.Model):
     # Chaque modèle concret (User, Place, Review, etc.)
     # définira son propre 'id = Column(Integer, primary_key=True, autoincrement=True)'
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Indexé sur chaque table : lignes modifiées depuis une date (synchronisation
+    # incrémentale, exports) sans parcourir la table
     updated_at = Column(DateTime, default=datetime.utcnow,
-                        onupdate=datetime.utcnow, nullable=False)
+                        onupdate=datetime.utcnow, nullable=False, index=True)
 
     def save(self):
         """Enregistre ou met à jour l'objet dans la base."""
         self.updated_at = datetime.utcnow()
         db.session.add(self)
-        db.session.commit()
+        commit()
 
     def update(self, data: dict):
         """Met à jour les attributs de l'objet selon le dictionnaire donné."""
@@ -8,7 +8,7 @@ This module defines the Place model with its relationships and validations
 
 from app.extensions import db
 from .base_model import BaseModel
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Table, Index, case, cast, literal_column
 from sqlalchemy.orm import relationship
 
 
@@ -20,7 +20,12 @@ place_amenity_association = Table(
     'place_amenity_association',
     db.metadata,
     Column('place_id', Integer, ForeignKey('places.id'), primary_key=True),
-    Column('amenity_id', Integer, ForeignKey('amenities.id'), primary_key=True)
+    Column('amenity_id', Integer, ForeignKey('amenities.id'), primary_key=True),
+    # La clé primaire (place_id, amenity_id) sert les amenities d'un lieu ;
+    # l'index inverse sert les lieux d'une amenity (filtre, suppression)
+    # The (place_id, amenity_id) primary key serves a place's amenities; the
+    # reverse index serves an amenity's places (filter, deletion)
+    Index('ix_place_amenity_amenity_place', 'amenity_id', 'place_id'),
 )
 
 
@@ -38,6 +43,25 @@ class Place(BaseModel, db.Model):
     """
     
     __tablename__ = 'places'
+    __table_args__ = (
+        # Index B-tree (latitude, longitude), pas un index spatial : la
+        # recherche géographique parcourt la bande de latitude de la boîte et
+        # filtre la longitude ligne à ligne dans l'index (sans lire la table).
+        # Le coût suit le nombre de places de la bande, pas celui de la boîte.
+        # B-tree (latitude, longitude) index, not a spatial index: geo search
+        # scans the latitude band of the box and filters longitude row by row
+        # inside the index (no table reads). Cost follows the number of
+        # places in the band, not in the box.
+        Index('ix_places_lat_lng', 'latitude', 'longitude'),
+        # Tris de la liste (sort=price, sort=-created_at) : index (clé, id),
+        # l'ordre exact de la pagination keyset ; le préfixe price sert aussi
+        # les filtres min_price / max_price
+        # List sorts (sort=price, sort=-created_at): (key, id) indexes, the
+        # exact keyset pagination order; the price prefix also serves the
+        # min_price / max_price filters
+        Index('ix_places_price_id', 'price', 'id'),
+        Index('ix_places_created_at_id', 'created_at', 'id'),
+    )
 
     # ==================== COLONNES / COLUMNS ====================
     
@@ -50,7 +74,21 @@ class Place(BaseModel, db.Model):
 
     # ==================== CLÉS ÉTRANGÈRES / FOREIGN KEYS ====================
     
-    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    # Index : lieux d'un propriétaire (filtre owner_id, User.places)
+    # Index: places of an owner (owner_id filter, User.places)
+    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
+
+    # ==================== AGRÉGATS DES AVIS / REVIEW AGGREGATES ====================
+    
+    # Dénormalisés, maintenus par HBnBFacade à chaque écriture d'avis
+    # Denormalized, maintained by HBnBFacade on every review write
+    review_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_sum = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default='0')
 
     # ==================== RELATIONS / RELATIONSHIPS ====================
     
@@ -184,6 +222,67 @@ class Place(BaseModel, db.Model):
         if amenity not in self.amenities:
             self.amenities.append(amenity)
 
+    # ==================== STATISTIQUES DES AVIS / REVIEW STATISTICS ====================
+
+    @property
+    def average_rating(self):
+        """
+        Note moyenne, None si aucun avis
+        Average rating, None when there is no review
+        """
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def rating_histogram(self):
+        """
+        Nombre d'avis par note (1 à 5)
+        Number of reviews per rating (1 to 5)
+        """
+        return {str(rating): getattr(self, f'rating_{rating}_count') or 0 for rating in range(1, 6)}
+
+    def adjust_rating_stats(self, added=None, removed=None):
+        """
+        Répercute l'ajout et/ou le retrait d'une note sur les agrégats
+        Apply an added and/or removed rating to the aggregates
+
+        Les colonnes reçoivent des expressions SQL (col = col + delta) :
+        l'UPDATE est atomique et part dans la même transaction que l'avis.
+        Columns receive SQL expressions (col = col + delta): the UPDATE is
+        atomic and is flushed in the same transaction as the review.
+
+        Un seul appel par place et par flush : une seconde affectation
+        remplacerait l'expression de la première. Les imports en lot passent
+        donc des listes de notes.
+        One call per place and per flush: a second assignment would replace
+        the first expression. Bulk imports therefore pass lists of ratings.
+
+        Args:
+            added (int | list[int], optional): Note(s) ajoutée(s) / Added rating(s)
+            removed (int | list[int], optional): Note(s) retirée(s) / Removed rating(s)
+        """
+        count_delta = 0
+        sum_delta = 0
+        bucket_deltas = {}
+        for ratings, sign in ((added, 1), (removed, -1)):
+            if ratings is None:
+                continue
+            for rating in ratings if isinstance(ratings, (list, tuple)) else (ratings,):
+                count_delta += sign
+                sum_delta += sign * rating
+                bucket_deltas[rating] = bucket_deltas.get(rating, 0) + sign
+
+        cls = type(self)
+        if count_delta:
+            self.review_count = cls.review_count + count_delta
+        if sum_delta:
+            self.rating_sum = cls.rating_sum + sum_delta
+        for rating, delta in bucket_deltas.items():
+            if delta:
+                column = f'rating_{rating}_count'
+                setattr(self, column, getattr(cls, column) + delta)
+
     # ==================== REPRÉSENTATION / REPRESENTATION ====================
     
     def __repr__(self):
@@ -192,3 +291,18 @@ class Place(BaseModel, db.Model):
         String representation of Place for debugging
         """
         return f"<Place id={self.id} title='{self.title}' owner_id={self.owner_id}>"
+
+
+# ==================== CLÉ DE TRI "NOTE" / RATING SORT KEY ====================
+
+# Note moyenne calculée en SQL, 0 sans avis, indexée avec l'id (sort=rating).
+# Uniquement des littéraux : SQLite n'utilise un index sur expression que si
+# la requête répète exactement la même expression, sans paramètre lié.
+# Average rating computed in SQL, 0 without reviews, indexed with the id
+# (sort=rating). Literals only: SQLite only uses an expression index when
+# the query repeats the exact same expression, without bound parameters.
+rating_sort_key = case(
+    (Place.review_count > literal_column('0'), cast(Place.rating_sum, Float) / Place.review_count),
+    else_=literal_column('0.0'),
+)
+Index('ix_places_rating_id', rating_sort_key, Place.id)
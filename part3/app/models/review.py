@@ -2,17 +2,23 @@ from app.extensions import db
 from .base_model import BaseModel
 from .place import Place
 from .user import User
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 class Review(BaseModel, db.Model):
     __tablename__ = 'reviews'
+    # Un utilisateur ne peut reviewer un lieu qu'une seule fois (index unique composite)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'place_id', name='uq_reviews_user_place'),
+    )
 
     id = Column(Integer, primary_key=True)
     text = Column(String, nullable=False)
     rating = Column(Integer, nullable=False)
 
-    place_id = Column(Integer, ForeignKey('places.id'), nullable=False)
+    # Index sur place_id pour lister les avis d'un lieu ; les recherches par
+    # user_id sont servies par le préfixe de uq_reviews_user_place
+    place_id = Column(Integer, ForeignKey('places.id'), nullable=False, index=True)
     place = relationship("Place", back_populates="reviews", lazy=True)
 
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -27,10 +33,7 @@ class Review(BaseModel, db.Model):
         self.validate_attributes()
 
     def validate_attributes(self):
-        if not isinstance(self.text, str) or not self.text.strip():
-            raise ValueError("Text must be a non-empty string")
-        if not isinstance(self.rating, int) or not (1 <= self.rating <= 5):
-            raise ValueError("Rating must be an integer between 1 and 5")
+        self.validate_content(self.text, self.rating)
         if self.place is None:
             raise ValueError("place cannot be None")
         if not isinstance(self.place, Place):
@@ -40,5 +43,18 @@ class Review(BaseModel, db.Model):
         if not isinstance(self.user, User):
             raise ValueError("user must be an instance of User")
 
+    @staticmethod
+    def validate_content(text, rating):
+        """Valide texte et note sans construire d'avis (utilisé aussi par les imports en lot)."""
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("Text must be a non-empty string")
+        Review.validate_rating(rating)
+
+    @staticmethod
+    def validate_rating(rating):
+        """Note entière de 1 à 5 ; un booléen n'est pas une note (True est un int en Python)."""
+        if isinstance(rating, bool) or not isinstance(rating, int) or not (1 <= rating <= 5):
+            raise ValueError("Rating must be an integer between 1 and 5")
+
     def __repr__(self):
         return f"<Review id={self.id} rating={self.rating}>"
\ No newline at end of file
@@ -0,0 +1,20 @@
+# app/models/revoked_token.py
+from datetime import datetime
+from app.extensions import db
+from sqlalchemy import Column, Integer, String, DateTime
+
+
+class RevokedToken(db.Model):
+    """
+    JWT révoqué (jti), table optionnelle de la liste de révocation.
+    Utilisée seulement si JWT_BLOCKLIST_PERSIST est activé (voir app/tokens.py).
+    """
+    __tablename__ = 'revoked_tokens'
+
+    # L'id croissant sert de curseur aux autres processus qui se synchronisent
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    jti = Column(String(36), unique=True, nullable=False)
+    token_type = Column(String(10), nullable=False)
+    # Au-delà, le jeton est expiré de toute façon : la ligne peut être purgée
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,5 +1,6 @@
 # app/models/user.py
-from app.extensions import db, bcrypt
+from app.extensions import db
+from app.hashing import password_hasher
 from app.models.base_model import BaseModel
 import re
 from sqlalchemy import Column, Integer, String, Boolean
@@ -41,7 +42,7 @@ class User(BaseModel):
         """
         raw_pw = kwargs.get('password')
         if raw_pw is not None and not str(raw_pw).startswith('$2'):
-            kwargs['password'] = bcrypt.generate_password_hash(raw_pw).decode('utf-8')
+            kwargs['password'] = password_hasher.hash(raw_pw)
         super().__init__(*args, **kwargs)
         self.validate()
 
@@ -79,13 +80,17 @@ class User(BaseModel):
         """
         if not str(password_plain).strip():
             raise ValueError("Empty password")
-        self.password = bcrypt.generate_password_hash(password_plain).decode('utf-8')
+        self.password = password_hasher.hash(password_plain)
 
     def verify_password(self, password_plain: str) -> bool:
         """Vérifie un mot de passe contre le hash stocké."""
         if not self.password:
             return False
-        return bcrypt.check_password_hash(self.password, password_plain)
+        return password_hasher.verify(self.password, password_plain)
+
+    def password_needs_rehash(self) -> bool:
+        """Vrai si le hash stocké n'a pas le coût bcrypt configuré (BCRYPT_LOG_ROUNDS)."""
+        return password_hasher.needs_rehash(self.password)
 
     # ----------------------------------------------------------------------
 
@@ -2,6 +2,7 @@
 
 from app.models.amenity import Amenity
 from app.extensions import db
+from app.persistence.unit_of_work import commit, rollback
 from sqlalchemy.exc import IntegrityError
 
 class AmenityRepository:
@@ -22,10 +23,10 @@ class AmenityRepository:
         try:
             amenity = self.model(name=name)
             db.session.add(amenity)
-            db.session.commit()
+            commit()
             return amenity
         except IntegrityError:
-            db.session.rollback()
+            rollback()
             raise ValueError("Erreur lors de la création de l'amenity (contrainte invalide).")
 
     def update(self, amenity_id, data):
@@ -38,7 +39,7 @@ class AmenityRepository:
             if hasattr(amenity, key) and key != "id":
                 setattr(amenity, key, value)
 
-        db.session.commit()
+        commit()
         return amenity
 
     def delete(self, amenity_id):
@@ -48,4 +49,4 @@ class AmenityRepository:
             raise ValueError("Amenity introuvable.")
 
         db.session.delete(amenity)
-        db.session.commit()
+        commit()
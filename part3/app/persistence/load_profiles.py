@@ -0,0 +1,61 @@
+# app/persistence/load_profiles.py
+"""
+Profils de chargement nommés pour les lectures du repository.
+Named load profiles for repository reads.
+
+Un profil décrit les colonnes à charger (load_only) et les relations à
+charger en avance (selectinload / joinedload) pour une forme de réponse
+donnée, afin que la sérialisation d'une liste ne déclenche aucun lazy load.
+A profile lists the columns (load_only) and eagerly loaded relationships
+(selectinload / joinedload) needed by one response shape, so serializing
+a list never triggers a lazy load.
+"""
+
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+def _place_summary():
+    # Colonnes du payload place + ids des amenities (une requête IN par page)
+    # Place payload columns + amenity ids (one IN query per page)
+    return [
+        load_only(Place.id, Place.title, Place.description, Place.price,
+                  Place.latitude, Place.longitude, Place.owner_id,
+                  Place.review_count, Place.rating_sum, Place.rating_1_count,
+                  Place.rating_2_count, Place.rating_3_count,
+                  Place.rating_4_count, Place.rating_5_count),
+        selectinload(Place.amenities).load_only(Amenity.id),
+    ]
+
+
+def _review_summary():
+    # user_id / place_id sont lus sur la ligne : aucune relation à charger
+    # user_id / place_id are read from the row: no relationship to load
+    return [
+        load_only(Review.id, Review.text, Review.rating,
+                  Review.user_id, Review.place_id),
+    ]
+
+
+def _review_with_author():
+    # Nom de l'auteur joint dans la même requête
+    # Author name joined in the same query
+    return _review_summary() + [
+        joinedload(Review.user).load_only(User.id, User.first_name,
+                                          User.last_name, User.email),
+    ]
+
+
+# Profils par modèle, branchés sur les repositories via `load_profiles`
+# Per-model profiles, plugged into repositories through `load_profiles`
+PLACE_PROFILES = {
+    'summary': _place_summary,
+}
+
+REVIEW_PROFILES = {
+    'summary': _review_summary,
+    'with_author': _review_with_author,
+}
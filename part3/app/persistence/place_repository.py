@@ -1,19 +1,182 @@
 # app/persistence/place_repository.py
 
-from app.models.place import Place
+from app.models.place import Place, place_amenity_association, rating_sort_key
+from app.models.review import Review
 from app.extensions import db
+from app.persistence.unit_of_work import commit, rollback
+from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.load_profiles import PLACE_PROFILES
+from app.persistence import search_index
+from sqlalchemy import and_, exists, func, or_, select, update
 from sqlalchemy.exc import IntegrityError
 
-class PlaceRepository:
+# Tris de la liste des lieux : nom -> clé SQL, départagée par l'id ("-nom" : décroissant).
+# Chaque clé a son index (clé, id), voir app/models/place.py
+# Place list sorts: name -> SQL key, ties broken by id ("-name": descending).
+# Every key has its (key, id) index, see app/models/place.py
+SORT_KEYS = {
+    'price': Place.price,
+    'rating': rating_sort_key,
+    'created_at': Place.created_at,
+}
+
+
+class PlaceRepository(SQLAlchemyRepository):
     """Repository spécifique pour le modèle Place (sans relations)."""
 
+    load_profiles = PLACE_PROFILES
+
     def __init__(self):
-        self.model = Place
+        super().__init__(Place)
 
     def get_by_id(self, place_id):
         """Récupère un lieu (Place) par son ID."""
         return db.session.query(self.model).get(place_id)
 
+    def get_page(self, limit, after=None, profile='summary', sort=None, **filters):
+        """
+        Récupère une page de lieux (pagination keyset sur l'id, ou sur (clé, id)).
+        Fetch one page of places using keyset pagination on id, or on (key, id).
+
+        Tous les filtres sont appliqués en SQL : une seule requête par page.
+        All filters are applied in SQL: a single query per page.
+
+        :param limit: Nombre maximum de lieux / Maximum number of places.
+        :param after: Sans tri : dernier id de la page précédente ; avec tri :
+                      (valeur de la clé, id) du dernier lieu.
+                      Without sort: last id of the previous page; with a sort:
+                      (key value, id) of the last place.
+        :param sort: Nom de SORT_KEYS, préfixé par '-' pour l'ordre décroissant.
+        :param filters: min_price, max_price, owner_id, amenity_ids (voir filtered_query).
+        :param profile: Profil de chargement / Load profile (see load_profiles).
+        :return: (places, next_cursor) - next_cursor vaut None sur la dernière page.
+        """
+        query = self.filtered_query(profile, **filters)
+        if sort is None:
+            return self.keyset_page(query, limit, after)
+        descending = sort.startswith('-')
+        key = SORT_KEYS.get(sort.lstrip('-'))
+        if key is None:
+            raise ValueError(f"Unknown sort '{sort}'")
+        return self.sorted_keyset_page(query, key, limit, after, descending)
+
+    def stream_filtered(self, batch_size, after=None, profile='summary', **filters):
+        """
+        Parcourt tous les lieux filtrés par lots (export en flux).
+        Iterate over all filtered places in batches (streaming export).
+        """
+        return self.stream(self.filtered_query(profile, **filters), batch_size, after)
+
+    def filtered_query(self, profile='summary', min_price=None, max_price=None,
+                       owner_id=None, amenity_ids=None):
+        """
+        Requête sur les lieux avec les filtres de la liste appliqués.
+        Query on places with the list filters applied.
+
+        :param amenity_ids: Le lieu doit posséder toutes ces amenities.
+        """
+        query = self.query(profile)
+
+        if min_price is not None:
+            query = query.filter(self.model.price >= min_price)
+        if max_price is not None:
+            query = query.filter(self.model.price <= max_price)
+        if owner_id is not None:
+            query = query.filter(self.model.owner_id == owner_id)
+
+        # Un EXISTS par amenity sur la table d'association (pas de jointure sur amenities)
+        # One EXISTS per amenity on the association table (no join on amenities)
+        for amenity_id in amenity_ids or []:
+            query = query.filter(exists().where(and_(
+                place_amenity_association.c.place_id == self.model.id,
+                place_amenity_association.c.amenity_id == amenity_id,
+            )))
+
+        return query
+
+    def get_many(self, place_ids, profile='summary'):
+        """Récupère les lieux dont l'id est dans place_ids (une requête IN)."""
+        if not place_ids:
+            return []
+        return self.query(profile).filter(self.model.id.in_(place_ids)).all()
+
+    def get_coordinates_in_box(self, lat_range, lng_ranges, **filters):
+        """
+        Retourne (id, latitude, longitude) des lieux situés dans la boîte.
+        Return (id, latitude, longitude) of the places inside the box.
+
+        Requête couverte par l'index B-tree ix_places_lat_lng : balayage de
+        la bande de latitude, longitude filtrée sur chaque entrée de l'index.
+        Ce n'est pas un index spatial ; seules les colonnes utiles au calcul
+        de distance sont lues.
+        Covered by the ix_places_lat_lng B-tree index: a scan of the latitude
+        band, with longitude filtered on each index entry. This is not a
+        spatial index; only the columns needed for the distance computation
+        are read.
+
+        :param lat_range: (min_lat, max_lat)
+        :param lng_ranges: Liste de (min_lng, max_lng) / List of (min_lng, max_lng)
+        :param filters: Filtres de la liste (voir filtered_query) / List filters.
+        """
+        return self.filtered_query(None, **filters).with_entities(self.model.id, self.model.latitude, self.model.longitude).filter(
+            self.model.latitude.between(*lat_range),
+            or_(*(self.model.longitude.between(min_lng, max_lng) for min_lng, max_lng in lng_ranges)),
+        ).all()
+
+    def search_text(self, user_query, limit, offset=0, profile='summary'):
+        """
+        Recherche plein texte sur le titre et la description.
+        Full-text search on title and description.
+
+        Utilise l'index FTS5 (classement BM25 + extrait) quand il est
+        disponible, sinon un LIKE sur le titre sans classement ni extrait.
+        Uses the FTS5 index (BM25 ranking + snippet) when available,
+        otherwise a LIKE on the title with no ranking nor snippet.
+
+        :return: Liste de (place, snippet) / List of (place, snippet).
+        """
+        match_query = search_index.to_match_query(user_query)
+        if match_query is None:
+            return []
+
+        if search_index.is_available():
+            hits = search_index.search(match_query, limit, offset)
+            places = {place.id: place for place in self.get_many([pid for pid, _ in hits], profile)}
+            return [(places[pid], snippet) for pid, snippet in hits if pid in places]
+
+        pattern = f"%{user_query.strip()}%"
+        places = self.query(profile).filter(self.model.title.ilike(pattern)) \
+            .order_by(self.model.id).limit(limit).offset(offset).all()
+        return [(place, None) for place in places]
+
+    def rebuild_rating_stats(self):
+        """
+        Recalcule les agrégats d'avis de chaque lieu depuis la table reviews.
+        Recompute every place's review aggregates from the reviews table.
+
+        Un seul UPDATE avec sous-requêtes corrélées ; seuls les lieux dont
+        les agrégats ont dérivé sont réécrits.
+        A single UPDATE with correlated subqueries; only places whose
+        aggregates drifted are rewritten.
+
+        :return: Nombre de lieux corrigés / Number of places repaired.
+        """
+        def per_place(expression, *conditions):
+            return select(expression).where(Review.place_id == self.model.id, *conditions) \
+                .scalar_subquery()
+
+        values = {
+            'review_count': per_place(func.count(Review.id)),
+            'rating_sum': per_place(func.coalesce(func.sum(Review.rating), 0)),
+        }
+        for rating in range(1, 6):
+            values[f'rating_{rating}_count'] = per_place(func.count(Review.id), Review.rating == rating)
+
+        drifted = or_(*(getattr(self.model, column) != value for column, value in values.items()))
+        result = db.session.execute(update(self.model).where(drifted).values(**values))
+        commit()
+        return result.rowcount
+
     def create(self, title, description, price, latitude, longitude, owner_id=None):
         """Crée un nouveau lieu (Place) et l'enregistre en base."""
         try:
@@ -26,10 +189,10 @@ class PlaceRepository:
                 owner_id=owner_id,
             )
             db.session.add(place)
-            db.session.commit()
+            commit()
             return place
         except IntegrityError:
-            db.session.rollback()
+            rollback()
             raise ValueError("Erreur lors de la création du lieu (doublon ou contrainte invalide).")
 
     def update(self, place_id, data):
@@ -43,7 +206,7 @@ class PlaceRepository:
             if hasattr(place, key) and key != "id":
                 setattr(place, key, value)
 
-        db.session.commit()
+        commit()
         return place
 
     def delete(self, place_id):
@@ -53,4 +216,4 @@ class PlaceRepository:
             raise ValueError("Lieu introuvable.")
 
         db.session.delete(place)
-        db.session.commit()
+        commit()
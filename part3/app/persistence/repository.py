@@ -1,6 +1,9 @@
 import logging
 from abc import ABC, abstractmethod
+from datetime import datetime
+from sqlalchemy import DateTime, or_, select
 from app.extensions import db  # Import SQLAlchemy instance for database operations
+from app.persistence.unit_of_work import commit
 
 logger = logging.getLogger(__name__)
 
@@ -46,18 +49,18 @@ class InMemoryRepository(Repository):
         self._storage = {}
 
     def add(self, obj):
-        logger.debug(f"Adding item with ID {obj.id} to repository")
+        logger.debug("Adding item with ID %s to repository", obj.id)
         self._storage[obj.id] = obj
-        logger.debug(f"Repository now contains {len(self._storage)} items")
+        logger.debug("Repository now contains %s items", len(self._storage))
         return obj
 
     def get(self, obj_id):
-        logger.debug(f"Fetching item with ID {obj_id}")
+        logger.debug("Fetching item with ID %s", obj_id)
         obj = self._storage.get(obj_id)
         if obj:
-            logger.debug(f"Found item with ID {obj_id}")
+            logger.debug("Found item with ID %s", obj_id)
         else:
-            logger.debug(f"No item found with ID {obj_id}")
+            logger.debug("No item found with ID %s", obj_id)
         return obj
 
     def get_all(self):
@@ -68,32 +71,72 @@ class InMemoryRepository(Repository):
             obj = self._storage[obj_id]
             for key, value in data.items():
                 setattr(obj, key, value)
-            logger.debug(f"Updated item with ID {obj_id}")
+            logger.debug("Updated item with ID %s", obj_id)
             return obj
-        logger.debug(f"Failed to update: no item with ID {obj_id}")
+        logger.debug("Failed to update: no item with ID %s", obj_id)
         return None
 
     def delete(self, obj_id):
         if obj_id in self._storage:
             del self._storage[obj_id]
-            logger.debug(f"Deleted item with ID {obj_id}")
+            logger.debug("Deleted item with ID %s", obj_id)
             return True
-        logger.debug(f"Failed to delete: no item with ID {obj_id}")
+        logger.debug("Failed to delete: no item with ID %s", obj_id)
         return False
 
     def get_by_attribute(self, attr_name, attr_value):
-        logger.debug(f"Searching for item with {attr_name}={attr_value}")
+        logger.debug("Searching for item with %s=%s", attr_name, attr_value)
         for obj in self._storage.values():
             if getattr(obj, attr_name, None) == attr_value:
-                logger.debug(f"Found item with {attr_name}={attr_value}")
+                logger.debug("Found item with %s=%s", attr_name, attr_value)
                 return obj
-        logger.debug(f"No item found with {attr_name}={attr_value}")
+        logger.debug("No item found with %s=%s", attr_name, attr_value)
         return None
 
 
-class SQLAlchemyRepository(Repository):
+class RowQueryMixin:
+    """
+    Column-projection reads shared by the SQLAlchemy-backed repositories.
+
+    The host class sets `self.model` to the mapped class it manages.
+    """
+
+    def _row_statement(self, columns):
+        """Build a SELECT of the named columns of this model, ordered by id."""
+        selected = [getattr(self.model, name) for name in columns]
+        return select(*selected).order_by(self.model.id)
+
+    def get_rows(self, columns):
+        """
+        Fetch all rows of this model as plain Row tuples, ordered by id.
+
+        Rows skip the identity map and ORM state tracking, which makes them
+        much cheaper than instances for read-only list payloads.
+
+        :param columns: Names of the columns to select.
+        :return: A list of Row tuples with attribute access by column name.
+        """
+        return db.session.execute(self._row_statement(columns)).all()
+
+    def stream_rows(self, columns, batch_size):
+        """
+        Stream all rows of this model as Row tuples, in id order.
+
+        :param columns: Names of the columns to select.
+        :param batch_size: Number of rows fetched per round trip.
+        :return: A result iterating over Row tuples.
+        """
+        statement = self._row_statement(columns).execution_options(yield_per=batch_size)
+        return db.session.execute(statement)
+
+
+class SQLAlchemyRepository(RowQueryMixin, Repository):
     """SQLAlchemy implementation of the repository for persistent storage."""
 
+    # Named load profiles (name -> callable returning loader options),
+    # filled in by model-specific repositories.
+    load_profiles = {}
+
     def __init__(self, model):
         """
         Initialize the repository with a specific SQLAlchemy model.
@@ -109,9 +152,9 @@ class SQLAlchemyRepository(Repository):
         :param obj: The object to be added.
         :return: The added object.
         """
-        logger.debug(f"Adding item with ID {getattr(obj, 'id', None)} to repository")
+        logger.debug("Adding item with ID %s to repository", getattr(obj, 'id', None))
         db.session.add(obj)
-        db.session.commit()
+        commit()
         return obj
 
     def get(self, obj_id):
@@ -121,17 +164,143 @@ class SQLAlchemyRepository(Repository):
         :param obj_id: The ID of the object to fetch.
         :return: The fetched object or None if not found.
         """
-        logger.debug(f"Fetching item with ID {obj_id}")
+        logger.debug("Fetching item with ID %s", obj_id)
         return self.model.query.get(obj_id)
 
-    def get_all(self):
+    def get_all(self, profile=None):
         """
         Fetch all objects of this model.
 
+        :param profile: Optional name of a load profile to apply.
         :return: A list of all objects.
         """
         logger.debug("Fetching all items from repository")
-        return self.model.query.all()
+        return self.query(profile).all()
+
+    def get_column(self, obj_id, attr_name):
+        """
+        Read a single column of one object, without loading the instance.
+
+        :param obj_id: The ID of the object.
+        :param attr_name: Name of the column to read (e.g. 'owner_id').
+        :return: The column value, or None if the object does not exist.
+        """
+        column = getattr(self.model, attr_name)
+        return db.session.execute(select(column).where(self.model.id == obj_id)).scalar_one_or_none()
+
+    def map_ids(self, attr_name, values):
+        """
+        Map attribute values to object ids with a single IN query.
+
+        :param attr_name: Name of the attribute to match (e.g. 'id', 'name').
+        :param values: Values to look up.
+        :return: A dict {value: id} for the values that exist.
+        """
+        if not values:
+            return {}
+        column = getattr(self.model, attr_name)
+        rows = db.session.execute(select(column, self.model.id).where(column.in_(set(values))))
+        return {value: obj_id for value, obj_id in rows}
+
+    def stream(self, query, batch_size, after=None):
+        """
+        Iterate over `query` in id order, fetching `batch_size` rows at a time.
+
+        yield_per streams through a server-side cursor where the driver has
+        one: memory stays bounded by the batch size, not the table size.
+
+        :param query: A query on this model (filters and load profile applied).
+        :param batch_size: Number of rows fetched per round trip.
+        :param after: Only objects with an id greater than this one (resume point).
+        :return: A lazy iterable of objects.
+        """
+        if after is not None:
+            query = query.filter(self.model.id > after)
+        return query.order_by(self.model.id).yield_per(batch_size)
+
+    def query(self, profile=None):
+        """
+        Build a query on this model with the given load profile applied.
+
+        :param profile: Name of a load profile, or None for default loading.
+        :return: A SQLAlchemy query.
+        :raises ValueError: If the profile is unknown for this repository.
+        """
+        query = self.model.query
+        if profile is not None:
+            if profile not in self.load_profiles:
+                raise ValueError(f"Unknown load profile '{profile}' for {self.model.__name__}")
+            query = query.options(*self.load_profiles[profile]())
+        return query
+
+    def keyset_page(self, query, limit, after=None):
+        """
+        Fetch one page of `query` using keyset pagination on the primary key.
+
+        One extra row is read to know whether another page follows.
+
+        :param query: A query on this model (filters already applied).
+        :param limit: Maximum number of objects to return.
+        :param after: Id of the last object of the previous page.
+        :return: (objects, next_cursor) where next_cursor is None on the last page.
+        """
+        if after is not None:
+            query = query.filter(self.model.id > after)
+        objects = query.order_by(self.model.id).limit(limit + 1).all()
+        if len(objects) > limit:
+            objects = objects[:limit]
+            return objects, str(objects[-1].id)
+        return objects, None
+
+    def sorted_keyset_page(self, query, key, limit, after=None, descending=False):
+        """
+        Fetch one page of `query` ordered by (key, id) using keyset pagination.
+
+        The cursor condition is written key >= v AND (key > v OR id > last_id)
+        (mirrored when descending) rather than as a row-value comparison:
+        every backend, SQLite included, seeks an index on (key, id) with it,
+        so a deep page costs the same as the first one.
+
+        :param query: A query on this model (filters already applied).
+        :param key: Column or SQL expression to sort on (ties broken by id).
+        :param limit: Maximum number of objects to return.
+        :param after: (key value, id) of the last object of the previous page.
+        :param descending: Sort from the largest key down.
+        :return: (objects, next_cursor) where next_cursor is the (key value, id)
+                 of the last object, None on the last page.
+        :raises ValueError: If `after` does not fit the key.
+        """
+        id_column = self.model.id
+        if after is not None:
+            value, last_id = self._cursor_values(key, after)
+            if descending:
+                query = query.filter(key <= value, or_(key < value, id_column < last_id))
+            else:
+                query = query.filter(key >= value, or_(key > value, id_column > last_id))
+        order = (key.desc(), id_column.desc()) if descending else (key, id_column)
+        rows = query.add_columns(key).order_by(*order).limit(limit + 1).all()
+        objects = [row[0] for row in rows[:limit]]
+        if len(rows) > limit:
+            return objects, (rows[limit - 1][1], objects[-1].id)
+        return objects, None
+
+    @staticmethod
+    def _cursor_values(key, after):
+        """Check a (key value, id) cursor coming from a client."""
+        try:
+            value, last_id = after
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        if isinstance(key.type, DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError("Invalid cursor")
+        if isinstance(last_id, bool) or not isinstance(last_id, int):
+            raise ValueError("Invalid cursor")
+        return value, last_id
 
     def update(self, obj_id, data):
         """
@@ -145,10 +314,10 @@ class SQLAlchemyRepository(Repository):
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
-            logger.debug(f"Updated item with ID {obj_id}")
+            commit()
+            logger.debug("Updated item with ID %s", obj_id)
             return obj
-        logger.debug(f"Failed to update: no item with ID {obj_id}")
+        logger.debug("Failed to update: no item with ID %s", obj_id)
         return None
 
     def delete(self, obj_id):
@@ -161,10 +330,10 @@ class SQLAlchemyRepository(Repository):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
-            logger.debug(f"Deleted item with ID {obj_id}")
+            commit()
+            logger.debug("Deleted item with ID %s", obj_id)
             return True
-        logger.debug(f"Failed to delete: no item with ID {obj_id}")
+        logger.debug("Failed to delete: no item with ID %s", obj_id)
         return False
 
     def get_by_attribute(self, attr_name, attr_value):
@@ -175,6 +344,6 @@ class SQLAlchemyRepository(Repository):
         :param attr_value: The value of the attribute to filter by.
         :return: The first matching object or None if not found.
         """
-        logger.debug(f"Searching for item with {attr_name}={attr_value}")
+        logger.debug("Searching for item with %s=%s", attr_name, attr_value)
         # Use getattr to access the attribute of the model and filter by it
         return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
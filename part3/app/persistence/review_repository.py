@@ -2,21 +2,62 @@
 
 from app.models.review import Review
 from app.extensions import db
+from app.persistence.unit_of_work import commit, rollback
+from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.load_profiles import REVIEW_PROFILES
+from sqlalchemy import exists
 from sqlalchemy.exc import IntegrityError
 
-class ReviewRepository:
+class ReviewRepository(SQLAlchemyRepository):
     """
     Repository spécifique pour le modèle Review,
     sans relations (pas de foreign key).
     """
 
+    load_profiles = REVIEW_PROFILES
+
     def __init__(self):
-        self.model = Review
+        super().__init__(Review)
 
     def get_by_id(self, review_id):
         """Récupère un avis (Review) par son ID."""
         return db.session.query(self.model).get(review_id)
 
+    def exists_for(self, user_id, place_id):
+        """
+        Indique si l'utilisateur a déjà un avis sur ce lieu.
+        Une seule requête EXISTS servie par l'index uq_reviews_user_place.
+        """
+        return db.session.query(exists().where(
+            self.model.user_id == user_id,
+            self.model.place_id == place_id,
+        )).scalar()
+
+    def get_by_user_and_places(self, user_id, place_ids):
+        """
+        Avis existants d'un utilisateur sur un ensemble de lieux (une requête IN).
+        Existing reviews of one user on a set of places (one IN query).
+        """
+        if not place_ids:
+            return []
+        return self.model.query.filter(self.model.user_id == user_id,
+                                       self.model.place_id.in_(set(place_ids))).all()
+
+    def get_by_place(self, place_id, profile=None):
+        """Récupère tous les avis d'un lieu (filtré en SQL, index ix_reviews_place_id)."""
+        return self.query(profile).filter(self.model.place_id == place_id) \
+            .order_by(self.model.id).all()
+
+    def get_page_by_place(self, place_id, limit, after=None, profile='with_author'):
+        """
+        Récupère une page d'avis d'un lieu (pagination keyset sur l'id).
+        Le profil par défaut joint le nom de l'auteur dans la même requête.
+
+        :return: (reviews, next_cursor) - next_cursor vaut None sur la dernière page.
+        """
+        query = self.query(profile).filter(self.model.place_id == place_id)
+        return self.keyset_page(query, limit, after)
+
     def create(self, text, rating, place_id=None, user_id=None):
         """
         Crée un nouvel avis (Review) et l'enregistre en base.
@@ -33,10 +74,10 @@ class ReviewRepository:
                 review.user_id = user_id
 
             db.session.add(review)
-            db.session.commit()
+            commit()
             return review
         except IntegrityError:
-            db.session.rollback()
+            rollback()
             raise ValueError("Erreur lors de la création du review (contrainte invalide).")
 
     def update(self, review_id, data):
@@ -47,11 +88,12 @@ class ReviewRepository:
         if not review:
             raise ValueError("Review introuvable.")
 
+        # L'avis reste attaché à sa place et à son auteur
         for key, value in data.items():
-            if hasattr(review, key) and key != "id":
+            if hasattr(review, key) and key not in ("id", "place_id", "user_id"):
                 setattr(review, key, value)
 
-        db.session.commit()
+        commit()
         return review
 
     def delete(self, review_id):
@@ -63,4 +105,4 @@ class ReviewRepository:
             raise ValueError("Review introuvable.")
 
         db.session.delete(review)
-        db.session.commit()
\ No newline at end of file
+        commit()
\ No newline at end of file
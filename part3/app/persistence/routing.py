@@ -0,0 +1,182 @@
+# app/persistence/routing.py
+"""
+Routage lecture / écriture entre la base primaire et une réplique
+Read / write routing between the primary database and a replica
+
+Quand SQLALCHEMY_REPLICA_URI est configurée, elle devient le bind
+'replica'. Les lectures faites dans `reading_from_replica()` (les méthodes
+get_* de la facade) y sont envoyées ; tout le reste va à la primaire.
+When SQLALCHEMY_REPLICA_URI is set it becomes the 'replica' bind. Reads
+made inside `reading_from_replica()` (the facade get_* methods) go there;
+everything else goes to the primary.
+
+Lire ses propres écritures : dès qu'une session écrit (flush, INSERT /
+UPDATE / DELETE, unité de travail), elle reste collée à la primaire jusqu'à
+la fin de la requête, la réplique pouvant être en retard.
+Read-your-writes: once a session writes (flush, INSERT / UPDATE / DELETE,
+unit of work), it sticks to the primary until the end of the request,
+since the replica may lag behind.
+
+Les instances lues sur la réplique sont expirées quand la session passe à
+la primaire : une écriture ne part jamais de données en retard, elles sont
+relues sur la primaire au premier accès. Les lectures qui précèdent une
+écriture (existence, propriétaire, If-Match) passent par `primary_read`.
+Instances read from the replica are expired when the session switches to
+the primary: a write never starts from lagging data, it is re-read from
+the primary on first access. Reads made before a write (existence, owner,
+If-Match) go through `primary_read`.
+"""
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, scoped_session
+
+REPLICA = 'replica'
+
+_READ_DEPTH = 'replica_read_depth'
+_STICKY = 'primary_sticky'
+_REPLICA_LOADED = 'replica_loaded'
+
+
+class RoutingSession(Session):
+    """
+    Session Flask-SQLAlchemy qui envoie les lectures marquées à la réplique.
+    Flask-SQLAlchemy session sending marked reads to the replica.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if getattr(clause, 'is_dml', False):
+                stick_to_primary(self)
+            elif self._reads_from_replica():
+                return self._db.engines[REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self):
+        return (self.info.get(_READ_DEPTH, 0) > 0
+                and not self.info.get(_STICKY, False)
+                and not self._flushing
+                and REPLICA in self._db.engines)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _stick_after_flush(session, flush_context):
+    stick_to_primary(session)
+
+
+@event.listens_for(Mapper, 'load')
+def _track_load(instance, context):
+    _track(context, instance)
+
+
+@event.listens_for(Mapper, 'refresh')
+def _track_refresh(instance, context, attrs):
+    _track(context, instance)
+
+
+def _track(context, instance):
+    """Retient les instances chargées depuis la réplique / Remember instances loaded from the replica."""
+    # Pas de contexte : valeurs d'un UPDATE en masse, pas d'une lecture
+    # No context: values from a bulk UPDATE, not from a read
+    session = getattr(context, 'session', None)
+    if not isinstance(session, RoutingSession):
+        return
+    if session._reads_from_replica():
+        session.info.setdefault(_REPLICA_LOADED, {})[id(instance)] = instance
+    elif _REPLICA_LOADED in session.info:
+        # Relue sur la primaire / Re-read from the primary
+        session.info[_REPLICA_LOADED].pop(id(instance), None)
+
+
+def stick_to_primary(session):
+    """
+    Envoie les lectures suivantes de `session` à la primaire et expire les
+    instances lues sur la réplique (hors flush, où il est trop tard).
+    Send later reads of `session` to the primary and expire the instances
+    read from the replica (outside a flush, where it is too late).
+    """
+    if isinstance(session, scoped_session):
+        session = session()
+    session.info[_STICKY] = True
+    if session._flushing:
+        return
+    for instance in session.info.pop(_REPLICA_LOADED, {}).values():
+        if instance in session:
+            session.expire(instance)
+
+
+def reset(session):
+    """Oublie la primaire collante (début de requête) / Forget stickiness (start of a request)."""
+    session.info.pop(_STICKY, None)
+    session.info.pop(_REPLICA_LOADED, None)
+
+
+@contextmanager
+def reading_from_replica():
+    """
+    Les lectures du bloc peuvent être servies par la réplique.
+    Reads in the block may be served by the replica.
+    """
+    session = current_app.extensions['sqlalchemy'].session
+    info = session.info
+    info[_READ_DEPTH] = info.get(_READ_DEPTH, 0) + 1
+    try:
+        yield session
+    finally:
+        info[_READ_DEPTH] -= 1
+
+
+def replica_read(func):
+    """Décorateur : exécute la méthode dans reading_from_replica() / Decorator form."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with reading_from_replica():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def primary_read(func):
+    """
+    Décorateur des lectures qui précèdent une écriture : la session passe à
+    la primaire avant la méthode (voir stick_to_primary).
+    Decorator for reads made before a write: the session switches to the
+    primary before the method runs (see stick_to_primary).
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        stick_to_primary(current_app.extensions['sqlalchemy'].session)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def engine_options(config):
+    """
+    Options de pool du moteur à partir des clés DB_POOL_* de la config.
+    Seules les clés définies sont passées : le pool d'une base SQLite en
+    mémoire (StaticPool) refuse pool_size / max_overflow.
+    Engine pool options from the DB_POOL_* config keys. Only the keys that
+    are set are passed: an in-memory SQLite pool (StaticPool) rejects
+    pool_size / max_overflow.
+    """
+    keys = {'DB_POOL_SIZE': 'pool_size', 'DB_POOL_MAX_OVERFLOW': 'max_overflow',
+            'DB_POOL_RECYCLE': 'pool_recycle', 'DB_POOL_TIMEOUT': 'pool_timeout',
+            'DB_POOL_PRE_PING': 'pool_pre_ping'}
+    return {option: config[key] for key, option in keys.items() if config.get(key) is not None}
+
+
+def configure(config):
+    """
+    Complète la config Flask-SQLAlchemy avant db.init_app : options de pool
+    (appliquées à tous les moteurs) et bind 'replica' si une réplique est définie.
+    Complete the Flask-SQLAlchemy config before db.init_app: pool options
+    (applied to every engine) and the 'replica' bind when a replica is set.
+    """
+    options = dict(engine_options(config), **config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    replica_uri = config.get('SQLALCHEMY_REPLICA_URI')
+    if replica_uri:
+        binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+        binds[REPLICA] = replica_uri
+        config['SQLALCHEMY_BINDS'] = binds
@@ -0,0 +1,195 @@
+# app/persistence/schema_check.py
+"""
+Contrôles du schéma : setup.sql face aux modèles, index manquants d'après
+les requêtes journalisées
+Schema checks: setup.sql against the models, missing indexes according to
+logged queries
+
+Les deux schémas sont construits dans des bases SQLite en mémoire puis
+comparés par introspection : tables, colonnes, et index comparés par
+(colonnes, unicité) plutôt que par nom (une contrainte UNIQUE en ligne et
+un index unique nommé sont équivalents). L'index plein texte places_fts,
+hors des modèles, est ignoré.
+Both schemas are built in in-memory SQLite databases, then compared by
+introspection: tables, columns, and indexes compared by (columns,
+uniqueness) rather than by name (an inline UNIQUE constraint and a named
+unique index are equivalent). The places_fts full-text index, outside
+the models, is ignored.
+
+Les requêtes journalisées (log 'app.slow_requests', texte ou JSON, ou un
+SELECT par ligne) sont passées à EXPLAIN QUERY PLAN sur le schéma des
+modèles : un SCAN sans index ou un tri en B-tree temporaire signale un
+index manquant.
+Logged queries (the 'app.slow_requests' log, text or JSON, or one SELECT
+per line) go through EXPLAIN QUERY PLAN on the models' schema: a SCAN
+without an index or a temporary B-tree sort points at a missing index.
+"""
+import json
+import re
+import sqlite3
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+IGNORED_TABLE_PREFIXES = ('places_fts', 'sqlite_', 'alembic_version')
+
+# Préfixe "[3x, 1.20 ms] " des lignes du log des requêtes lentes
+_SLOW_LOG_PREFIX = re.compile(r'^\[\d+x, [\d.]+ ms\]\s*')
+_SLOW_LOG_COUNT = re.compile(r'^\[(\d+)x')
+_FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+_TEMP_SORT = re.compile(r'USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)')
+
+
+def _memory_engine():
+    return create_engine('sqlite://', poolclass=StaticPool)
+
+
+def engine_from_sql(script):
+    """Base en mémoire créée par un script SQL (setup.sql) / In-memory database built by a SQL script."""
+    engine = _memory_engine()
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.executescript(script)
+    finally:
+        raw.close()
+    return engine
+
+
+def engine_from_metadata(metadata):
+    """Base en mémoire créée depuis les modèles / In-memory database built from the models."""
+    engine = _memory_engine()
+    metadata.create_all(engine)
+    return engine
+
+
+def describe(engine):
+    """
+    {table: {'columns': {nom}, 'indexes': {(colonnes): unique}}}, clé
+    primaire exclue. Lu par PRAGMA : les contraintes UNIQUE en ligne
+    (sqlite_autoindex_*) sont comptées comme index uniques.
+    {table: {'columns': {name}, 'indexes': {(columns): unique}}}, primary
+    key excluded. Read through PRAGMAs: inline UNIQUE constraints
+    (sqlite_autoindex_*) count as unique indexes.
+    """
+    schema = {}
+    with engine.connect() as connection:
+        tables = connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name").scalars().all()
+        for table in tables:
+            if table.startswith(IGNORED_TABLE_PREFIXES):
+                continue
+            columns = {row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{table}")')}
+            indexes = {}
+            # (seq, name, unique, origin, partial) ; origin 'pk' : clé primaire
+            for _, name, unique, origin, _ in connection.exec_driver_sql(f'PRAGMA index_list("{table}")'):
+                if origin == 'pk':
+                    continue
+                info = connection.exec_driver_sql(f'PRAGMA index_info("{name}")').all()
+                # Colonne d'expression : nom NULL / Expression column: NULL name
+                indexes[tuple(row[2] or '<expr>' for row in sorted(info))] = bool(unique)
+            schema[table] = {'columns': columns, 'indexes': indexes}
+    return schema
+
+
+def diff_schemas(expected, actual):
+    """
+    Différences entre le schéma attendu (modèles) et l'autre (setup.sql),
+    une ligne lisible chacune ; liste vide si identiques.
+    Differences between the expected schema (models) and the other one
+    (setup.sql), one readable line each; empty list when identical.
+    """
+    problems = []
+    for table in sorted(set(expected) | set(actual)):
+        if table not in actual:
+            problems.append(f"{table}: table missing from setup.sql")
+            continue
+        if table not in expected:
+            problems.append(f"{table}: table not in the models")
+            continue
+        wanted, found = expected[table], actual[table]
+        for column in sorted(wanted['columns'] - found['columns']):
+            problems.append(f"{table}.{column}: column missing from setup.sql")
+        for column in sorted(found['columns'] - wanted['columns']):
+            problems.append(f"{table}.{column}: column not in the models")
+        for columns in sorted(set(wanted['indexes']) | set(found['indexes'])):
+            label = f"{table}({', '.join(columns)})"
+            if columns not in found['indexes']:
+                problems.append(f"{label}: index missing from setup.sql")
+            elif columns not in wanted['indexes']:
+                problems.append(f"{label}: index not in the models")
+            elif wanted['indexes'][columns] != found['indexes'][columns]:
+                unique = 'unique' if found['indexes'][columns] else 'not unique'
+                problems.append(f"{label}: {unique} in setup.sql, not in the models")
+    return problems
+
+
+def read_query_log(lines):
+    """
+    SELECT distincts d'un log -> nombre d'exécutions, dans l'ordre d'apparition.
+    Distinct SELECTs of a log -> number of executions, in order of appearance.
+    """
+    statements = {}
+    for line in lines:
+        line = line.strip()
+        if line.startswith('{'):
+            try:
+                entries = json.loads(line).get('message', '').splitlines()
+            except ValueError:
+                continue
+        else:
+            entries = [line]
+        for entry in entries:
+            entry = entry.strip()
+            count = _SLOW_LOG_COUNT.match(entry)
+            statement = ' '.join(_SLOW_LOG_PREFIX.sub('', entry).split())
+            if statement.upper().startswith(('SELECT', 'WITH')):
+                statements[statement] = statements.get(statement, 0) + (int(count.group(1)) if count else 1)
+    return statements
+
+
+def missing_indexes(engine, statements):
+    """
+    Plans des requêtes sur `engine` : (requête, exécutions, constats) pour
+    chaque requête dont le plan parcourt une table entière ou trie hors index.
+    Plans of the queries on `engine`: (query, executions, findings) for every
+    query whose plan scans a whole table or sorts outside an index.
+    """
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.driver_connection.cursor()
+        report = []
+        for statement, executions in statements.items():
+            try:
+                # Paramètres inconnus (non journalisés) : NULL suffit au planificateur
+                rows = cursor.execute('EXPLAIN QUERY PLAN ' + statement,
+                                      (None,) * statement.count('?')).fetchall()
+            except sqlite3.Error as e:
+                report.append((statement, executions, [f"no plan: {e}"]))
+                continue
+            findings = []
+            for row in rows:
+                step = row[-1]
+                scan = _FULL_SCAN.match(step)
+                if scan:
+                    columns = _filtered_columns(statement, scan.group(1))
+                    hint = f" (filtered on {', '.join(columns)})" if columns else ''
+                    findings.append(f"full scan of {scan.group(1)}{hint}")
+                elif _TEMP_SORT.search(step):
+                    findings.append(step.lower().replace('use temp b-tree', 'sort without index'))
+            if findings:
+                report.append((statement, executions, findings))
+        return report
+    finally:
+        raw.close()
+
+
+def _filtered_columns(statement, table):
+    """Colonnes de `table` comparées dans le WHERE / Columns of `table` compared in the WHERE."""
+    _, _, where = statement.upper().partition(' WHERE ')
+    if not where:
+        return []
+    pattern = rf'\b{re.escape(table.upper())}\.(\w+)\s*(?:=|<|>|!=|\bIN\b|\bLIKE\b|\bBETWEEN\b|\bIS\b)'
+    columns = []
+    for column in re.findall(pattern, where):
+        if column.lower() not in columns:
+            columns.append(column.lower())
+    return columns
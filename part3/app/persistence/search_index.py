@@ -0,0 +1,178 @@
+# app/persistence/search_index.py
+"""
+Index plein texte des places (SQLite FTS5)
+Full-text index of places (SQLite FTS5)
+
+La table virtuelle places_fts est un index "external content" sur
+places(title, description) : elle ne stocke que l'index, et des triggers
+la tiennent à jour à chaque INSERT / UPDATE / DELETE sur places, quel que
+soit le chemin d'écriture (facade, repository, SQL direct).
+The places_fts virtual table is an external-content index over
+places(title, description): it only stores the index, and triggers keep
+it in sync on every INSERT / UPDATE / DELETE on places, whatever the
+write path (facade, repository, raw SQL).
+
+Table et triggers sont créés par la migration 0008_places_fts ; create()
+refait les mêmes objets pour les bases issues de db.create_all.
+The table and triggers are created by the 0008_places_fts migration;
+create() builds the same objects for databases made by db.create_all.
+"""
+import logging
+import re
+import weakref
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'places_fts'
+
+_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, content='places', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS places_fts_ai AFTER INSERT ON places BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS places_fts_ad AFTER DELETE ON places BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS places_fts_au AFTER UPDATE OF title, description ON places BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+# Poids BM25 des colonnes : un mot du titre compte plus que la description
+# BM25 column weights: a title hit weighs more than a description hit
+_TITLE_WEIGHT = 10.0
+_DESCRIPTION_WEIGHT = 1.0
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Disponibilité de l'index par moteur, vérifiée par install() : pas de requête
+# sqlite_master à chaque recherche
+# Index availability per engine, checked by install(): no sqlite_master query
+# on every search
+_available = weakref.WeakKeyDictionary()
+
+
+def is_available():
+    """Indique si l'index FTS5 peut être utilisé / Whether the FTS5 index can be used."""
+    engine = db.engine
+    available = _available.get(engine)
+    if available is None:
+        available = _available[engine] = engine.dialect.name == 'sqlite' and _fts5_table_exists()
+    return available
+
+
+def _fts5_table_exists():
+    return db.session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': FTS_TABLE},
+    ).first() is not None
+
+
+def install():
+    """
+    Vérifie une fois si l'index FTS5 est utilisable et mémorise la réponse.
+    Check once whether the FTS5 index can be used and remember the answer.
+
+    L'index est créé par la migration 0008_places_fts (flask db upgrade),
+    ou par create() pour une base issue de db.create_all.
+    The index is created by the 0008_places_fts migration (flask db
+    upgrade), or by create() for a database built by db.create_all.
+    """
+    engine = db.engine
+    _available.pop(engine, None)
+    installed = is_available()
+    if not installed:
+        logger.info("Full-text index unavailable on %s: run `flask db upgrade` (LIKE fallback)",
+                    engine.dialect.name)
+    return installed
+
+
+def create():
+    """
+    Crée la table FTS5 et ses triggers s'ils n'existent pas (idempotent), pour
+    les bases créées par db.create_all (DB_AUTO_CREATE) ; mêmes objets que la
+    migration 0008_places_fts. Une table créée sur des places existantes est
+    reconstruite aussitôt.
+    Create the FTS5 table and its triggers when missing (idempotent), for
+    databases built by db.create_all (DB_AUTO_CREATE); same objects as the
+    0008_places_fts migration. A table created over existing places is
+    rebuilt right away.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return False
+    created = not _fts5_table_exists()
+    try:
+        for statement in _DDL:
+            db.session.execute(text(statement))
+        db.session.commit()
+    except OperationalError as e:
+        db.session.rollback()
+        logger.warning("Full-text index unavailable (SQLite built without FTS5?): %s", e)
+        return False
+    if created:
+        rebuild()
+    return True
+
+
+def rebuild():
+    """
+    Reconstruit l'index depuis la table places.
+    Rebuild the index from the places table.
+
+    :return: Nombre de places indexées / Number of indexed places.
+    """
+    # Revérifiée à la prochaine recherche / Checked again on the next search
+    _available.pop(db.engine, None)
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    db.session.commit()
+    return db.session.execute(text("SELECT COUNT(*) FROM places")).scalar()
+
+
+def to_match_query(user_query):
+    """
+    Transforme la saisie utilisateur en requête FTS5 sûre : chaque mot devient
+    un préfixe entre guillemets, combinés en ET implicite.
+    Turn user input into a safe FTS5 query: each word becomes a quoted prefix,
+    combined with an implicit AND.
+
+    :return: La requête MATCH, ou None si la saisie ne contient aucun mot.
+    """
+    tokens = _TOKEN_RE.findall(user_query or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search(match_query, limit, offset=0):
+    """
+    Recherche les places correspondant à la requête MATCH, classées par BM25.
+    Search places matching the MATCH query, ranked by BM25.
+
+    :return: Liste de (place_id, snippet) dans l'ordre du classement.
+    """
+    rows = db.session.execute(text(f"""
+        SELECT rowid,
+               snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', 12)
+        FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH :match
+        ORDER BY bm25({FTS_TABLE}, :title_weight, :description_weight), rowid
+        LIMIT :limit OFFSET :offset
+    """), {
+        'match': match_query,
+        'title_weight': _TITLE_WEIGHT,
+        'description_weight': _DESCRIPTION_WEIGHT,
+        'limit': limit,
+        'offset': offset,
+    })
+    return [(row[0], row[1]) for row in rows]
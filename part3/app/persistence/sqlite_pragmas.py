@@ -0,0 +1,110 @@
+# app/persistence/sqlite_pragmas.py
+"""
+Profil de PRAGMA SQLite appliqué à chaque connexion
+SQLite PRAGMA profile applied to every connection
+
+Les PRAGMA comme synchronous, cache_size ou busy_timeout ne valent que pour
+la connexion qui les exécute : ils sont donc rejoués sur l'événement
+'connect' du moteur, pour chaque connexion ouverte par le pool.
+Pragmas such as synchronous, cache_size or busy_timeout only apply to the
+connection that runs them: they are replayed on the engine 'connect'
+event, for every connection the pool opens.
+
+Le profil vient de SQLITE_PRAGMAS (dict nom -> valeur) dans la config.
+The profile comes from SQLITE_PRAGMAS (dict name -> value) in the config.
+"""
+import logging
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Ordre d'application : busy_timeout d'abord, pour que le passage en WAL
+# attende un éventuel verrou au lieu d'échouer aussitôt
+# Application order: busy_timeout first, so switching to WAL waits for a
+# held lock instead of failing right away
+PRAGMA_ORDER = ('busy_timeout', 'journal_mode', 'synchronous', 'mmap_size',
+                'cache_size', 'temp_store', 'query_only')
+
+# Valeurs symboliques acceptées, et leur forme relue par PRAGMA <nom>
+# Accepted symbolic values, and how PRAGMA <name> reads them back
+_SYMBOLIC = {
+    'journal_mode': {'DELETE': 'delete', 'TRUNCATE': 'truncate', 'PERSIST': 'persist',
+                     'MEMORY': 'memory', 'WAL': 'wal', 'OFF': 'off'},
+    'synchronous': {'OFF': 0, 'NORMAL': 1, 'FULL': 2, 'EXTRA': 3},
+    'temp_store': {'DEFAULT': 0, 'FILE': 1, 'MEMORY': 2},
+}
+
+
+def _normalize(name, value):
+    """
+    Valide une entrée du profil et retourne (valeur SQL, valeur attendue à la relecture).
+    Validate a profile entry and return (SQL value, expected read-back value).
+
+    :raises ValueError: Nom ou valeur invalide (la config ne doit pas injecter de SQL).
+    """
+    if name not in PRAGMA_ORDER:
+        raise ValueError(f"Unsupported SQLite pragma '{name}'")
+    if name in _SYMBOLIC:
+        key = str(value).upper()
+        if key not in _SYMBOLIC[name]:
+            raise ValueError(f"Invalid value {value!r} for PRAGMA {name}")
+        return key, _SYMBOLIC[name][key]
+    if isinstance(value, bool):
+        value = int(value)
+    if not isinstance(value, int):
+        raise ValueError(f"PRAGMA {name} expects an integer, got {value!r}")
+    return str(value), value
+
+
+def _statements(pragmas):
+    ordered = sorted(pragmas.items(), key=lambda item: PRAGMA_ORDER.index(item[0])
+                     if item[0] in PRAGMA_ORDER else -1)
+    return [(name, *_normalize(name, value)) for name, value in ordered]
+
+
+def install(engine, pragmas):
+    """
+    Applique `pragmas` à chaque nouvelle connexion de `engine` (SQLite seulement).
+    Apply `pragmas` to every new connection of `engine` (SQLite only).
+
+    :return: True si le hook a été installé.
+    :raises ValueError: Si le profil contient un PRAGMA ou une valeur invalide.
+    """
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return False
+    statements = _statements(pragmas)
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, sql_value, _ in statements:
+                cursor.execute(f"PRAGMA {name} = {sql_value}")
+        finally:
+            cursor.close()
+
+    return True
+
+
+def self_check(engine, pragmas):
+    """
+    Relit les PRAGMA effectifs sur une connexion et les journalise ; avertit
+    quand SQLite a ignoré une valeur (ex. WAL sur une base en mémoire).
+    Read the effective pragmas back on a connection and log them; warn when
+    SQLite ignored a value (e.g. WAL on an in-memory database).
+
+    :return: dict nom -> valeur effective / name -> effective value.
+    """
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return {}
+    effective, mismatched = {}, []
+    with engine.connect() as connection:
+        for name, _, expected in _statements(pragmas):
+            value = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            effective[name] = value
+            if value != expected:
+                mismatched.append(f"{name}={value!r} (wanted {expected!r})")
+    logger.info("SQLite pragmas: %s", ", ".join(f"{name}={value}" for name, value in effective.items()))
+    if mismatched:
+        logger.warning("SQLite ignored some pragmas: %s", "; ".join(mismatched))
+    return effective
@@ -0,0 +1,138 @@
+# app/persistence/unit_of_work.py
+"""
+Unité de travail : un seul commit pour plusieurs écritures
+Unit of work: a single commit for several writes
+
+Hors unité de travail, commit() valide aussitôt (comportement historique des
+repositories). Dans `with unit_of_work():`, commit() ne fait qu'un flush : les
+ids et contraintes sont disponibles, mais la transaction n'est validée (un
+seul fsync) qu'à la sortie du bloc le plus externe, et annulée sur erreur.
+Outside a unit of work, commit() commits right away (the repositories'
+historical behaviour). Inside `with unit_of_work():`, commit() only flushes:
+ids and constraints are available, but the transaction is committed (one
+fsync) only when the outermost block exits, and rolled back on error.
+
+L'état vit dans `db.session.info`, donc par session (requête / thread).
+State lives in `db.session.info`, hence per session (request / thread).
+"""
+import logging
+from contextlib import contextmanager
+from functools import wraps
+from app.extensions import db
+from app.persistence import routing
+
+logger = logging.getLogger(__name__)
+
+_DEPTH = 'uow_depth'
+_ABORTED = 'uow_aborted'
+_CALLBACKS = 'uow_after_commit'
+
+
+class UnitOfWorkAborted(RuntimeError):
+    """
+    Une erreur a annulé la transaction au milieu de l'unité de travail.
+    An error rolled the transaction back in the middle of the unit of work.
+    """
+
+
+def in_unit_of_work():
+    """True si une unité de travail est ouverte sur la session courante."""
+    return db.session.info.get(_DEPTH, 0) > 0
+
+
+def commit():
+    """
+    Valide la transaction, ou flush seulement dans une unité de travail.
+    Commit the transaction, or only flush inside a unit of work.
+    """
+    if in_unit_of_work():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def rollback():
+    """
+    Annule la transaction. Dans une unité de travail, les écritures déjà
+    faites sont perdues aussi : l'unité est marquée pour échouer à la sortie
+    au lieu de valider silencieusement ce qui reste.
+    Roll the transaction back. Inside a unit of work the earlier writes are
+    lost too: the unit is marked to fail on exit instead of silently
+    committing whatever is left.
+    """
+    db.session.rollback()
+    if in_unit_of_work():
+        db.session.info[_ABORTED] = True
+
+
+def after_commit(callback):
+    """
+    Exécute `callback` après le commit de l'unité de travail (tout de suite
+    hors unité). Abandonné si l'unité est annulée.
+    Run `callback` after the unit of work commits (right away outside one).
+    Dropped if the unit is rolled back.
+    """
+    if in_unit_of_work():
+        db.session.info.setdefault(_CALLBACKS, []).append(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Regroupe les écritures du bloc dans une seule transaction.
+    Group the writes of the block into a single transaction.
+
+    Les blocs imbriqués rejoignent le bloc externe, seul ce dernier valide.
+    Nested blocks join the outer one; only the outermost commits.
+
+    :raises UnitOfWorkAborted: Si rollback() a été appelé dans le bloc alors
+        que l'erreur d'origine a été interceptée.
+    """
+    info = db.session.info
+    depth = info.get(_DEPTH, 0)
+    info[_DEPTH] = depth + 1
+    # Les lectures d'une écriture doivent voir la primaire, pas une réplique en retard
+    # Reads made for a write must see the primary, not a lagging replica
+    routing.stick_to_primary(db.session)
+    try:
+        yield db.session
+    except BaseException:
+        info[_DEPTH] = depth
+        if depth == 0:
+            _discard()
+        raise
+    info[_DEPTH] = depth
+    if depth > 0:
+        return
+    if info.get(_ABORTED, False):
+        _discard()
+        raise UnitOfWorkAborted("Transaction rolled back by an earlier error")
+    callbacks = info.pop(_CALLBACKS, [])
+    try:
+        db.session.commit()
+    except Exception:
+        _discard()
+        raise
+    for callback in callbacks:
+        callback()
+
+
+def transactional(func):
+    """
+    Exécute la fonction dans une unité de travail (décorateur).
+    Run the function inside a unit of work (decorator).
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with unit_of_work():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _discard():
+    """Annule la transaction et oublie l'état de l'unité / Roll back and reset the unit state."""
+    db.session.rollback()
+    db.session.info.pop(_ABORTED, None)
+    db.session.info.pop(_CALLBACKS, None)
@@ -1,9 +1,12 @@
 from app.models.user import User
 from app.extensions import db
+from app.persistence.repository import RowQueryMixin
+from app.persistence.unit_of_work import commit, rollback
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
-class UserRepository:
-    """Repository spécifique pour le modèle User."""
+class UserRepository(RowQueryMixin):
+    """Repository spécifique pour le modèle User (get_rows / stream_rows via RowQueryMixin)."""
 
     def __init__(self):
         self.model = User
@@ -20,6 +23,13 @@ class UserRepository:
         """Récupère tous les utilisateurs."""
         return db.session.query(self.model).all()
 
+    def existing_ids(self, user_ids):
+        """Retourne, en une requête IN, l'ensemble des ids d'utilisateurs qui existent."""
+        if not user_ids:
+            return set()
+        return set(db.session.execute(
+            select(self.model.id).where(self.model.id.in_(set(user_ids)))).scalars())
+
     def create(self, first_name, last_name, email, password, is_admin=False):
         """Crée un nouvel utilisateur."""
         try:
@@ -33,10 +43,10 @@ class UserRepository:
             # Le mot de passe est déjà hashé automatiquement dans User.__init__()
             # Pas besoin d'appeler set_password() ici
             db.session.add(user)
-            db.session.commit()
+            commit()
             return user
         except IntegrityError:
-            db.session.rollback()
+            rollback()
             raise ValueError("Email déjà utilisé.")
 
     def update(self, user_id, data):
@@ -53,7 +63,7 @@ class UserRepository:
             if hasattr(user, key) and key != "id":
                 setattr(user, key, value)
         
-        db.session.commit()
+        commit()
         return user
 
     def delete(self, user_id):
@@ -63,4 +73,4 @@ class UserRepository:
             raise ValueError("Utilisateur introuvable.")
         
         db.session.delete(user)
-        db.session.commit()
\ No newline at end of file
+        commit()
\ No newline at end of file
@@ -0,0 +1,210 @@
+# app/ratelimit.py
+"""
+Limiteur de débit à fenêtre glissante
+Sliding-window rate limiter
+
+Approximation classique à deux compteurs : le compteur de la fenêtre
+précédente est pondéré par la part de celle-ci encore couverte par la
+fenêtre glissante. Mémoire O(1) par clé (deux entiers et un index de
+fenêtre), sans liste d'horodatages.
+Classic two-counter approximation: the previous window's counter is
+weighted by how much of it the sliding window still covers. O(1) memory
+per key (two integers and a window index), no list of timestamps.
+
+Un appel refusé n'est pas compté : Retry-After reste exact pour le client
+qui patiente.
+A refused call is not counted: Retry-After stays accurate for a client
+that waits.
+
+Backends (RATELIMIT_STORAGE):
+    - 'memory' : dict LRU en processus, les clés les plus anciennes sont évincées
+                 in-process LRU dict, the oldest keys are evicted
+    - 'redis'  : tout client parlant le protocole Redis / any Redis-protocol client
+    - 'null'   : limiteur désactivé / limiter disabled
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryRateLimitBackend:
+    """Compteurs en processus, bornés à max_keys clés / In-process counters, capped at max_keys keys."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, window_index, window_seconds, allow):
+        """
+        Compte un appel dans la fenêtre `window_index` si allow(current, previous).
+        Count one call in window `window_index` if allow(current, previous).
+
+        :return: (compteur courant, compteur précédent, permis) - compteurs avant l'appel
+        """
+        with self._lock:
+            index, current, previous = self._counters.pop(key, (window_index, 0, 0))
+            if index != window_index:
+                previous = current if index == window_index - 1 else 0
+                current = 0
+            allowed = allow(current, previous)
+            self._counters[key] = (window_index, current + allowed, previous)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+            return current, previous, allowed
+
+    def reset(self, key, window_index):
+        with self._lock:
+            self._counters.pop(key, None)
+
+
+class RedisRateLimitBackend:
+    """
+    Backend sur un client Redis (redis-py ou tout objet compatible :
+    incr / expire / get / delete). Une clé par fenêtre, expirée après deux fenêtres.
+    Backend on a Redis client (redis-py or any compatible object:
+    incr / expire / get / delete). One key per window, expired after two windows.
+
+    Lecture puis incrément ne sont pas atomiques : des appels simultanés
+    peuvent dépasser la limite de quelques unités.
+    Read then increment is not atomic: concurrent calls may overshoot the
+    limit by a few.
+    """
+
+    def __init__(self, client, prefix='hbnb:ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+
+    def hit(self, key, window_index, window_seconds, allow):
+        current = int(self.client.get(self._key(key, window_index)) or 0)
+        previous = int(self.client.get(self._key(key, window_index - 1)) or 0)
+        allowed = allow(current, previous)
+        if allowed and self.client.incr(self._key(key, window_index)) == 1:
+            self.client.expire(self._key(key, window_index), 2 * window_seconds)
+        return current, previous, allowed
+
+    def reset(self, key, window_index):
+        # Les fenêtres plus anciennes ont expiré ; seules deux peuvent compter
+        # Older windows have expired; only two can count
+        self.client.delete(self._key(key, window_index), self._key(key, window_index - 1))
+
+    def _key(self, key, window_index):
+        return f'{self.prefix}{key}:{window_index}'
+
+
+class RateLimiter:
+    """
+    Extension Flask : décorateur de limitation et 429 avec Retry-After
+    Flask extension: limiting decorator and 429 with Retry-After
+    """
+
+    # Horloge remplaçable dans les tests / Clock, replaceable in tests
+    clock = staticmethod(time.time)
+
+    def init_app(self, app, backend=None):
+        """
+        Choisit le backend selon RATELIMIT_STORAGE ('memory', 'redis', 'null').
+        Un backend déjà construit peut être passé directement (tests).
+        """
+        if backend is None:
+            backend = self._backend_from_config(app.config)
+        app.extensions['rate_limiter'] = backend
+
+    @staticmethod
+    def _backend_from_config(config):
+        storage = config.get('RATELIMIT_STORAGE', 'memory')
+        if storage == 'null':
+            return None
+        if storage == 'memory':
+            return MemoryRateLimitBackend(config.get('RATELIMIT_MAX_KEYS', 100000))
+        if storage == 'redis':
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("RATELIMIT_STORAGE='redis' requires the 'redis' package")
+            return RedisRateLimitBackend(redis.Redis.from_url(config['RATELIMIT_REDIS_URL']))
+        raise ValueError(f"Unknown RATELIMIT_STORAGE '{storage}'")
+
+    @property
+    def backend(self):
+        return current_app.extensions.get('rate_limiter')
+
+    def hit(self, scope, ident):
+        """
+        Compte un appel pour (scope, ident) et le confronte à la limite
+        RATELIMIT_<SCOPE> = (appels, secondes).
+        Count one call for (scope, ident) against the RATELIMIT_<SCOPE> =
+        (calls, seconds) limit.
+
+        :return: 0 si l'appel est permis, sinon le nombre de secondes à attendre.
+        """
+        backend = self.backend
+        if backend is None or not ident:
+            return 0
+        limit, window = current_app.config[f'RATELIMIT_{scope.upper()}']
+        now = self.clock()
+        window_index = int(now // window)
+        elapsed = now - window_index * window
+        weight = 1 - elapsed / window
+
+        def allow(current, previous):
+            return previous * weight + current + 1 <= limit
+
+        current, previous, allowed = backend.hit(f'{scope}:{ident}', window_index, window, allow)
+        if allowed:
+            return 0
+        # Attente jusqu'à ce que l'appel repasse sous la limite
+        # Wait until the call fits under the limit again
+        if current + 1 > limit or previous == 0:
+            return max(1, math.ceil(window - elapsed))
+        wait = window * (1 - (limit - current - 1) / previous) - elapsed
+        # Au début de la fenêtre suivante, seul `current` (< limit) compte encore
+        # When the next window starts only `current` (< limit) still counts
+        return max(1, math.ceil(min(wait, window - elapsed)))
+
+    def reset(self, scope, ident):
+        """Oublie les appels de (scope, ident), ex. après un login réussi."""
+        backend = self.backend
+        if backend is not None and ident:
+            window = current_app.config[f'RATELIMIT_{scope.upper()}'][1]
+            backend.reset(f'{scope}:{ident}', int(self.clock() // window))
+
+    def limit(self, scope, key):
+        """
+        Limite une méthode de Resource : `key()` donne l'identifiant à compter
+        (IP, email, ...). Au-delà de RATELIMIT_<SCOPE>, répond 429 sans
+        appeler la méthode.
+        Limit a Resource method: `key()` returns the identifier to count
+        (IP, email, ...). Past RATELIMIT_<SCOPE>, answers 429 without
+        calling the method.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                retry_after = self.hit(scope, key())
+                if retry_after:
+                    logger.warning("Rate limit '%s' exceeded", scope)
+                    return {'error': 'Too many requests, retry later'}, 429, \
+                        {'Retry-After': str(retry_after)}
+                return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+def client_ip():
+    """Adresse du client (derrière un proxy, configurer ProxyFix) / Client address."""
+    return request.remote_addr
+
+
+def json_field(name):
+    """Clé de limitation tirée d'un champ du corps JSON, normalisé en minuscules."""
+    def key():
+        value = (request.get_json(silent=True) or {}).get(name)
+        return value.strip().lower() if isinstance(value, str) else None
+    return key
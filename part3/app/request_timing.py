@@ -0,0 +1,181 @@
+# app/request_timing.py
+"""
+Instrumentation par requête : SQL, sérialisation, temps total
+Per-request instrumentation: SQL, serialization, total time
+
+Les événements before/after_cursor_execute de chaque moteur comptent les
+requêtes SQL de la requête HTTP en cours et leur durée ; la représentation
+JSON de l'API mesure la sérialisation. En fin de requête :
+The before/after_cursor_execute events of every engine count the SQL
+queries of the current HTTP request and their duration; the API's JSON
+representation measures serialization. At the end of the request:
+
+    - SERVER_TIMING : en-tête Server-Timing (db, ser, app, total)
+                      Server-Timing header (db, ser, app, total)
+    - SLOW_REQUEST_MS : au-delà, la requête est écrite dans le logger
+                        'app.slow_requests' avec ses requêtes SQL (regroupées
+                        par texte) et, si SLOW_REQUEST_EXPLAIN, le plan des SELECT.
+                        past it, the request is written to the
+                        'app.slow_requests' logger with its SQL statements
+                        (grouped by text) and, with SLOW_REQUEST_EXPLAIN, the
+                        plan of the SELECTs.
+
+Sans aucune des deux options, rien n'est installé. Les requêtes SQL d'une
+réponse en flux (NDJSON) s'exécutent après la fin de la requête et ne sont
+pas comptées.
+With neither option nothing is installed. The SQL queries of a streamed
+(NDJSON) response run after the request ends and are not counted.
+"""
+import logging
+import time
+from functools import wraps
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from app.extensions import db
+
+slow_logger = logging.getLogger('app.slow_requests')
+
+# Requêtes SQL gardées pour le log lent / SQL statements kept for the slow log
+MAX_STATEMENTS = 200
+
+
+class RequestTiming:
+    """Mesures d'une requête HTTP / Measurements of one HTTP request."""
+
+    __slots__ = ('started', 'sql_count', 'sql_seconds', 'serialize_seconds', 'statements')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.serialize_seconds = 0.0
+        # (moteur, texte SQL, paramètres, secondes) / (engine, SQL text, parameters, seconds)
+        self.statements = []
+
+    def server_timing(self, total_seconds):
+        """Valeur de l'en-tête Server-Timing (durées en ms) / Server-Timing header value."""
+        app_seconds = max(0.0, total_seconds - self.sql_seconds - self.serialize_seconds)
+        return (f'db;dur={self.sql_seconds * 1000:.2f};desc="{self.sql_count} queries", '
+                f'ser;dur={self.serialize_seconds * 1000:.2f}, '
+                f'app;dur={app_seconds * 1000:.2f}, '
+                f'total;dur={total_seconds * 1000:.2f}')
+
+
+def current_timing():
+    """Mesures de la requête en cours, None hors requête instrumentée."""
+    return g.get('request_timing') if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_timing() is not None:
+        context.request_timing_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = current_timing()
+    started = getattr(context, 'request_timing_started', None)
+    if timing is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    timing.sql_count += 1
+    timing.sql_seconds += elapsed
+    if len(timing.statements) < MAX_STATEMENTS:
+        timing.statements.append((conn.engine, statement, None if executemany else parameters, elapsed))
+
+
+def timed_representation(representation):
+    """
+    Enveloppe une représentation Flask-RESTX pour mesurer la sérialisation.
+    Wrap a Flask-RESTX representation to measure serialization.
+    """
+    @wraps(representation)
+    def wrapper(data, code, headers=None):
+        started = time.perf_counter()
+        try:
+            return representation(data, code, headers)
+        finally:
+            timing = current_timing()
+            if timing is not None:
+                timing.serialize_seconds += time.perf_counter() - started
+    return wrapper
+
+
+def init_app(app):
+    """
+    Installe l'instrumentation selon SERVER_TIMING et SLOW_REQUEST_MS
+    (à appeler dans un contexte d'application, après db.init_app).
+    Install the instrumentation according to SERVER_TIMING and
+    SLOW_REQUEST_MS (call inside an app context, after db.init_app).
+
+    :return: True si l'instrumentation est active / True when active.
+    """
+    header = app.config.get('SERVER_TIMING', False)
+    slow_ms = app.config.get('SLOW_REQUEST_MS') or 0
+    explain = app.config.get('SLOW_REQUEST_EXPLAIN', True)
+    if not header and not slow_ms:
+        return False
+
+    for engine in db.engines.values():
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_timing():
+        g.request_timing = RequestTiming()
+
+    @app.after_request
+    def finish_request_timing(response):
+        timing = g.pop('request_timing', None)
+        if timing is None:
+            return response
+        total = time.perf_counter() - timing.started
+        if header:
+            response.headers['Server-Timing'] = timing.server_timing(total)
+        if slow_ms and total * 1000 >= slow_ms:
+            log_slow_request(timing, total, response.status_code, explain)
+        return response
+
+    return True
+
+
+def log_slow_request(timing, total_seconds, status_code, explain=True):
+    """
+    Écrit une requête lente : en-tête de synthèse puis une ligne par texte SQL
+    distinct (occurrences, temps cumulé), suivie de son plan.
+    Write a slow request: a summary line, then one line per distinct SQL
+    text (occurrences, total time), followed by its plan.
+    """
+    grouped = {}
+    for engine, statement, parameters, elapsed in timing.statements:
+        entry = grouped.setdefault(statement, [engine, parameters, 0, 0.0])
+        entry[2] += 1
+        entry[3] += elapsed
+    lines = [f"Slow request {request.method} {request.full_path.rstrip('?')} -> {status_code}: "
+             f"{total_seconds * 1000:.1f} ms total, {timing.sql_count} queries in "
+             f"{timing.sql_seconds * 1000:.1f} ms, serialization {timing.serialize_seconds * 1000:.1f} ms"]
+    for statement, (engine, parameters, count, elapsed) in sorted(
+            grouped.items(), key=lambda item: item[1][3], reverse=True):
+        lines.append(f"  [{count}x, {elapsed * 1000:.2f} ms] {' '.join(statement.split())}")
+        if explain:
+            lines.extend(f"      {step}" for step in explain_plan(engine, statement, parameters))
+    slow_logger.warning("\n".join(lines))
+
+
+def explain_plan(engine, statement, parameters):
+    """
+    Plan d'exécution d'un SELECT (EXPLAIN QUERY PLAN sous SQLite, EXPLAIN
+    ailleurs) ; liste vide pour les autres instructions ou en cas d'échec.
+    Execution plan of a SELECT (EXPLAIN QUERY PLAN on SQLite, EXPLAIN
+    elsewhere); empty list for other statements or on failure.
+    """
+    if not statement.lstrip().upper().startswith(('SELECT', 'WITH')) or parameters is None:
+        return []
+    prefix = 'EXPLAIN QUERY PLAN ' if engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    try:
+        with engine.connect() as connection:
+            rows = connection.exec_driver_sql(prefix + statement, parameters).all()
+    except Exception as e:  # le log ne doit jamais faire échouer la requête
+        return [f"(no plan: {e.__class__.__name__})"]
+    if engine.dialect.name == 'sqlite':
+        return [row[-1] for row in rows]
+    return [' '.join(str(value) for value in row) for row in rows]
@@ -0,0 +1,45 @@
+# app/serializers/__init__.py
+"""
+Sérialiseurs précompilés des réponses de l'API
+Precompiled serializers for API responses
+
+Chaque module (place, review, user, amenity) décrit une fois les champs de
+ses payloads ; compile_serializer() en génère à l'import une fonction
+spécialisée, un simple littéral de dict sans boucle sur les champs ni
+getattr dynamique. Les fonctions lisent les attributs par nom : elles
+acceptent aussi bien des instances ORM que des tuples Row (select de
+colonnes), bien moins coûteux pour les listes en lecture seule.
+Each module (place, review, user, amenity) declares its payload fields
+once; compile_serializer() generates a specialized function at import
+time, a plain dict literal with no per-field loop nor dynamic getattr.
+The functions read attributes by name: they accept ORM instances as well
+as Row tuples (column selects), which are much cheaper for read-only lists.
+"""
+
+
+def compile_serializer(name, fields, **helpers):
+    """
+    Génère une fonction `name(o) -> dict` et sa variante `name.many(rows) -> list`.
+    Generate a `name(o) -> dict` function and its `name.many(rows) -> list` variant.
+
+    :param name: Nom de la fonction générée / Name of the generated function.
+    :param fields: Noms d'attributs, ou paires (clé, expression Python sur `o`).
+                   Attribute names, or (key, Python expression on `o`) pairs.
+    :param helpers: Fonctions utilisables dans les expressions.
+                    Functions usable inside the expressions.
+    """
+    items = []
+    for field in fields:
+        key, expression = (field, f'o.{field}') if isinstance(field, str) else field
+        items.append(f'{key!r}: {expression}')
+    literal = '{' + ', '.join(items) + '}'
+    # .many inline le littéral dans la compréhension : pas d'appel par ligne
+    # .many inlines the literal in the comprehension: no call per row
+    source = (f'def {name}(o):\n    return {literal}\n'
+              f'def many(rows):\n    return [{literal} for o in rows]\n')
+    namespace = dict(helpers)
+    exec(compile(source, f'<serializer {name}>', 'exec'), namespace)
+    serializer = namespace[name]
+    serializer.many = namespace['many']
+    serializer.fields = tuple(fields)
+    return serializer
@@ -0,0 +1,7 @@
+# app/serializers/amenity.py
+"""Payloads des amenities / Amenity payloads"""
+from app.serializers import compile_serializer
+
+AMENITY_COLUMNS = ('id', 'name')
+
+serialize_amenity = compile_serializer('serialize_amenity', AMENITY_COLUMNS)
@@ -0,0 +1,77 @@
+# app/serializers/encoding.py
+"""
+Encodeur JSON de l'API : orjson s'il est installé, json de la stdlib sinon,
+et réponses NDJSON en flux pour les exports de collections.
+API JSON encoder: orjson when installed, stdlib json otherwise, and
+streaming NDJSON responses for collection exports.
+"""
+import json
+from itertools import islice
+from flask import current_app, make_response, request, stream_with_context
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle / optional dependency
+    orjson = None
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def dumps(data, sort_keys=False):
+    """
+    Encode `data` en JSON compact (bytes UTF-8).
+    Encode `data` as compact JSON (UTF-8 bytes).
+
+    Les types inconnus (ex. datetime avec json) sont convertis par str().
+    Unknown types (e.g. datetime with json) are converted with str().
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(data, default=str, sort_keys=sort_keys, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def output_json(data, code, headers=None):
+    """
+    Représentation 'application/json' de Flask-RESTX (remplace la version json stdlib).
+    Flask-RESTX 'application/json' representation (replaces the stdlib json one).
+    """
+    response = make_response(dumps(data), code)
+    response.headers.extend(headers or {})
+    response.mimetype = 'application/json'
+    return response
+
+
+def wants_ndjson():
+    """
+    Vrai si le client demande un export NDJSON (Accept ou ?stream=1).
+    True when the client asks for an NDJSON export (Accept or ?stream=1).
+    """
+    if request.args.get('stream') in ('1', 'true'):
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def ndjson_response(rows, serializer, chunk_rows=500):
+    """
+    Réponse en flux : un objet JSON par ligne, envoyé par paquets de chunk_rows.
+    Streaming response: one JSON object per line, sent in chunks of chunk_rows.
+
+    `rows` est consommé paresseusement pendant l'envoi : la mémoire reste
+    bornée par le lot SQL et le paquet, et le premier octet part dès le
+    premier lot.
+    `rows` is consumed lazily while sending: memory stays bounded by the SQL
+    batch and the chunk, and the first byte leaves with the first batch.
+
+    :param serializer: Sérialiseur précompilé (avec .many) / Precompiled serializer (with .many).
+    """
+    def generate():
+        iterator = iter(rows)
+        while True:
+            chunk = serializer.many(islice(iterator, chunk_rows))
+            if not chunk:
+                break
+            yield b''.join(dumps(item) + b'\n' for item in chunk)
+
+    return current_app.response_class(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
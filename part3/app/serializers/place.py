@@ -0,0 +1,18 @@
+# app/serializers/place.py
+"""
+Payloads des places / Place payloads
+
+Le même dictionnaire sert à la création, au détail, à la mise à jour et
+aux listes ; il suppose le profil de chargement 'summary' pour les listes.
+The same dictionary is used by create, detail, update and list payloads;
+lists rely on the 'summary' load profile.
+"""
+from app.serializers import compile_serializer
+
+PLACE_FIELDS = (
+    'id', 'title', 'description', 'price', 'latitude', 'longitude', 'owner_id',
+    ('amenities', '[amenity.id for amenity in o.amenities]'),
+    'review_count', 'average_rating', 'rating_histogram',
+)
+
+serialize_place = compile_serializer('serialize_place', PLACE_FIELDS)
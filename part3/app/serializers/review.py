@@ -0,0 +1,28 @@
+# app/serializers/review.py
+"""
+Payloads des avis / Review payloads
+
+REVIEW_COLUMNS sert à la fois de liste de colonnes pour les lectures en
+tuples Row et de champs du payload.
+REVIEW_COLUMNS is both the column list for Row tuple reads and the
+payload fields.
+"""
+from app.serializers import compile_serializer
+
+REVIEW_COLUMNS = ('id', 'text', 'rating', 'user_id', 'place_id')
+
+
+def author_name(user):
+    """Nom affiché de l'auteur, l'email à défaut / Author display name, email as fallback."""
+    return f"{user.first_name} {user.last_name}".strip() or user.email
+
+
+serialize_review = compile_serializer('serialize_review', REVIEW_COLUMNS)
+
+# Avis d'une place : profil 'with_author' (auteur joint)
+# Reviews of a place: 'with_author' profile (author joined)
+serialize_place_review = compile_serializer(
+    'serialize_place_review',
+    ('id', 'text', 'rating', 'user_id', ('user_name', 'author_name(o.user)')),
+    author_name=author_name,
+)
@@ -0,0 +1,12 @@
+# app/serializers/user.py
+"""
+Payloads des utilisateurs / User payloads
+
+Le hash du mot de passe ne fait jamais partie des colonnes lues.
+The password hash is never part of the selected columns.
+"""
+from app.serializers import compile_serializer
+
+USER_COLUMNS = ('id', 'first_name', 'last_name', 'email', 'is_admin')
+
+serialize_user = compile_serializer('serialize_user', USER_COLUMNS)
@@ -0,0 +1,57 @@
+# app/services/bulk.py
+"""
+Outils des imports en lot de la facade
+Helpers for the facade's bulk imports
+
+Chaque ligne est validée indépendamment ; une ligne invalide est rapportée
+avec son index sans interrompre le reste du lot.
+Each row is validated on its own; an invalid row is reported with its
+index without stopping the rest of the batch.
+"""
+
+
+def chunked(rows, size):
+    """Découpe `rows` en (offset, tranche) de `size` lignes / Split rows into (offset, slice)."""
+    for offset in range(0, len(rows), size):
+        yield offset, rows[offset:offset + size]
+
+
+class BulkReport:
+    """
+    Résultat ligne par ligne d'un import en lot
+    Row-by-row outcome of a bulk import
+
+    `ids` est aligné sur l'entrée : l'id créé / mis à jour, ou None en cas d'erreur.
+    `ids` is aligned with the input: the created / updated id, or None on error.
+    """
+
+    OUTCOMES = ('created', 'updated', 'unchanged')
+
+    def __init__(self, size):
+        self.ids = [None] * size
+        self.errors = []
+        self.counts = dict.fromkeys(self.OUTCOMES, 0)
+
+    def record(self, index, obj_id, outcome='created'):
+        self.ids[index] = obj_id
+        self.counts[outcome] += 1
+
+    def fail(self, index, message):
+        self.errors.append({'index': index, 'error': message})
+
+    def object_rows(self, offset, chunk):
+        """
+        (index, ligne) des lignes qui sont des objets JSON ; les autres sont en erreur.
+        (index, row) of the rows that are JSON objects; the others are failed.
+        """
+        items = []
+        for position, row in enumerate(chunk, start=offset):
+            if isinstance(row, dict):
+                items.append((position, row))
+            else:
+                self.fail(position, "Row must be a JSON object")
+        return items
+
+    def to_dict(self):
+        return dict(self.counts, failed=len(self.errors), ids=self.ids,
+                    errors=sorted(self.errors, key=lambda error: error['index']))
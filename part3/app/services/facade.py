@@ -1,16 +1,29 @@
 # app/service/facade.py
+import heapq
 import logging
-from app.extensions import db
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db, cache
 from app.persistence.user_repository import UserRepository
+from app.persistence.place_repository import PlaceRepository
+from app.persistence.review_repository import ReviewRepository
 from app.persistence.repository import SQLAlchemyRepository
 from app.models.user import User
 from app.models.amenity import Amenity
-from app.models.place import Place
+from app.models.place import Place, place_amenity_association
 from app.models.review import Review
+from app.services.bulk import BulkReport, chunked
+from app.services.geo import MAX_DISTANCE_KM, haversine_km, radius_bounding_box
+from app.persistence import search_index
+from app.persistence.routing import primary_read, replica_read
+from app.persistence.unit_of_work import after_commit, commit, rollback, transactional, unit_of_work
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Rayon de départ du tri par distance, doublé jusqu'à remplir la page
+# Starting radius of the distance sort, doubled until the page is full
+DISTANCE_RING_START_KM = 25
+
 
 class HBnBFacade:
     _instance = None
@@ -25,11 +38,27 @@ class HBnBFacade:
         if not self._initialized:
             # Repos
             self.user_repo = UserRepository()
-            self.place_repo = SQLAlchemyRepository(Place)
+            self.place_repo = PlaceRepository()
             self.amenity_repo = SQLAlchemyRepository(Amenity)
-            self.review_repo = SQLAlchemyRepository(Review)
+            self.review_repo = ReviewRepository()
             self._initialized = True
 
+    @staticmethod
+    def unit_of_work():
+        """
+        Regroupe plusieurs opérations de la facade dans une seule transaction :
+        les repositories ne font que flush, un seul commit à la sortie du bloc,
+        rollback sur erreur. Les invalidations du cache attendent le commit.
+        Group several facade operations into a single transaction: the
+        repositories only flush, one commit when the block exits, rollback on
+        error. Cache invalidations wait for the commit.
+
+            with facade.unit_of_work():
+                place = facade.create_place(data)
+                facade.create_review({...})
+        """
+        return unit_of_work()
+
     # ----------------------------------------------------------------------
     # USERS
     # ----------------------------------------------------------------------
@@ -40,7 +69,8 @@ class HBnBFacade:
         - Le flag is_admin doit être validé au niveau de l'endpoint (api/v1/users.py).
         - Le modèle User hash déjà le password en __init__ si on passe un mot de passe en clair.
         """
-        logger.debug(f"Creating user with data: {user_data}")
+        # Jamais le mot de passe dans les logs : seulement les champs reçus
+        logger.debug("Creating user with fields: %s", sorted(user_data or {}))
 
         # Champs autorisés à la création
         safe = {
@@ -54,34 +84,71 @@ class HBnBFacade:
 
         try:
             user = self.user_repo.create(**safe)
-            logger.debug(f"User created with ID: {user.id}, is_admin: {user.is_admin}")
+            logger.debug("User created with ID: %s, is_admin: %s", user.id, user.is_admin)
             return user
         except ValueError as e:
-            logger.error(f"Error creating user: {e}")
+            logger.error("Error creating user: %s", e)
             raise
 
+    @replica_read
     def get_user(self, user_id):
-        logger.debug(f"Looking for user with ID: {user_id}")
+        logger.debug("Looking for user with ID: %s", user_id)
         user = self.user_repo.get_by_id(user_id)
         if user:
-            logger.debug(f"Found user: {user.first_name} {user.last_name}")
+            logger.debug("Found user %s", user.id)
         else:
             logger.debug("User not found")
         return user
 
+    def authenticate(self, email, password):
+        """
+        Retourne l'utilisateur si le mot de passe est correct, sinon None.
+        Un hash calculé avec un autre coût que BCRYPT_LOG_ROUNDS est refait
+        au passage (on dispose du mot de passe en clair seulement ici).
+        """
+        user = self.user_repo.get_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        if user.password_needs_rehash():
+            logger.info("Rehashing password of user %s with the configured bcrypt cost", user.id)
+            user.set_password(password)
+            commit()
+        return user
+
+    @primary_read
+    def get_user_for_update(self, user_id):
+        """Utilisateur lu sur la primaire, avant une écriture (If-Match, unicité)."""
+        return self.user_repo.get_by_id(user_id)
+
+    @primary_read
+    def email_in_use(self, email):
+        """Vrai si un compte a déjà cet email, d'après la primaire (contrôle avant écriture)."""
+        return self.user_repo.get_by_email(email) is not None
+
+    @replica_read
     def get_user_by_email(self, email):
-        logger.debug(f"Looking for user with email: {email}")
+        logger.debug("Looking for user by email")
         user = self.user_repo.get_by_email(email)
         if user:
-            logger.debug(f"Found user: {user.first_name} {user.last_name}")
+            logger.debug("Found user %s", user.id)
         else:
             logger.debug("User not found")
         return user
 
-    def get_all_users(self):
-        """Retrieve all users from the repository"""
+    @replica_read
+    def get_all_users(self, columns=None):
+        """
+        Retrieve all users from the repository
+        columns : tuples Row de ces colonnes au lieu d'instances / Row tuples of these columns instead of instances
+        """
+        if columns is not None:
+            return self.user_repo.get_rows(columns)
         return self.user_repo.get_all()
 
+    def stream_users(self, columns, batch_size):
+        """Stream all users as Row tuples of `columns`, in batches (NDJSON export)"""
+        return self.user_repo.stream_rows(columns, batch_size)
+
     def update_user(self, user_id, user_data: dict):
         """
         Met à jour un user (self/admin). On interdit toute modif de is_admin ici.
@@ -103,23 +170,37 @@ class HBnBFacade:
                 return self.user_repo.get_by_id(user_id)
 
             user = self.user_repo.update(user_id, allowed)
+            # Le nom de l'auteur apparaît dans les listes d'avis en cache
+            self._invalidate('place_reviews')
             return user
         except ValueError as e:
-            logger.error(f"Error updating user: {e}")
+            logger.error("Error updating user: %s", e)
             raise
 
+    def admin_update_user(self, user_id, user_data: dict):
+        """
+        Mise à jour complète par un admin (email, password, is_admin inclus).
+        L'unicité de l'email est vérifiée par l'endpoint.
+        """
+        user = self.user_repo.update(user_id, dict(user_data or {}))
+        self._invalidate('place_reviews')
+        return user
+
+    @transactional
     def delete_user(self, user_id):
         """
         Supprime un utilisateur par son ID.
         Retourne True si la suppression a réussi, False sinon.
         """
-        logger.debug(f"Attempting to delete user with ID: {user_id}")
+        logger.debug("Attempting to delete user with ID: %s", user_id)
         try:
             self.user_repo.delete(user_id)
-            logger.debug(f"User {user_id} successfully deleted")
+            logger.debug("User %s successfully deleted", user_id)
+            # Suppression en cascade de ses places : tout le cache est invalidé
+            after_commit(cache.clear)
             return True
         except ValueError as e:
-            logger.error(f"Error deleting user: {e}")
+            logger.error("Error deleting user: %s", e)
             return False
 
     # (optionnel) Promotion admin — à appeler uniquement depuis une route admin
@@ -128,7 +209,7 @@ class HBnBFacade:
         if not user:
             return None
         user.is_admin = True
-        db.session.commit()
+        commit()
         return user
 
     # ----------------------------------------------------------------------
@@ -141,14 +222,24 @@ class HBnBFacade:
             raise ValueError("Amenity name must be 50 characters or less")
         amenity = Amenity(**amenity_data)
         self.amenity_repo.add(amenity)
+        self._invalidate('amenities')
         return amenity
 
+    @replica_read
     def get_amenity(self, amenity_id):
         """Get an amenity by ID"""
         return self.amenity_repo.get(amenity_id)
 
-    def get_all_amenities(self):
-        """Get all amenities"""
+    @primary_read
+    def get_amenity_for_update(self, amenity_id):
+        """Get an amenity from the primary, before a write (If-Match)"""
+        return self.amenity_repo.get(amenity_id)
+
+    @replica_read
+    def get_all_amenities(self, columns=None):
+        """Get all amenities (as Row tuples of `columns` when given)"""
+        if columns is not None:
+            return self.amenity_repo.get_rows(columns)
         return self.amenity_repo.get_all()
 
     def update_amenity(self, amenity_id, amenity_data):
@@ -158,14 +249,24 @@ class HBnBFacade:
         amenity = self.get_amenity(amenity_id)
         if amenity:
             self.amenity_repo.update(amenity_id, amenity_data)
+            self._invalidate('amenities', f'amenity:{amenity.id}')
             return amenity
         return None
 
+    @transactional
     def delete_amenity(self, amenity_id):
         """Delete an amenity"""
         amenity = self.get_amenity(amenity_id)
         if amenity:
+            # Les places qui portaient cette amenity changent aussi
+            tags = ['amenities', f'amenity:{amenity.id}', 'places']
+            tags += [f'place:{place.id}' for place in amenity.places]
+            # L'association ne touche pas la ligne places : updated_at forcé (ETag)
+            # The association does not touch the places row: force updated_at (ETag)
+            for place in amenity.places:
+                place.updated_at = datetime.utcnow()
             self.amenity_repo.delete(amenity_id)
+            self._invalidate(*tags)
             return True
         return False
 
@@ -173,8 +274,9 @@ class HBnBFacade:
     # PLACES
     # ----------------------------------------------------------------------
 
+    @transactional
     def create_place(self, place_data):
-        logger.debug(f"Attempting to create place with data: {place_data}")
+        logger.debug("Attempting to create place with data: %s", place_data)
 
         data = dict(place_data or {})
         owner_id = data.pop('owner_id', None)
@@ -195,22 +297,171 @@ class HBnBFacade:
                 if amenity:
                     place.add_amenity(amenity)
                 else:
-                    logger.warning(f"Amenity {amenity_id} not found")
+                    logger.warning("Amenity %s not found", amenity_id)
 
             self.place_repo.add(place)
-            logger.debug(f"Place added to repository with owner {owner.id}")
+            logger.debug("Place added to repository with owner %s", owner.id)
+            self._invalidate('places')
             return place
 
         except Exception as e:
-            logger.error(f"Error creating place: {str(e)}")
+            logger.error("Error creating place: %s", e)
             raise ValueError(str(e))
 
+    @replica_read
     def get_place(self, place_id):
         return self.place_repo.get(place_id)
 
-    def get_all_places(self):
-        return self.place_repo.get_all()
+    @primary_read
+    def get_place_for_update(self, place_id):
+        """
+        Place lue sur la primaire, avant une écriture : l'autorisation et
+        If-Match ne doivent pas dépendre du retard d'une réplique.
+        """
+        return self.place_repo.get(place_id)
+
+    @primary_read
+    def get_place_owner_id(self, place_id):
+        """
+        owner_id d'une place en une requête d'une colonne (None si absente).
+        Lu sur la primaire : une décision d'autorisation ne doit pas dépendre
+        du retard d'une réplique.
+        """
+        return self.place_repo.get_column(place_id, 'owner_id')
 
+    @replica_read
+    def get_all_places(self, profile=None):
+        """profile : profil de chargement nommé (voir persistence/load_profiles.py)."""
+        return self.place_repo.get_all(profile)
+
+    @replica_read
+    def get_places_page(self, limit, after=None, profile='summary', sort=None, **filters):
+        """
+        Retourne une page de places et le curseur de la page suivante.
+        Filtres acceptés : min_price, max_price, owner_id, amenity_ids.
+        sort : 'price', 'rating', 'created_at', préfixés par '-' pour décroître ;
+        le curseur est alors (valeur de la clé, id).
+        """
+        return self.place_repo.get_page(limit, after=after, profile=profile, sort=sort, **filters)
+
+    @replica_read
+    def get_places_by_distance(self, lat, lng, limit, after=None, radius_km=None,
+                               profile='summary', **filters):
+        """
+        Page de places triées par distance au point, filtres de la liste appliqués.
+        Retourne ([(place, distance_km)], next_cursor), le curseur étant
+        (distance_km, id) du dernier lieu, None sur la dernière page.
+
+        Recherche par anneaux : la boîte englobante d'un rayon qui double
+        (index ix_places_lat_lng) jusqu'à contenir plus de `limit` places
+        au-delà du curseur. Toute place hors du rayon est plus loin que
+        toutes celles trouvées : la page est exacte.
+        Ring search: the bounding box of a doubling radius (ix_places_lat_lng
+        index) until it holds more than `limit` places past the cursor. Any
+        place outside the radius is farther than all those found: the page
+        is exact.
+        """
+        self._check_center(lat, lng, radius_km)
+        max_radius = radius_km or MAX_DISTANCE_KM
+        last = (0.0, 0) if after is None else self._distance_cursor(after)
+        radius = min(max_radius, max(DISTANCE_RING_START_KM, 2 * last[0]))
+        while True:
+            lat_range, lng_ranges = radius_bounding_box(lat, lng, radius)
+            candidates = []
+            for place_id, place_lat, place_lng in self.place_repo.get_coordinates_in_box(
+                    lat_range, lng_ranges, **filters):
+                distance = haversine_km(lat, lng, place_lat, place_lng)
+                if distance <= radius and (distance, place_id) > last:
+                    candidates.append((distance, place_id))
+            if len(candidates) > limit or radius >= max_radius:
+                break
+            radius = min(max_radius, 2 * radius)
+
+        nearest = heapq.nsmallest(limit + 1, candidates)
+        next_cursor = list(nearest[limit - 1]) if len(nearest) > limit else None
+        nearest = nearest[:limit]
+        places = {place.id: place for place in self.place_repo.get_many([pid for _, pid in nearest], profile)}
+        return [(places[pid], distance) for distance, pid in nearest if pid in places], next_cursor
+
+    @staticmethod
+    def _check_center(lat, lng, radius_km=None):
+        if not (-90 <= lat <= 90):
+            raise ValueError("lat must be between -90 and 90")
+        if not (-180 <= lng <= 180):
+            raise ValueError("lng must be between -180 and 180")
+        if radius_km is not None and not (0 < radius_km <= MAX_DISTANCE_KM):
+            raise ValueError(f"radius_km must be between 0 and {MAX_DISTANCE_KM}")
+
+    @staticmethod
+    def _distance_cursor(after):
+        try:
+            distance, place_id = after
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        if (isinstance(distance, bool) or not isinstance(distance, (int, float)) or distance < 0
+                or isinstance(place_id, bool) or not isinstance(place_id, int)):
+            raise ValueError("Invalid cursor")
+        return float(distance), place_id
+
+    def stream_places(self, batch_size, after=None, profile='summary', **filters):
+        """
+        Parcourt toutes les places filtrées par lots (export NDJSON).
+        Mêmes filtres que get_places_page ; after permet de reprendre un export.
+        """
+        return self.place_repo.stream_filtered(batch_size, after=after, profile=profile, **filters)
+
+    @replica_read
+    def search_places_near(self, lat, lng, radius_km, limit, profile='summary'):
+        """
+        Places à moins de radius_km du point, triées par distance.
+        Retourne une liste de (place, distance_km).
+        """
+        self._check_center(lat, lng, radius_km)
+        lat_range, lng_ranges = radius_bounding_box(lat, lng, radius_km)
+        return self._nearest_places(lat, lng, lat_range, lng_ranges, limit, profile, radius_km)
+
+    @replica_read
+    def search_places_in_bbox(self, lat_range, lng_ranges, center, limit, profile='summary'):
+        """
+        Places contenues dans la boîte, triées par distance au centre.
+        Retourne une liste de (place, distance_km).
+        """
+        return self._nearest_places(center[0], center[1], lat_range, lng_ranges, limit, profile)
+
+    @replica_read
+    def search_places_text(self, query, limit, offset=0, profile='summary'):
+        """
+        Recherche plein texte des places (titre, description).
+        Retourne ([(place, snippet)], next_offset) - next_offset vaut None sur la dernière page.
+        """
+        if offset < 0:
+            raise ValueError("offset must be a non-negative integer")
+        hits = self.place_repo.search_text(query, limit + 1, offset, profile)
+        if len(hits) > limit:
+            return hits[:limit], str(offset + limit)
+        return hits, None
+
+    def rebuild_search_index(self):
+        """Reconstruit l'index plein texte des places ; retourne le nombre de places indexées."""
+        if not search_index.install():
+            raise ValueError("Full-text search requires SQLite with FTS5")
+        indexed = search_index.rebuild()
+        self._invalidate('places')
+        return indexed
+
+    def _nearest_places(self, lat, lng, lat_range, lng_ranges, limit, profile, max_distance_km=None):
+        # 1. candidats de la boîte englobante (index), 2. distance exacte (haversine),
+        # 3. chargement des seules places retenues
+        candidates = []
+        for place_id, place_lat, place_lng in self.place_repo.get_coordinates_in_box(lat_range, lng_ranges):
+            distance = haversine_km(lat, lng, place_lat, place_lng)
+            if max_distance_km is None or distance <= max_distance_km:
+                candidates.append((distance, place_id))
+        nearest = heapq.nsmallest(limit, candidates)
+        places = {place.id: place for place in self.place_repo.get_many([pid for _, pid in nearest], profile)}
+        return [(places[pid], distance) for distance, pid in nearest if pid in places]
+
+    @transactional
     def update_place(self, place_id, place_data):
         place = self.place_repo.get(place_id)
         if not place:
@@ -255,32 +506,38 @@ class HBnBFacade:
                     amenity = self.amenity_repo.get(amenity_id)
                     if amenity:
                         place.add_amenity(amenity)
+                # Idem : sans UPDATE de places, onupdate ne s'applique pas
+                # Same: without an UPDATE of places, onupdate does not fire
+                place.updated_at = datetime.utcnow()
 
-            logger.debug(f"Successfully updated place {place_id}")
-            db.session.commit()
+            logger.debug("Successfully updated place %s", place_id)
+            commit()
+            self._invalidate('places', f'place:{place.id}')
             return place
 
         except Exception as e:
-            logger.error(f"Error updating place: {str(e)}")
+            logger.error("Error updating place: %s", e)
             raise ValueError(str(e))
 
+    @transactional
     def delete_place(self, place_id):
         """Supprime un place par son ID."""
-        logger.debug(f"Attempting to delete place with ID: {place_id}")
+        logger.debug("Attempting to delete place with ID: %s", place_id)
         place = self.place_repo.get(place_id)
         if not place:
             raise ValueError("Place not found")
         self.place_repo.delete(place_id)
-        logger.debug(f"Place {place_id} successfully deleted")
+        logger.debug("Place %s successfully deleted", place_id)
+        self._invalidate('places', f'place:{place.id}', f'place_reviews:{place.id}')
         return True
 
     # ----------------------------------------------------------------------
     # REVIEWS
     # ----------------------------------------------------------------------
 
+    @transactional
     def create_review(self, review_data):
-        if not (1 <= review_data.get('rating', 0) <= 5):
-            raise ValueError("Rating must be between 1 and 5")
+        Review.validate_rating(review_data.get('rating'))
         user = self.get_user(review_data.get('user_id'))
         if not user:
             raise ValueError("User not found")
@@ -293,41 +550,322 @@ class HBnBFacade:
             place=place,
             user=user
         )
-        self.review_repo.add(review)
+        # Agrégats mis à jour dans la même transaction que l'avis
+        place.adjust_rating_stats(added=review.rating)
+        try:
+            self.review_repo.add(review)
+        except IntegrityError:
+            # Insertion concurrente : la contrainte unique (user_id, place_id) a tranché
+            # Concurrent insert: the (user_id, place_id) unique constraint decided
+            rollback()
+            if self.has_already_reviewed(user.id, place.id):
+                raise ValueError("You have already reviewed this place")
+            raise ValueError("Invalid review data")
+        self._invalidate_place_reviews(place.id)
         return review
 
+    @replica_read
     def get_review(self, review_id):
         return self.review_repo.get(review_id)
 
-    def get_all_reviews(self):
-        return self.review_repo.get_all()
+    @primary_read
+    def get_review_for_update(self, review_id):
+        """Avis lu sur la primaire, avant une écriture (auteur, If-Match)."""
+        return self.review_repo.get(review_id)
 
-    def get_reviews_by_place(self, place_id):
+    @replica_read
+    def get_all_reviews(self, profile=None, columns=None):
+        """
+        profile : profil de chargement nommé (voir persistence/load_profiles.py).
+        columns : tuples Row de ces colonnes au lieu d'instances (lecture seule).
+        """
+        if columns is not None:
+            return self.review_repo.get_rows(columns)
+        return self.review_repo.get_all(profile)
+
+    def stream_reviews(self, columns, batch_size):
+        """Parcourt tous les avis en tuples Row, par lots (export NDJSON)."""
+        return self.review_repo.stream_rows(columns, batch_size)
+
+    @replica_read
+    def get_reviews_by_place(self, place_id, profile=None):
+        place = self.get_place(place_id)
+        if not place:
+            raise ValueError("Place not found")
+        return self.review_repo.get_by_place(place.id, profile)
+
+    @replica_read
+    def get_reviews_page_by_place(self, place_id, limit, after=None, profile='with_author'):
+        """
+        Retourne une page d'avis d'un lieu et le curseur de la page suivante.
+        Lève ValueError si le lieu n'existe pas.
+        """
         place = self.get_place(place_id)
         if not place:
             raise ValueError("Place not found")
-        return [r for r in self.review_repo.get_all() if r.place.id == int(place_id)]
+        return self.review_repo.get_page_by_place(place.id, limit, after=after, profile=profile)
 
+    @transactional
     def update_review(self, review_id, review_data):
         review = self.review_repo.get(review_id)
         if review:
-            if 'rating' in review_data and not (1 <= review_data['rating'] <= 5):
-                raise ValueError("Rating must be between 1 and 5")
-            self.review_repo.update(review_id, review_data)
+            # Seuls le texte et la note changent : déplacer un avis (place_id,
+            # user_id) fausserait les agrégats des deux places
+            # Only text and rating change: moving a review (place_id, user_id)
+            # would corrupt both places' aggregates
+            allowed = {k: v for k, v in (review_data or {}).items() if k in {'text', 'rating'}}
+            if 'text' in allowed and (not isinstance(allowed['text'], str) or not allowed['text'].strip()):
+                raise ValueError("Text must be a non-empty string")
+            # Validée avant adjust_rating_stats, qui indexe rating_<n>_count
+            # Validated before adjust_rating_stats, which indexes rating_<n>_count
+            if 'rating' in allowed:
+                Review.validate_rating(allowed['rating'])
+            if 'rating' in allowed and allowed['rating'] != review.rating:
+                review.place.adjust_rating_stats(added=allowed['rating'], removed=review.rating)
+            self.review_repo.update(review_id, allowed)
+            self._invalidate_place_reviews(review.place_id)
             return review
         return None
 
+    @transactional
     def delete_review(self, review_id):
         review = self.review_repo.get(review_id)
         if review:
+            place_id = review.place_id
+            review.place.adjust_rating_stats(removed=review.rating)
             self.review_repo.delete(review_id)
+            self._invalidate_place_reviews(place_id)
             return True
         return False
 
+    @staticmethod
+    def _invalidate(*tags):
+        # Après le commit : sinon une lecture concurrente remettrait en cache l'ancien état
+        # After the commit: otherwise a concurrent read would re-cache the old state
+        after_commit(lambda: cache.invalidate(*tags))
+
+    @classmethod
+    def _invalidate_place_reviews(cls, place_id):
+        # Avis et agrégats (review_count, average_rating) de la place
+        cls._invalidate('places', f'place:{place_id}', f'place_reviews:{place_id}')
+
+    def rebuild_rating_stats(self):
+        """Recalcule les agrégats d'avis des places ; retourne le nombre de places corrigées."""
+        repaired = self.place_repo.rebuild_rating_stats()
+        after_commit(cache.clear)
+        return repaired
+
     def has_already_reviewed(self, user_id, place_id):
         """Vérifie si un utilisateur a déjà commenté un lieu donné."""
-        reviews = self.review_repo.get_all()
-        for review in reviews:
-            if str(review.user.id) == str(user_id) and str(review.place.id) == str(place_id):
-                return True
-        return False
\ No newline at end of file
+        return self.review_repo.exists_for(int(user_id), int(place_id))
+
+    # ----------------------------------------------------------------------
+    # IMPORTS EN LOT / BULK IMPORTS
+    # ----------------------------------------------------------------------
+    # Par tranche de chunk_size lignes : une requête IN par référence, un
+    # INSERT multi-lignes dans un SAVEPOINT, puis un seul commit pour tout
+    # l'import. Les lignes invalides sont rapportées sans arrêter le lot.
+    # Per chunk of chunk_size rows: one IN query per reference, one
+    # multi-row INSERT inside a SAVEPOINT, then a single commit for the whole
+    # import. Invalid rows are reported without stopping the batch.
+
+    def bulk_create_places(self, rows, owner_id, chunk_size, allow_owner_override=False):
+        """
+        Crée des places en lot. owner_id est le propriétaire par défaut ;
+        avec allow_owner_override (admins), chaque ligne peut fixer le sien.
+        :return: BulkReport
+        """
+        report = BulkReport(len(rows))
+        for offset, chunk in chunked(rows, chunk_size):
+            items = report.object_rows(offset, chunk)
+            owners = {index: row.get('owner_id', owner_id) if allow_owner_override else owner_id
+                      for index, row in items}
+            known_users = self.user_repo.existing_ids(self._valid_ids(owners.values()))
+            known_amenities = self.amenity_repo.map_ids('id', self._valid_ids(
+                amenity_id for _, row in items if isinstance(row.get('amenities'), list)
+                for amenity_id in row['amenities']))
+
+            pending = []
+            for index, row in items:
+                data = dict(row)
+                data.pop('owner_id', None)
+                try:
+                    owner = self._row_id(owners[index], 'owner_id')
+                    if owner not in known_users:
+                        raise ValueError(f"User with id {owner} not found")
+                    amenity_ids = data.pop('amenities', None) or []
+                    if not isinstance(amenity_ids, list):
+                        raise ValueError("amenities must be a list of ids")
+                    amenity_ids = list(dict.fromkeys(self._row_id(amenity_id, 'amenities')
+                                                     for amenity_id in amenity_ids))
+                    missing = [amenity_id for amenity_id in amenity_ids if amenity_id not in known_amenities]
+                    if missing:
+                        raise ValueError(f"Amenity {missing[0]} not found")
+                    # Validation par le constructeur du modèle / Model constructor validation
+                    place = Place(**data, owner_id=owner)
+                except (TypeError, ValueError) as e:
+                    report.fail(index, str(e))
+                    continue
+                pending.append((index, place, amenity_ids))
+
+            def insert_places(pending=pending):
+                db.session.add_all([place for _, place, _ in pending])
+                db.session.flush()
+                links = [{'place_id': place.id, 'amenity_id': amenity_id}
+                         for _, place, amenity_ids in pending for amenity_id in amenity_ids]
+                if links:
+                    db.session.execute(place_amenity_association.insert(), links)
+                return [(index, place.id, 'created') for index, place, _ in pending]
+
+            self._flush_bulk_chunk(report, pending, insert_places)
+
+        commit()
+        if report.counts['created']:
+            self._invalidate('places')
+        return report
+
+    def bulk_upsert_amenities(self, rows, chunk_size):
+        """
+        Crée les amenities absentes ; un nom déjà connu (en base ou plus haut
+        dans le lot) renvoie l'id existant avec le statut 'unchanged'.
+        :return: BulkReport
+        """
+        report = BulkReport(len(rows))
+        for offset, chunk in chunked(rows, chunk_size):
+            items = report.object_rows(offset, chunk)
+            known = self.amenity_repo.map_ids(
+                'name', [row['name'] for _, row in items if isinstance(row.get('name'), str)])
+
+            pending, created = [], {}
+            for index, row in items:
+                name = row.get('name')
+                if isinstance(name, str) and name in known:
+                    report.record(index, known[name], 'unchanged')
+                    continue
+                if isinstance(name, str) and name in created:
+                    pending.append((index, created[name], 'unchanged'))
+                    continue
+                try:
+                    amenity = Amenity(**row)
+                except (TypeError, ValueError) as e:
+                    report.fail(index, str(e))
+                    continue
+                created[name] = amenity
+                pending.append((index, amenity, 'created'))
+
+            def insert_amenities(pending=pending, created=created):
+                db.session.add_all(list(created.values()))
+                db.session.flush()
+                return [(index, amenity.id, outcome) for index, amenity, outcome in pending]
+
+            self._flush_bulk_chunk(report, pending, insert_amenities)
+
+        commit()
+        if report.counts['created']:
+            self._invalidate('amenities')
+        return report
+
+    def bulk_upsert_reviews(self, rows, user_id, chunk_size):
+        """
+        Crée ou met à jour les avis de user_id (upsert sur (user_id, place_id)).
+        Les agrégats de chaque place touchée reçoivent un seul UPDATE par tranche.
+        Lève ValueError si l'utilisateur n'existe plus (jeton encore valide).
+        :return: BulkReport
+        """
+        user = self.get_user_for_update(user_id)
+        if not user:
+            raise ValueError("User not found")
+        report = BulkReport(len(rows))
+        touched, seen = set(), set()
+        for offset, chunk in chunked(rows, chunk_size):
+            items = report.object_rows(offset, chunk)
+            place_ids = self._valid_ids(row.get('place_id') for _, row in items)
+            places = {place.id: place for place in self.place_repo.get_many(place_ids, profile=None)}
+            existing = {review.place_id: review
+                        for review in self.review_repo.get_by_user_and_places(user.id, place_ids)}
+
+            pending = []
+            for index, row in items:
+                try:
+                    place_id = self._row_id(row.get('place_id'), 'place_id')
+                    Review.validate_content(row.get('text'), row.get('rating'))
+                    place = places.get(place_id)
+                    if place is None:
+                        raise ValueError("Place not found")
+                    if place.owner_id == user.id:
+                        raise ValueError("You cannot review your own place")
+                    if place_id in seen:
+                        raise ValueError("Duplicate place_id in this request")
+                except ValueError as e:
+                    report.fail(index, str(e))
+                    continue
+                seen.add(place_id)
+                pending.append((index, place, existing.get(place_id), row['text'], row['rating']))
+
+            def upsert_reviews(pending=pending):
+                results, deltas = [], {}
+                for index, place, review, text, rating in pending:
+                    added, removed = deltas.setdefault(place, ([], []))
+                    if review is None:
+                        review = Review(text=text, rating=rating, place=place, user=user)
+                        db.session.add(review)
+                        outcome = 'created'
+                    else:
+                        removed.append(review.rating)
+                        review.text, review.rating = text, rating
+                        outcome = 'updated'
+                    added.append(rating)
+                    results.append((index, review, outcome))
+                for place, (added, removed) in deltas.items():
+                    place.adjust_rating_stats(added=added, removed=removed)
+                db.session.flush()
+                touched.update(place.id for place in deltas)
+                return [(index, review.id, outcome) for index, review, outcome in results]
+
+            self._flush_bulk_chunk(report, pending, upsert_reviews)
+
+        commit()
+        if touched:
+            self._invalidate('places', *(f'place:{place_id}' for place_id in touched),
+                             *(f'place_reviews:{place_id}' for place_id in touched))
+        return report
+
+    @staticmethod
+    def _flush_bulk_chunk(report, pending, apply):
+        """
+        Exécute apply() dans un SAVEPOINT. Un conflit d'écriture concurrente
+        annule la tranche seule, ses lignes sont rapportées en erreur.
+        """
+        if not pending:
+            return
+        try:
+            with db.session.begin_nested():
+                results = apply()
+        except IntegrityError as e:
+            logger.warning("Bulk chunk rolled back: %s", e.orig)
+            for item in pending:
+                report.fail(item[0], "Conflicting concurrent write, row not saved")
+            return
+        for index, obj_id, outcome in results:
+            report.record(index, obj_id, outcome)
+
+    @staticmethod
+    def _row_id(value, field):
+        """Convertit un id de ligne en entier / Convert a row id to an integer."""
+        if isinstance(value, bool):
+            raise ValueError(f"{field} must be an integer id")
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be an integer id")
+
+    @classmethod
+    def _valid_ids(cls, values):
+        """Ids entiers valides parmi `values` (les autres seront rapportés ligne par ligne)."""
+        ids = set()
+        for value in values:
+            try:
+                ids.add(cls._row_id(value, 'id'))
+            except ValueError:
+                pass
+        return ids
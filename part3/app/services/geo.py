@@ -0,0 +1,87 @@
+"""
+Calculs géographiques pour la recherche de places
+Geographic helpers for place search
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+# Demi-circonférence : aucune distance ne la dépasse / Half circumference: no distance exceeds it
+MAX_DISTANCE_KM = 20038
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Distance orthodromique en km entre deux points / Great-circle distance in km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bounding_box(lat, lng, radius_km):
+    """
+    Boîte englobante d'un cercle, sous forme de plages (lat_range, [lng_ranges]).
+    Bounding box of a circle, as (lat_range, [lng_ranges]).
+
+    Plusieurs plages de longitude sont renvoyées quand le cercle traverse
+    l'antiméridien ; toute la longitude est couverte près des pôles.
+    Several longitude ranges are returned when the circle crosses the
+    antimeridian; the whole longitude span is covered near the poles.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return (max(min_lat, -90.0), min(max_lat, 90.0)), [(-180.0, 180.0)]
+
+    # Écart de longitude maximal atteint à la latitude la plus éloignée de l'équateur
+    d_lng = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM)
+                                       / math.cos(math.radians(lat)))))
+    return (min_lat, max_lat), split_longitude_range(lng - d_lng, lng + d_lng)
+
+
+def split_longitude_range(min_lng, max_lng):
+    """
+    Découpe une plage de longitude qui déborde de [-180, 180]
+    Split a longitude range overflowing [-180, 180]
+    """
+    if max_lng - min_lng >= 360:
+        return [(-180.0, 180.0)]
+    if min_lng < -180:
+        return [(min_lng + 360, 180.0), (-180.0, max_lng)]
+    if max_lng > 180:
+        return [(min_lng, 180.0), (-180.0, max_lng - 360)]
+    return [(min_lng, max_lng)]
+
+
+def parse_bbox(value):
+    """
+    Analyse un paramètre bbox "min_lng,min_lat,max_lng,max_lat".
+    Parse a "min_lng,min_lat,max_lng,max_lat" bbox parameter.
+
+    min_lng > max_lng signifie que la boîte traverse l'antiméridien.
+    min_lng > max_lng means the box crosses the antimeridian.
+
+    Returns:
+        tuple: ((min_lat, max_lat), [lng_ranges], (center_lat, center_lng))
+
+    Raises:
+        ValueError: Si le format ou les bornes sont invalides
+    """
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(part) for part in value.split(','))
+    except (AttributeError, ValueError):
+        raise ValueError("bbox must be 'min_lng,min_lat,max_lng,max_lat'")
+    if not (-90 <= min_lat <= max_lat <= 90):
+        raise ValueError("bbox latitudes must satisfy -90 <= min_lat <= max_lat <= 90")
+    if not (-180 <= min_lng <= 180 and -180 <= max_lng <= 180):
+        raise ValueError("bbox longitudes must be between -180 and 180")
+
+    if min_lng <= max_lng:
+        lng_ranges = [(min_lng, max_lng)]
+        center_lng = (min_lng + max_lng) / 2
+    else:
+        lng_ranges = [(min_lng, 180.0), (-180.0, max_lng)]
+        center_lng = (min_lng + max_lng + 360) / 2
+        if center_lng > 180:
+            center_lng -= 360
+    return (min_lat, max_lat), lng_ranges, ((min_lat + max_lat) / 2, center_lng)
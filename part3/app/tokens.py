@@ -0,0 +1,239 @@
+# app/tokens.py
+"""
+Jetons JWT : liste de révocation et cache de vérification
+JWT tokens: revocation list and verification cache
+
+Liste de révocation (TokenBlocklist) : un dict jti -> expiration en
+mémoire, consulté par token_in_blocklist_loader à chaque requête
+authentifiée. La recherche est un simple `jti in dict` ; les entrées sont
+évincées quand le jeton expire (il serait refusé de toute façon).
+Revocation list (TokenBlocklist): an in-memory jti -> expiry dict, looked
+up by token_in_blocklist_loader on every authenticated request. The
+lookup is a plain `jti in dict`; entries are evicted once the token
+expires (it would be refused anyway).
+
+Avec JWT_BLOCKLIST_PERSIST, chaque révocation est aussi écrite dans la
+table revoked_tokens ; les autres processus la relisent au plus toutes les
+JWT_BLOCKLIST_SYNC_SECONDS (lignes plus récentes que le dernier id vu).
+With JWT_BLOCKLIST_PERSIST every revocation is also written to the
+revoked_tokens table; other processes read it again at most every
+JWT_BLOCKLIST_SYNC_SECONDS (rows newer than the last id seen).
+
+Cache de vérification (CachingJWTManager) : un jeton déjà décodé et
+vérifié n'est pas revérifié (signature, claims) tant qu'il n'a pas expiré.
+La clé est le jeton encodé complet, signature comprise. La révocation reste
+vérifiée à chaque requête, après le décodage. Après un changement de
+JWT_SECRET_KEY, redémarrer les processus : les jetons en cache resteraient
+valides jusqu'à leur expiration.
+Verification cache (CachingJWTManager): a token already decoded and
+verified is not checked again (signature, claims) until it expires. The
+key is the full encoded token, signature included. Revocation is still
+checked on every request, after decoding. After a JWT_SECRET_KEY change,
+restart the processes: cached tokens would stay valid until they expire.
+"""
+import heapq
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from flask import current_app
+from flask_jwt_extended import JWTManager
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    jti révoqués d'une application, évincés à leur expiration.
+    Revoked jtis of one application, evicted when they expire.
+    """
+
+    def __init__(self, persist=False, sync_seconds=5):
+        self.persist = persist
+        self.sync_seconds = sync_seconds
+        self._revoked = {}
+        # Tas (expiration, jti) : les plus proches de l'expiration en tête
+        self._expiries = []
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._next_sync = 0.0
+
+    def __contains__(self, jti):
+        return jti in self._revoked
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def add(self, jti, expires_at):
+        """Ajoute un jti jusqu'à `expires_at` (timestamp Unix) / Add a jti until `expires_at`."""
+        with self._lock:
+            if jti not in self._revoked:
+                self._revoked[jti] = expires_at
+                heapq.heappush(self._expiries, (expires_at, jti))
+            self._evict(time.time())
+
+    def _evict(self, now):
+        while self._expiries and self._expiries[0][0] <= now:
+            _, jti = heapq.heappop(self._expiries)
+            self._revoked.pop(jti, None)
+
+    def sync_due(self):
+        return self.persist and time.monotonic() >= self._next_sync
+
+    def sync(self, session):
+        """
+        Charge les révocations écrites par les autres processus.
+        Load the revocations written by the other processes.
+        """
+        from app.models.revoked_token import RevokedToken
+
+        self._next_sync = time.monotonic() + self.sync_seconds
+        rows = session.execute(
+            RevokedToken.__table__.select()
+            .with_only_columns(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+            .where(RevokedToken.id > self._last_id,
+                   RevokedToken.expires_at > datetime.utcnow())
+            .order_by(RevokedToken.id)
+        ).all()
+        for row in rows:
+            self.add(row.jti, row.expires_at.replace(tzinfo=timezone.utc).timestamp())
+            self._last_id = row.id
+        if rows:
+            logger.debug("Token blocklist synced: %d new revocation(s)", len(rows))
+        return len(rows)
+
+
+class TokenBlocklist:
+    """
+    Extension Flask : révocation des JWT et token_in_blocklist_loader.
+    Flask extension: JWT revocation and token_in_blocklist_loader.
+    """
+
+    def init_app(self, app, jwt):
+        app.extensions['token_blocklist'] = RevocationList(
+            persist=app.config.get('JWT_BLOCKLIST_PERSIST', False),
+            sync_seconds=app.config.get('JWT_BLOCKLIST_SYNC_SECONDS', 5))
+        jwt.token_in_blocklist_loader(self._check)
+
+    @property
+    def revoked(self):
+        return current_app.extensions['token_blocklist']
+
+    def _check(self, jwt_header, jwt_payload):
+        revoked = current_app.extensions['token_blocklist']
+        if revoked.persist and revoked.sync_due():
+            revoked.sync(current_app.extensions['sqlalchemy'].session)
+        return jwt_payload['jti'] in revoked
+
+    def is_revoked(self, jti):
+        return jti in self.revoked
+
+    def revoke(self, claims):
+        """
+        Révoque le jeton décrit par `claims` (get_jwt()) jusqu'à son expiration.
+        Revoke the token described by `claims` (get_jwt()) until it expires.
+        """
+        revoked = self.revoked
+        # Jeton sans expiration (JWT_*_TOKEN_EXPIRES = False) : révoqué pour toujours
+        expires_at = claims.get('exp', float('inf'))
+        revoked.add(claims['jti'], expires_at)
+        if revoked.persist:
+            from app.extensions import db
+            from app.models.revoked_token import RevokedToken
+            from app.persistence.unit_of_work import commit
+
+            db.session.add(RevokedToken(
+                jti=claims['jti'], token_type=claims.get('type', 'access'),
+                expires_at=_utc_datetime(expires_at)))
+            commit()
+
+    def purge_expired(self):
+        """
+        Supprime les lignes de jetons expirés de revoked_tokens ; retourne leur nombre.
+        Delete expired token rows from revoked_tokens; return how many.
+        """
+        from app.extensions import db
+        from app.models.revoked_token import RevokedToken
+
+        deleted = db.session.execute(
+            RevokedToken.__table__.delete().where(RevokedToken.expires_at <= datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        return deleted
+
+
+def _utc_datetime(timestamp):
+    if timestamp == float('inf'):
+        return datetime.max
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+class VerifiedTokenCache:
+    """
+    LRU des claims de jetons vérifiés, borné à `max_entries`.
+    LRU of verified token claims, capped at `max_entries`.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._claims = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, encoded_token):
+        with self._lock:
+            claims = self._claims.get(encoded_token)
+            if claims is not None and claims.get('exp', float('inf')) > time.time():
+                self._claims.move_to_end(encoded_token)
+                self.hits += 1
+                return dict(claims)
+            if claims is not None:
+                del self._claims[encoded_token]
+            self.misses += 1
+            return None
+
+    def put(self, encoded_token, claims):
+        with self._lock:
+            self._claims[encoded_token] = dict(claims)
+            self._claims.move_to_end(encoded_token)
+            while len(self._claims) > self.max_entries:
+                self._claims.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._claims.clear()
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager qui garde les claims des jetons vérifiés (JWT_VERIFY_CACHE_SIZE
+    entrées, 0 pour désactiver).
+    JWTManager keeping the claims of verified tokens (JWT_VERIFY_CACHE_SIZE
+    entries, 0 to disable).
+
+    Un jeton pas encore valide (nbf), un jeton CSRF (cookies) ou un décodage
+    qui accepte les jetons expirés passent toujours par la vérification complète.
+    A not-yet-valid token (nbf), a CSRF token (cookies) or a decode that
+    accepts expired tokens always goes through full verification.
+    """
+
+    def init_app(self, app, add_context_processor=False):
+        super().init_app(app, add_context_processor=add_context_processor)
+        size = app.config.get('JWT_VERIFY_CACHE_SIZE', 1024)
+        app.extensions['jwt_verify_cache'] = VerifiedTokenCache(size) if size else None
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        cache = current_app.extensions.get('jwt_verify_cache')
+        if cache is None or csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        claims = cache.get(encoded_token)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token)
+            if 'nbf' not in claims or claims['nbf'] <= time.time():
+                cache.put(encoded_token, claims)
+        return claims
+
+
+token_blocklist = TokenBlocklist()
@@ -0,0 +1,9 @@
+"""
+Benchmarks de l'API HBnB (hors suite de tests)
+HBnB API benchmarks (outside the test suite)
+
+    python -m benchmarks.bench_serializers --rows 10000 100000
+    python -m benchmarks.seed --db sqlite:///bench.db --scale 1000000
+    python -m benchmarks.load --scale 10000 --concurrency 8 --output run.json
+    python -m benchmarks.compare baseline.json run.json --fail-above 10
+"""
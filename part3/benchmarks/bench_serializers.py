@@ -0,0 +1,128 @@
+"""
+Micro-benchmark des sérialiseurs : lignes/seconde pour places et reviews
+Serializer micro-benchmark: rows/second for places and reviews
+
+Compare, sur une base SQLite en mémoire :
+Compares, on an in-memory SQLite database:
+    - legacy   : instances ORM + dict construit à la main + json stdlib
+                 ORM instances + hand-built dict + stdlib json
+    - compiled : lecture du profil / tuples Row + sérialiseur précompilé
+                 + encodeur de l'API (orjson si disponible)
+                 load profile / Row tuples + precompiled serializer
+                 + API encoder (orjson when available)
+
+Usage:
+    python -m benchmarks.bench_serializers --rows 10000 100000 [--repeat 3]
+"""
+import argparse
+import json
+import time
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.place_repository import PlaceRepository
+from app.persistence.review_repository import ReviewRepository
+from app.serializers import encoding
+from app.serializers.place import serialize_place
+from app.serializers.review import REVIEW_COLUMNS, serialize_review
+from config import Config
+
+# Nombre d'auteurs : chaque auteur note rows / AUTHORS places (unicité user/place)
+# Number of authors: each author rates rows / AUTHORS places (user/place uniqueness)
+AUTHORS = 10
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    CACHE_TYPE = 'null'
+
+
+def seed(rows):
+    """Insère `rows` places et `rows` reviews en executemany / Insert rows places and reviews."""
+    users = [{'first_name': f'User{i}', 'last_name': 'Bench', 'email': f'user{i}@bench.test',
+              'password': '$2b$04$bench', 'is_admin': False} for i in range(AUTHORS)]
+    db.session.execute(User.__table__.insert(), users)
+    db.session.execute(Place.__table__.insert(), [
+        {'title': f'Place {i}', 'description': 'Benchmark place', 'price': float(i % 500),
+         'latitude': (i % 180) - 90.0, 'longitude': (i % 360) - 180.0, 'owner_id': 1 + i % AUTHORS}
+        for i in range(rows)])
+    db.session.execute(Review.__table__.insert(), [
+        {'text': f'Review {i}', 'rating': 1 + i % 5, 'user_id': 1 + i % AUTHORS,
+         'place_id': 1 + i // AUTHORS}
+        for i in range(rows)])
+    db.session.commit()
+
+
+def legacy_places():
+    places = Place.query.all()
+    return json.dumps([{
+        'id': place.id,
+        'title': place.title,
+        'description': place.description,
+        'price': place.price,
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'owner_id': place.owner_id,
+        'amenities': [amenity.id for amenity in place.amenities],
+        'review_count': place.review_count,
+        'average_rating': place.average_rating,
+        'rating_histogram': place.rating_histogram
+    } for place in places])
+
+
+def compiled_places():
+    return encoding.dumps(serialize_place.many(PlaceRepository().get_all('summary')))
+
+
+def legacy_reviews():
+    reviews = Review.query.all()
+    return json.dumps([{
+        'id': review.id,
+        'text': review.text,
+        'rating': review.rating,
+        'user_id': review.user.id,
+        'place_id': review.place.id
+    } for review in reviews])
+
+
+def compiled_reviews():
+    return encoding.dumps(serialize_review.many(ReviewRepository().get_rows(REVIEW_COLUMNS)))
+
+
+def measure(func, rows, repeat):
+    """Meilleur temps sur `repeat` essais, session vidée avant chacun / Best of `repeat` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    encoder = 'orjson' if encoding.orjson is not None else 'json'
+    print(f"encoder: {encoder}")
+    print(f"{'rows':>8}  {'payload':<8} {'legacy rows/s':>14} {'compiled rows/s':>16} {'speedup':>8}")
+    for rows in args.rows:
+        app = create_app(BenchConfig)
+        with app.app_context():
+            seed(rows)
+            for name, legacy, compiled in (('places', legacy_places, compiled_places),
+                                           ('reviews', legacy_reviews, compiled_reviews)):
+                before = measure(legacy, rows, args.repeat)
+                after = measure(compiled, rows, args.repeat)
+                print(f"{rows:>8}  {name:<8} {before:>14,.0f} {after:>16,.0f} {after / before:>7.1f}x")
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare deux rapports de benchmarks.load (ex. deux commits)
+Compare two benchmarks.load reports (e.g. two commits)
+
+Écart relatif par endpoint sur le débit, p50, p95, p99 et les requêtes SQL.
+Avec --fail-above, le code de sortie est 1 si une latence p95 régresse de
+plus de ce pourcentage.
+Relative change per endpoint for throughput, p50, p95, p99 and SQL
+queries. With --fail-above, exits with status 1 when a p95 latency
+regresses by more than that percentage.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--fail-above 10]
+"""
+import argparse
+import json
+import sys
+
+METRICS = (
+    ('rps', lambda stats: stats['throughput_rps']),
+    ('p50', lambda stats: stats['latency_ms']['p50']),
+    ('p95', lambda stats: stats['latency_ms']['p95']),
+    ('p99', lambda stats: stats['latency_ms']['p99']),
+    ('sql', lambda stats: (stats.get('sql_queries') or {}).get('mean')),
+)
+
+
+def change(before, after):
+    """Écart relatif en % (None si incomparable) / Relative change in %."""
+    if before is None or after is None or before == 0:
+        return None
+    return (after - before) / before * 100
+
+
+def compare(baseline, candidate):
+    """
+    Écarts par endpoint commun aux deux rapports : {endpoint: {métrique: (avant, après, %)}}.
+    Changes per endpoint found in both reports.
+    """
+    rows = {}
+    for name, before in baseline['endpoints'].items():
+        after = candidate['endpoints'].get(name)
+        if after is not None:
+            rows[name] = {metric: (get(before), get(after), change(get(before), get(after)))
+                          for metric, get in METRICS}
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--fail-above', type=float, help="fail when a p95 regresses by more than this %%")
+    args = parser.parse_args()
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    with open(args.candidate) as handle:
+        candidate = json.load(handle)
+    print(f"baseline {baseline['meta'].get('commit')}  ->  candidate {candidate['meta'].get('commit')}")
+    if baseline['meta'].get('counts') != candidate['meta'].get('counts'):
+        print("warning: the two runs used different dataset counts")
+
+    print(f"{'endpoint':<20}" + ''.join(f" {metric:>9}" for metric, _ in METRICS))
+    regressions = []
+    for name, metrics in compare(baseline, candidate).items():
+        cells = []
+        for metric, (_, _, pct) in metrics.items():
+            cells.append(f" {pct:>+8.1f}%" if pct is not None else f" {'-':>9}")
+        print(f"{name:<20}" + ''.join(cells))
+        p95 = metrics['p95'][2]
+        if args.fail_above is not None and p95 is not None and p95 > args.fail_above:
+            regressions.append(name)
+    if regressions:
+        print(f"p95 regression above {args.fail_above}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""
+Banc de charge de l'API : latence, débit et requêtes SQL par endpoint
+API load test: latency, throughput and SQL queries per endpoint
+
+Deux pilotes :
+Two drivers:
+    - wsgi : l'application tourne dans ce processus (client de test Flask),
+             sur une base seedée pour l'occasion ; les requêtes SQL de chaque
+             appel sont comptées.
+             the application runs in this process (Flask test client), on a
+             database seeded for the run; each call's SQL queries are counted.
+    - http : un serveur déjà lancé (--url), seedé avec benchmarks.seed et les
+             mêmes effectifs ; pas de comptage SQL.
+             an already running server (--url), seeded with benchmarks.seed
+             and the same counts; no SQL counting.
+
+Les chemins appelés sont tirés d'une graine fixe : deux runs envoient les
+mêmes requêtes. Le rapport JSON (clés triées) se compare d'un commit à
+l'autre avec benchmarks.compare.
+Requested paths come from a fixed seed: two runs send the same requests.
+The JSON report (sorted keys) is compared across commits with
+benchmarks.compare.
+
+Usage:
+    python -m benchmarks.load --scale 10000 --requests 500 --concurrency 8 --output run.json
+    python -m benchmarks.seed --db sqlite:///bench.db --scale 1000000
+    python -m benchmarks.load --url http://127.0.0.1:5000 --scale 1000000 --output run.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.serializers import encoding
+from benchmarks.seed import (ADMIN_EMAIL, PASSWORD, WORDS, add_count_arguments, bench_config,
+                             counts_from_args, seed)
+from config import config
+
+API = '/api/v1'
+
+
+def _random_id(count):
+    return lambda rng: rng.randrange(count) + 1
+
+
+def endpoints(counts):
+    """
+    Endpoints mesurés : nom -> (méthode, chemin(rng), authentifié, corps).
+    Measured endpoints: name -> (method, path(rng), authenticated, body).
+    """
+    place, user = _random_id(counts['places']), _random_id(counts['users'])
+    return {
+        'places.list': ('GET', lambda rng: f'{API}/places/?limit=50&after={place(rng) - 1}', False, None),
+        'places.get': ('GET', lambda rng: f'{API}/places/{place(rng)}', False, None),
+        'places.search_text': ('GET', lambda rng: f'{API}/places/search?q={rng.choice(WORDS)}&limit=20',
+                               False, None),
+        'places.search_geo': ('GET', lambda rng: f'{API}/places/search?lat={rng.uniform(-60, 60):.4f}'
+                              f'&lng={rng.uniform(-170, 170):.4f}&radius_km=500', False, None),
+        'reviews.by_place': ('GET', lambda rng: f'{API}/reviews/places/{place(rng)}/reviews', False, None),
+        'amenities.list': ('GET', lambda rng: f'{API}/amenities/', False, None),
+        'users.get': ('GET', lambda rng: f'{API}/users/{user(rng)}', True, None),
+        # bcrypt à chaque appel : mesuré seulement sur demande (--endpoints auth.login)
+        'auth.login': ('POST', lambda rng: f'{API}/auth/login', False,
+                       {'email': ADMIN_EMAIL, 'password': PASSWORD}),
+    }
+
+
+DEFAULT_ENDPOINTS = ('places.list', 'places.get', 'places.search_text', 'places.search_geo',
+                     'reviews.by_place', 'amenities.list', 'users.get')
+
+
+class WsgiDriver:
+    """Appels via l'interface WSGI de l'application / Calls through the app's WSGI interface."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.queries = getattr(self._local, 'queries', 0) + 1
+
+    def request(self, method, path, headers, body):
+        """:return: (statut, requêtes SQL) / (status, SQL queries)"""
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        self._local.queries = 0
+        response = client.open(path, method=method, headers=headers, json=body)
+        response.get_data()
+        return response.status_code, self._local.queries
+
+    def post_json(self, path, body):
+        response = self.app.test_client().post(path, json=body)
+        return response.status_code, response.get_json()
+
+
+class HttpDriver:
+    """Appels HTTP, une connexion keep-alive par thread / HTTP calls, one keep-alive connection per thread."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self._local = threading.local()
+
+    def request(self, method, path, headers, body):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        payload = json.dumps(body) if body is not None else None
+        headers = dict(headers, **({'Content-Type': 'application/json'} if payload else {}))
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            raise
+        return response.status, None
+
+    def post_json(self, path, body):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            connection.request('POST', path, body=json.dumps(body),
+                               headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read() or b'{}')
+        finally:
+            connection.close()
+
+
+def percentile(sorted_values, pct):
+    """Rang le plus proche / Nearest rank."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+def run_endpoint(driver, spec, token, requests, concurrency, warmup, rng):
+    """Mesure un endpoint ; retourne ses statistiques / Measure one endpoint; return its stats."""
+    method, path, authenticated, body = spec
+    headers = {'Authorization': f'Bearer {token}'} if authenticated else {}
+    paths = [path(rng) for _ in range(warmup + requests)]
+    for warm_path in paths[:warmup]:
+        driver.request(method, warm_path, headers, body)
+
+    def timed(call_path):
+        start = time.perf_counter()
+        try:
+            status, queries = driver.request(method, call_path, headers, body)
+        except (OSError, http.client.HTTPException):
+            status, queries = 'error', None
+        return time.perf_counter() - start, status, queries
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, paths[warmup:]))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency * 1000 for latency, _, _ in results)
+    statuses = {}
+    for _, status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    queries = [count for _, _, count in results if count is not None]
+    return {
+        'requests': len(results),
+        'statuses': statuses,
+        'errors': sum(n for status, n in statuses.items() if not status.startswith(('2', '3'))),
+        'throughput_rps': round(len(results) / elapsed, 1),
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 3),
+            'p50': round(percentile(latencies, 50), 3),
+            'p95': round(percentile(latencies, 95), 3),
+            'p99': round(percentile(latencies, 99), 3),
+            'max': round(latencies[-1], 3),
+        },
+        'sql_queries': {
+            'mean': round(sum(queries) / len(queries), 2),
+            'max': max(queries),
+        } if queries else None,
+    }
+
+
+def login(driver):
+    """Jeton d'accès de l'admin seedé / Access token of the seeded admin."""
+    status, data = driver.post_json(f'{API}/auth/login', {'email': ADMIN_EMAIL, 'password': PASSWORD})
+    if status != 200:
+        raise SystemExit(f"Login as {ADMIN_EMAIL} failed ({status}): is the database seeded?")
+    return data['access_token']
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(report, out=sys.stdout):
+    print(f"{'endpoint':<20} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'sql':>6} {'errors':>7}",
+          file=out)
+    for name, stats in report['endpoints'].items():
+        latency = stats['latency_ms']
+        sql = f"{stats['sql_queries']['mean']:.1f}" if stats['sql_queries'] else '-'
+        print(f"{name:<20} {stats['throughput_rps']:>9,.1f} {latency['p50']:>9.2f} {latency['p95']:>9.2f}"
+              f" {latency['p99']:>9.2f} {sql:>6} {stats['errors']:>7}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help="benchmark a running server over HTTP instead of WSGI")
+    parser.add_argument('--db', help="WSGI mode: SQLAlchemy URI (default: a temporary SQLite file)")
+    parser.add_argument('--skip-seed', action='store_true', help="WSGI mode: --db is already seeded")
+    parser.add_argument('--config', default='production', choices=sorted(config))
+    parser.add_argument('--cache', default='null', choices=('null', 'memory'),
+                        help="WSGI mode: response cache (default: off, to measure the database path)")
+    parser.add_argument('--endpoints', nargs='+', default=list(DEFAULT_ENDPOINTS))
+    parser.add_argument('--requests', type=int, default=200, help="measured requests per endpoint")
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--output', help="write the JSON report to this file (default: stdout)")
+    add_count_arguments(parser)
+    args = parser.parse_args()
+
+    counts = counts_from_args(args)
+    specs = endpoints(counts)
+    unknown = set(args.endpoints) - set(specs)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))} (known: {', '.join(specs)})")
+
+    temp_dir = None
+    if args.url:
+        driver, context = HttpDriver(args.url), None
+    else:
+        database_uri = args.db
+        if database_uri is None:
+            temp_dir = tempfile.TemporaryDirectory(prefix='hbnb-bench-')
+            database_uri = f"sqlite:///{os.path.join(temp_dir.name, 'bench.db')}"
+        app = create_app(bench_config(args.config, database_uri, CACHE_TYPE=args.cache))
+        context = app.app_context()
+        context.push()
+        if not args.skip_seed:
+            seed(counts, args.seed, log=lambda line: print(line, file=sys.stderr))
+        db.session.remove()
+        driver = WsgiDriver(app)
+
+    try:
+        token = login(driver)
+        report = {
+            'meta': {
+                'commit': git_commit(),
+                'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'driver': 'http' if args.url else 'wsgi',
+                'config': None if args.url else args.config,
+                'cache': None if args.url else args.cache,
+                'encoder': 'orjson' if encoding.orjson is not None else 'json',
+                'concurrency': args.concurrency,
+                'requests': args.requests,
+                'warmup': args.warmup,
+                'seed': args.seed,
+                'counts': counts,
+            },
+            'endpoints': {},
+        }
+        for index, name in enumerate(args.endpoints):
+            rng = random.Random(args.seed * 1000 + index)
+            report['endpoints'][name] = run_endpoint(driver, specs[name], token, args.requests,
+                                                     args.concurrency, args.warmup, rng)
+    finally:
+        if context is not None:
+            db.session.remove()
+            context.pop()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    print_table(report, out=sys.stderr)
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
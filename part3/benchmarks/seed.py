@@ -0,0 +1,221 @@
+"""
+Jeu de données déterministe pour les benchmarks, jusqu'à des millions de lignes
+Deterministic benchmark dataset, up to millions of rows
+
+Même graine et mêmes effectifs => mêmes lignes, mêmes ids : deux runs sur
+deux commits mesurent la même base. Les lignes sont produites par
+générateurs et insérées par lots (executemany sur la table, sans ORM) ;
+la mémoire reste bornée par --batch-size, plus un entier par place.
+Same seed and same counts => same rows, same ids: two runs on two commits
+measure the same database. Rows come from generators and are inserted in
+batches (executemany on the table, no ORM); memory stays bounded by
+--batch-size, plus one integer per place.
+
+Tous les utilisateurs ont le mot de passe PASSWORD ; user1@bench.test est admin.
+Every user has the PASSWORD password; user1@bench.test is an admin.
+
+Usage:
+    python -m benchmarks.seed --db sqlite:///bench.db --scale 1000000
+    python -m benchmarks.seed --db sqlite:///bench.db --users 5000 --places 20000 --reviews 100000 --reset
+"""
+import argparse
+import random
+import time
+from array import array
+from datetime import datetime
+from itertools import islice
+from app import create_app
+from app.extensions import db
+from app.hashing import password_hasher
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity_association
+from app.models.review import Review
+from app.models.user import User
+from app.persistence import search_index
+from app.persistence.place_repository import PlaceRepository
+from config import config
+
+PASSWORD = 'bench-password'
+ADMIN_EMAIL = 'user1@bench.test'
+
+WORDS = ('sunny', 'quiet', 'cozy', 'modern', 'rustic', 'loft', 'studio', 'villa',
+         'cabin', 'beach', 'garden', 'river', 'mountain', 'downtown', 'harbor', 'forest')
+AMENITY_NAMES = ('WiFi', 'Pool', 'Parking', 'Kitchen', 'Heating', 'Air conditioning',
+                 'Washer', 'Gym', 'Balcony', 'Fireplace')
+# Équipements par place : 0 à MAX_AMENITIES_PER_PLACE
+MAX_AMENITIES_PER_PLACE = 4
+
+
+def scale_counts(n):
+    """Effectifs par défaut pour une échelle N / Default counts for scale N."""
+    return {'users': n, 'amenities': max(len(AMENITY_NAMES), min(1000, n // 100)),
+            'places': n, 'reviews': 2 * n}
+
+
+def check_counts(counts):
+    """
+    Un utilisateur note une place au plus une fois, et jamais la sienne :
+    au plus users - 1 avis par place.
+    A user reviews a place at most once, never their own: at most
+    users - 1 reviews per place.
+    """
+    if counts['users'] < 2 or counts['places'] < 1 or counts['amenities'] < 1:
+        raise ValueError("Need at least 2 users, 1 place and 1 amenity")
+    if counts['reviews'] > counts['places'] * (counts['users'] - 1):
+        raise ValueError("Too many reviews: at most places * (users - 1)")
+
+
+def _users(counts, password_hash, now):
+    for user_id in range(1, counts['users'] + 1):
+        yield {'id': user_id, 'first_name': f'User{user_id}', 'last_name': 'Bench',
+               'email': f'user{user_id}@bench.test', 'password': password_hash,
+               'is_admin': user_id == 1, 'created_at': now, 'updated_at': now}
+
+
+def _amenities(counts, now):
+    for amenity_id in range(1, counts['amenities'] + 1):
+        name = AMENITY_NAMES[(amenity_id - 1) % len(AMENITY_NAMES)]
+        if amenity_id > len(AMENITY_NAMES):
+            name = f'{name} {amenity_id}'
+        yield {'id': amenity_id, 'name': name, 'created_at': now, 'updated_at': now}
+
+
+def _places(counts, rng, owners, now):
+    for place_id in range(1, counts['places'] + 1):
+        owner_id = rng.randrange(counts['users']) + 1
+        owners.append(owner_id)
+        first, second, third = rng.sample(WORDS, 3)
+        yield {'id': place_id, 'title': f'{first.title()} {second} {place_id}',
+               'description': f'A {first} {second} near the {third}',
+               'price': round(rng.uniform(20, 500), 2),
+               'latitude': round(rng.uniform(-85, 85), 6),
+               'longitude': round(rng.uniform(-180, 180), 6),
+               'owner_id': owner_id, 'created_at': now, 'updated_at': now}
+
+
+def _place_amenities(counts, rng):
+    limit = min(MAX_AMENITIES_PER_PLACE, counts['amenities'])
+    for place_id in range(1, counts['places'] + 1):
+        for amenity_id in rng.sample(range(1, counts['amenities'] + 1), rng.randint(0, limit)):
+            yield {'place_id': place_id, 'amenity_id': amenity_id}
+
+
+def _reviews(counts, rng, owners, now):
+    # L'avis r porte sur la place r % places ; son auteur est le k-ième
+    # utilisateur après le propriétaire (k = r // places), donc jamais le
+    # propriétaire et jamais deux fois le même pour une place.
+    # Review r is about place r % places; its author is the k-th user after
+    # the owner (k = r // places), so never the owner and never twice the
+    # same user for one place.
+    users, places = counts['users'], counts['places']
+    for review_id in range(1, counts['reviews'] + 1):
+        index = review_id - 1
+        place_index, k = index % places, index // places
+        user_id = (owners[place_index] + k) % users + 1
+        yield {'id': review_id, 'text': f'Review {review_id}: {rng.choice(WORDS)} stay',
+               'rating': rng.choices((1, 2, 3, 4, 5), weights=(1, 2, 4, 6, 5))[0],
+               'place_id': place_index + 1, 'user_id': user_id,
+               'created_at': now, 'updated_at': now}
+
+
+def insert_batches(table, rows, batch_size):
+    """Insère `rows` (itérable) par lots de batch_size ; retourne le nombre de lignes."""
+    total = 0
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return total
+        db.session.execute(table.insert(), batch)
+        db.session.commit()
+        total += len(batch)
+
+
+def seed(counts, seed=42, batch_size=10_000, log=print):
+    """
+    Remplit une base vide (dans un contexte d'application).
+    Fill an empty database (inside an application context).
+
+    :return: Secondes passées par table / Seconds spent per table.
+    """
+    check_counts(counts)
+    if db.session.query(User.id).first() is not None:
+        raise ValueError("Database is not empty (use --reset)")
+    rng = random.Random(seed)
+    now = datetime(2024, 1, 1)
+    owners = array('i')
+    password_hash = password_hasher.hash(PASSWORD)
+    timings = {}
+    steps = (
+        ('users', User.__table__, _users(counts, password_hash, now)),
+        ('amenities', Amenity.__table__, _amenities(counts, now)),
+        ('places', Place.__table__, _places(counts, rng, owners, now)),
+        ('place_amenities', place_amenity_association, _place_amenities(counts, rng)),
+        ('reviews', Review.__table__, _reviews(counts, rng, owners, now)),
+    )
+    for name, table, rows in steps:
+        start = time.perf_counter()
+        inserted = insert_batches(table, rows, batch_size)
+        timings[name] = time.perf_counter() - start
+        log(f"{name:<16} {inserted:>10,} rows  {timings[name]:8.2f}s")
+    # Agrégats d'avis dénormalisés, recalculés en un UPDATE
+    start = time.perf_counter()
+    PlaceRepository().rebuild_rating_stats()
+    timings['rating_stats'] = time.perf_counter() - start
+    log(f"{'rating_stats':<16} {'':>10}       {timings['rating_stats']:8.2f}s")
+    return timings
+
+
+def add_count_arguments(parser):
+    """Options d'effectifs partagées avec benchmarks.load / Count options shared with benchmarks.load."""
+    parser.add_argument('--scale', type=int, default=1000,
+                        help="N users, N places, 2N reviews, N/100 amenities")
+    for name in ('users', 'amenities', 'places', 'reviews'):
+        parser.add_argument(f'--{name}', type=int, help=f"override the {name} count")
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def counts_from_args(args):
+    counts = scale_counts(args.scale)
+    counts.update({name: getattr(args, name) for name in counts if getattr(args, name) is not None})
+    return counts
+
+
+def bench_config(name, database_uri, **overrides):
+    """
+    Classe de config dérivée de config[name] pour une base de benchmark.
+    Config class derived from config[name] for a benchmark database.
+    """
+    # Base jetable : tables créées depuis les modèles, même en config production
+    settings = dict(SQLALCHEMY_DATABASE_URI=database_uri, RATELIMIT_STORAGE='null',
+                    LOG_LEVEL='WARNING', DB_AUTO_CREATE=True)
+    settings.update(overrides)
+    return type('BenchConfig', (config[name],), settings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--db', required=True, help="SQLAlchemy URI, e.g. sqlite:///bench.db")
+    parser.add_argument('--config', default='production', choices=sorted(config))
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--reset', action='store_true', help="drop and recreate the tables first")
+    add_count_arguments(parser)
+    args = parser.parse_args()
+
+    app = create_app(bench_config(args.config, args.db))
+    with app.app_context():
+        if args.reset:
+            db.drop_all(bind_key=None)
+            db.create_all(bind_key=None)
+            search_index.create()
+        try:
+            seed(counts_from_args(args), args.seed, args.batch_size)
+        except ValueError as e:
+            parser.error(str(e))
+        # L'index plein texte survit à drop_all : ses entrées sont refaites
+        if args.reset and search_index.is_available():
+            search_index.rebuild()
+
+
+if __name__ == '__main__':
+    main()
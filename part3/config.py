@@ -1,21 +1,110 @@
 import os
+from datetime import timedelta
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', SECRET_KEY)
+    # Jeton d'accès court, renouvelé par /auth/refresh (jeton de rafraîchissement tournant)
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_MINUTES', 15)))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv('JWT_REFRESH_TOKEN_DAYS', 30)))
+    # Révocations aussi écrites en base (table revoked_tokens), relues par les
+    # autres processus au plus toutes les JWT_BLOCKLIST_SYNC_SECONDS
+    JWT_BLOCKLIST_PERSIST = os.getenv('JWT_BLOCKLIST_PERSIST', '0') == '1'
+    JWT_BLOCKLIST_SYNC_SECONDS = int(os.getenv('JWT_BLOCKLIST_SYNC_SECONDS', 5))
+    # Jetons déjà vérifiés gardés en cache (0 : vérification complète à chaque requête)
+    JWT_VERIFY_CACHE_SIZE = int(os.getenv('JWT_VERIFY_CACHE_SIZE', 1024))
     DEBUG = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Taille de page par défaut / maximale des collections paginées
+    API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 100))
+    API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 1000))
+    # Exports NDJSON en flux : lignes lues par aller-retour SQL
+    STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 1000))
+    # Imports en lot : lignes par tranche (SAVEPOINT + INSERT) et par requête
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 1000))
+    BULK_MAX_ROWS = int(os.getenv('BULK_MAX_ROWS', 50000))
+    # Cache des GET publics : 'memory' (LRU en processus), 'redis' ou 'null'
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'memory')
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', 60))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1024))
+    CACHE_MAX_TAGS = int(os.getenv('CACHE_MAX_TAGS', 4096))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # Pool de connexions (None : valeur par défaut de SQLAlchemy pour le dialecte)
+    DB_POOL_SIZE = int(os.environ['DB_POOL_SIZE']) if os.getenv('DB_POOL_SIZE') else None
+    DB_POOL_MAX_OVERFLOW = int(os.environ['DB_POOL_MAX_OVERFLOW']) if os.getenv('DB_POOL_MAX_OVERFLOW') else None
+    DB_POOL_RECYCLE = int(os.environ['DB_POOL_RECYCLE']) if os.getenv('DB_POOL_RECYCLE') else None
+    DB_POOL_TIMEOUT = int(os.environ['DB_POOL_TIMEOUT']) if os.getenv('DB_POOL_TIMEOUT') else None
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '0') == '1'
+    # Tables créées depuis les modèles au démarrage (dev, tests) ; sinon le
+    # schéma vient des migrations : flask db upgrade (voir migrations/README)
+    DB_AUTO_CREATE = os.getenv('DB_AUTO_CREATE', '1') == '1'
+    # Réplique en lecture : les méthodes get_* de la facade y lisent
+    SQLALCHEMY_REPLICA_URI = os.getenv('REPLICA_DATABASE_URI')
+    # Coût bcrypt (2^n itérations) ; les hashes d'un autre coût sont refaits au login
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # Pool de hachage : calculs simultanés, et demandes en attente avant un 503
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0)) or None
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 16))
+    # Limiteur de débit : 'memory' (en processus), 'redis' ou 'null'
+    RATELIMIT_STORAGE = os.getenv('RATELIMIT_STORAGE', 'memory')
+    RATELIMIT_REDIS_URL = os.getenv('RATELIMIT_REDIS_URL', 'redis://localhost:6379/1')
+    RATELIMIT_MAX_KEYS = int(os.getenv('RATELIMIT_MAX_KEYS', 100000))
+    # Limites (appels, fenêtre en secondes) du login, par IP et par email
+    RATELIMIT_LOGIN_IP = (int(os.getenv('RATELIMIT_LOGIN_IP', 30)), 60)
+    RATELIMIT_LOGIN_EMAIL = (int(os.getenv('RATELIMIT_LOGIN_EMAIL', 10)), 300)
+    # PRAGMA SQLite appliqués à chaque connexion (voir app/persistence/sqlite_pragmas.py)
+    SQLITE_PRAGMAS = {}
+    # Logs (voir app/logging_setup.py) : niveau global, niveaux par logger
+    # ("app.persistence=DEBUG,werkzeug=WARNING"), format 'json' ou 'text',
+    # fraction des logs DEBUG gardée
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_LEVELS = os.getenv('LOG_LEVELS', 'sqlalchemy.engine=WARNING')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0))
+    # Instrumentation par requête (voir app/request_timing.py) : en-tête
+    # Server-Timing, et log 'app.slow_requests' au-delà de SLOW_REQUEST_MS (0 : désactivé)
+    SERVER_TIMING = os.getenv('SERVER_TIMING', '1') == '1'
+    SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', 500))
+    SLOW_REQUEST_EXPLAIN = os.getenv('SLOW_REQUEST_EXPLAIN', '1') == '1'
+    # Métriques Prometheus sur /metrics (voir app/metrics.py) ; serveur prefork :
+    # dossier partagé par les workers, vidé au démarrage
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+    METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR')
+    METRICS_FLUSH_SECONDS = int(os.getenv('METRICS_FLUSH_SECONDS', 5))
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG').upper()
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 10))
     SQLALCHEMY_DATABASE_URI = os.getenv('DEV_DATABASE_URI', 'sqlite:///development.db')
 
 class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.getenv('PROD_DATABASE_URI', 'sqlite:///production.db')
+    # Le schéma de production n'évolue que par migrations / Production schema only changes by migrations
+    DB_AUTO_CREATE = os.getenv('DB_AUTO_CREATE', '0') == '1'
+    # WAL : les lecteurs ne bloquent plus sur l'écrivain ; synchronous=NORMAL
+    # reste sûr en WAL (seul le dernier commit peut être perdu sur coupure)
+    SQLITE_PRAGMAS = {
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        # Négatif : taille en KiB (64 Mo par connexion) / Negative: size in KiB
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64000)),
+        'temp_store': 'MEMORY',
+        # Réplique en lecture seule : SQLITE_QUERY_ONLY=1
+        'query_only': os.getenv('SQLITE_QUERY_ONLY', '0') == '1',
+    }
+    # Les durées internes ne sont exposées aux clients que sur demande
+    SERVER_TIMING = os.getenv('SERVER_TIMING', '0') == '1'
 
 class TestingConfig(Config):
     TESTING = True
+    # Coût minimal : les tests n'ont pas besoin d'un hash lent
+    BCRYPT_LOG_ROUNDS = 4
+    LOG_LEVEL = 'WARNING'
     SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URI', 'sqlite:///testing.db')
 
 config = {
@@ -0,0 +1,39 @@
+"""one review per user and place, reviews by place index
+
+Revision ID: 0002_review_constraints
+Revises: 0001_baseline
+Create Date: 2026-10-18 02:23:12.104311
+
+uq_reviews_user_place backs the duplicate-review check and the rating
+aggregates (a second review would be counted twice). The upgrade stops if
+a (user_id, place_id) pair already has several reviews: which one to keep
+is a decision for a human, not a migration.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_review_constraints'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM reviews GROUP BY user_id, place_id HAVING COUNT(*) > 1)"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(f"{duplicates} (user_id, place_id) pair(s) have several reviews: "
+                           "keep one review per pair, then upgrade again")
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reviews_place_id'), ['place_id'], unique=False)
+        batch_op.create_unique_constraint('uq_reviews_user_place', ['user_id', 'place_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_reviews_user_place', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_reviews_place_id'))
@@ -0,0 +1,43 @@
+"""per-place rating aggregates
+
+Revision ID: 0003_rating_aggregates
+Revises: 0002_review_constraints
+Create Date: 2026-10-18 02:23:14.877952
+
+review_count, rating_sum and rating_<n>_count on places, filled from the
+existing reviews in the same migration (the same computation as
+`flask rebuild-rating-stats`).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+RATINGS = range(1, 6)
+COLUMNS = ['review_count', 'rating_sum'] + [f'rating_{rating}_count' for rating in RATINGS]
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_rating_aggregates'
+down_revision = '0002_review_constraints'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        for column in COLUMNS:
+            batch_op.add_column(sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+
+    per_place = "(SELECT {} FROM reviews WHERE reviews.place_id = places.id{})"
+    values = {
+        'review_count': per_place.format('COUNT(*)', ''),
+        'rating_sum': per_place.format('COALESCE(SUM(rating), 0)', ''),
+    }
+    for rating in RATINGS:
+        values[f'rating_{rating}_count'] = per_place.format('COUNT(*)', f' AND reviews.rating = {rating}')
+    op.execute("UPDATE places SET " + ', '.join(f'{column} = {value}' for column, value in values.items()))
+
+
+def downgrade():
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column)
@@ -0,0 +1,29 @@
+"""(latitude, longitude) index for radius and bounding-box search
+
+A plain B-tree, not a spatial index: a box query scans the latitude band
+and filters longitude on each index entry.
+
+Revision ID: 0004_place_geo_index
+Revises: 0003_rating_aggregates
+Create Date: 2026-10-18 02:23:16.530874
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_place_geo_index'
+down_revision = '0003_rating_aggregates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        batch_op.create_index('ix_places_lat_lng', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        batch_op.drop_index('ix_places_lat_lng')
@@ -0,0 +1,72 @@
+"""full-text index of places (SQLite FTS5)
+
+Revision ID: 0008_places_fts
+Revises: 0007_place_sort_indexes
+Create Date: 2026-10-18 14:05:42.117093
+
+places_fts is an external-content FTS5 table over places(title,
+description), kept in sync by three triggers, then rebuilt from the rows
+already in places. Autogenerate does not know virtual tables (env.py skips
+places_fts*): the DDL is written by hand and must stay identical to
+app/persistence/search_index.py, which creates the same objects for
+databases built by db.create_all (DB_AUTO_CREATE).
+
+Skipped on other databases, and on a SQLite built without FTS5: search
+then falls back to LIKE on the title.
+"""
+import logging
+from alembic import op
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+CREATE_TABLE = """CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+    title, description, content='places', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)"""
+
+CREATE_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS places_fts_ai AFTER INSERT ON places BEGIN
+    INSERT INTO places_fts(rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_ad AFTER DELETE ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_au AFTER UPDATE OF title, description ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO places_fts(rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END""",
+]
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_places_fts'
+down_revision = '0007_place_sort_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        logger.info("Skipping places_fts: %s has no FTS5", bind.dialect.name)
+        return
+    if not bind.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar():
+        logger.warning("Skipping places_fts: SQLite built without FTS5")
+        return
+    op.execute(CREATE_TABLE)
+    for statement in CREATE_TRIGGERS:
+        op.execute(statement)
+    # Index des places existantes / Index the places already there
+    op.execute("INSERT INTO places_fts(places_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in ('places_fts_au', 'places_fts_ad', 'places_fts_ai'):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS places_fts")
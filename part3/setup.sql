@@ -7,11 +7,13 @@
 -- and inserts initial data (admin and amenities)
 -- ===========================================================================- Suppression des tables existantes (si elles existent) pour un déploiement propre
 -- Drop existing tables (if they exist) for clean deployment
+DROP TABLE IF EXISTS places_fts;
 DROP TABLE IF EXISTS place_amenity_association;
 DROP TABLE IF EXISTS reviews;
 DROP TABLE IF EXISTS places;
 DROP TABLE IF EXISTS amenities;
 DROP TABLE IF EXISTS users;
+DROP TABLE IF EXISTS revoked_tokens;
 
 -- ================================================================================
 -- TABLE: users
@@ -29,6 +31,9 @@ CREATE TABLE users (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Lignes modifiées depuis une date / Rows modified since a date
+CREATE INDEX ix_users_updated_at ON users (updated_at);
+
 -- ================================================================================
 -- TABLE: places
 -- Stocke les informations des lieux/hébergements
@@ -42,11 +47,64 @@ CREATE TABLE places (
     latitude REAL NOT NULL,
     longitude REAL NOT NULL,
     owner_id INTEGER NOT NULL,
+    -- Agrégats des avis maintenus par l'application / Review aggregates maintained by the app
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_1_count INTEGER NOT NULL DEFAULT 0,
+    rating_2_count INTEGER NOT NULL DEFAULT 0,
+    rating_3_count INTEGER NOT NULL DEFAULT 0,
+    rating_4_count INTEGER NOT NULL DEFAULT 0,
+    rating_5_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
+-- Recherche géographique (plage de latitude + filtre de longitude)
+-- Geo search (latitude range + longitude filter)
+CREATE INDEX ix_places_lat_lng ON places (latitude, longitude);
+
+-- Lieux d'un propriétaire / Places of an owner
+CREATE INDEX ix_places_owner_id ON places (owner_id);
+
+-- Tris de la liste (clé, id) ; le préfixe price sert aussi les filtres de prix
+-- List sorts (key, id); the price prefix also serves the price filters
+CREATE INDEX ix_places_price_id ON places (price, id);
+CREATE INDEX ix_places_created_at_id ON places (created_at, id);
+-- Note moyenne (0 sans avis), même expression que app/models/place.py
+-- Average rating (0 without reviews), same expression as app/models/place.py
+CREATE INDEX ix_places_rating_id ON places (
+    CASE WHEN (review_count > 0) THEN CAST(rating_sum AS FLOAT) / (review_count + 0.0) ELSE 0.0 END, id
+);
+
+CREATE INDEX ix_places_updated_at ON places (updated_at);
+
+-- Index plein texte (FTS5, contenu externe) sur le titre et la description,
+-- tenu à jour par triggers
+-- Full-text index (FTS5, external content) on title and description,
+-- kept in sync by triggers
+CREATE VIRTUAL TABLE places_fts USING fts5(
+    title, description, content='places', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER places_fts_ai AFTER INSERT ON places BEGIN
+    INSERT INTO places_fts(rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+
+CREATE TRIGGER places_fts_ad AFTER DELETE ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+
+CREATE TRIGGER places_fts_au AFTER UPDATE OF title, description ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO places_fts(rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+
 -- ================================================================================
 -- TABLE: reviews
 -- Stocke les avis/commentaires sur les lieux
@@ -61,10 +119,18 @@ CREATE TABLE reviews (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
-    UNIQUE (user_id, place_id)  -- Un utilisateur ne peut reviewer un lieu qu'une seule fois
+    FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE
 );
 
+-- Un utilisateur ne peut reviewer un lieu qu'une seule fois
+-- A user can review a place only once (also serves the "already reviewed" lookup)
+CREATE UNIQUE INDEX uq_reviews_user_place ON reviews (user_id, place_id);
+
+-- Liste des avis d'un lieu / Reviews of a place
+CREATE INDEX ix_reviews_place_id ON reviews (place_id);
+
+CREATE INDEX ix_reviews_updated_at ON reviews (updated_at);
+
 -- ================================================================================
 -- TABLE: amenities
 -- Stocke les équipements/commodités disponibles
@@ -77,6 +143,8 @@ CREATE TABLE amenities (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE INDEX ix_amenities_updated_at ON amenities (updated_at);
+
 -- ================================================================================
 -- TABLE: place_amenity_association
 -- Table d'association Many-to-Many entre places et amenities
@@ -90,6 +158,26 @@ CREATE TABLE place_amenity_association (
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
 
+-- Index inverse : lieux d'une amenity (la clé primaire sert les amenities d'un lieu)
+-- Reverse index: places of an amenity (the primary key serves a place's amenities)
+CREATE INDEX ix_place_amenity_amenity_place ON place_amenity_association (amenity_id, place_id);
+
+-- ================================================================================
+-- TABLE: revoked_tokens
+-- JWT révoqués, lus seulement si JWT_BLOCKLIST_PERSIST=1
+-- Revoked JWTs, only read when JWT_BLOCKLIST_PERSIST=1
+-- ================================================================================
+CREATE TABLE revoked_tokens (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jti VARCHAR(36) UNIQUE NOT NULL,
+    token_type VARCHAR(10) NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Purge des jetons expirés / Purge of expired tokens
+CREATE INDEX ix_revoked_tokens_expires_at ON revoked_tokens (expires_at);
+
 -- ================================================================================
 -- DONNÉES INITIALES / INITIAL DATA
 -- ================================================================================
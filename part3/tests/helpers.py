@@ -0,0 +1,111 @@
+"""
+Helpers partagés par les tests d'API.
+Shared helpers for API tests.
+"""
+import unittest
+from contextlib import contextmanager
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from config import TestingConfig
+
+# Hash bcrypt factice : User ne re-hash pas une valeur commençant par '$2'
+# Dummy bcrypt hash: User does not re-hash a value starting with '$2'
+DUMMY_PASSWORD_HASH = "$2b$12$placeholderhashplaceholderhashplaceholderhash"
+
+
+class InMemoryTestConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    # Les tests écrivent souvent directement en base : cache désactivé par défaut
+    CACHE_TYPE = 'null'
+
+
+class CachedConfig(InMemoryTestConfig):
+    """Cache de réponses en mémoire activé / In-memory response cache enabled."""
+    CACHE_TYPE = 'memory'
+
+
+class FakeRedis:
+    """
+    Sous-ensemble du protocole Redis utilisé par les backends de cache et de
+    limitation (redis-py n'est pas requis pour les tests).
+    Subset of the Redis protocol used by the cache and rate-limit backends
+    (redis-py is not needed for the tests).
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def expire(self, key, seconds):
+        pass
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class ApiTestCase(unittest.TestCase):
+    """TestCase avec une application sur une base SQLite en mémoire."""
+
+    config_class = InMemoryTestConfig
+
+    def setUp(self):
+        self.app = self.make_app()
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def make_app(self):
+        return create_app(self.config_class)
+
+    def auth_headers(self, user):
+        """En-tête Authorization avec un JWT émis pour `user`."""
+        token = create_access_token(identity=str(user.id),
+                                    additional_claims={"is_admin": user.is_admin})
+        return {'Authorization': f'Bearer {token}'}
+
+    @contextmanager
+    def assertMaxQueries(self, expected):
+        """
+        Vérifie que le bloc n'exécute pas plus de `expected` requêtes SQL.
+        Assert the block runs at most `expected` SQL statements.
+
+        La session est vidée avant le bloc pour que les lazy loads ne soient
+        pas masqués par les objets créés pendant la préparation du test.
+        The session is emptied first so lazy loads are not hidden by objects
+        created while seeding the test.
+        """
+        statements = []
+        db.session.expunge_all()
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', _record)
+        if len(statements) > expected:
+            self.fail(f"{len(statements)} queries executed, expected at most {expected}:\n"
+                      + "\n".join(statements))
@@ -0,0 +1,58 @@
+import unittest
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from tests.helpers import ApiTestCase, DUMMY_PASSWORD_HASH
+
+
+class TestAuthorizationFastPath(ApiTestCase):
+    """Décisions d'accès depuis le JWT et la colonne owner_id / user_id."""
+
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        guest = User(first_name="Guest", last_name="Two", email="guest@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        admin = User(first_name="Admin", last_name="Root", email="admin@example.com",
+                     password=DUMMY_PASSWORD_HASH, is_admin=True)
+        place = Place(title="Loft", description="", price=50, latitude=0, longitude=0, owner=owner)
+        review = Review(text="Ok", rating=3, place=place, user=guest)
+        db.session.add_all([owner, guest, admin, place, review])
+        db.session.commit()
+        self.owner_id, self.place_id, self.review_id = owner.id, place.id, review.id
+        self.owner, self.guest, self.admin = (self.auth_headers(u) for u in (owner, guest, admin))
+
+    def test_owned_resources_without_relationship_loads(self):
+        with self.assertMaxQueries(1):
+            response = self.client.put(f'/api/v1/places/{self.place_id}', json={'title': "Mine"},
+                                       headers=self.guest)
+        self.assertEqual(response.status_code, 403)
+        # place + UPDATE + relecture, sans lazy load de place.owner
+        with self.assertMaxQueries(5):
+            response = self.client.put(f'/api/v1/places/{self.place_id}', json={'title': "New"},
+                                       headers=self.admin)
+        self.assertEqual(response.status_code, 200)
+        with self.assertMaxQueries(1):
+            response = self.client.delete(f'/api/v1/reviews/{self.review_id}', headers=self.owner)
+        self.assertEqual(response.status_code, 403)
+
+    def test_user_routes_decided_from_the_token(self):
+        with self.assertMaxQueries(0):
+            response = self.client.get(f'/api/v1/users/{self.owner_id}', headers=self.guest)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.get(f'/api/v1/users/{self.owner_id}', headers=self.admin).status_code, 200)
+        self.assertEqual(self.client.get(f'/api/v1/users/0{self.owner_id}', headers=self.owner).status_code, 200)
+
+    def test_owner_cannot_review_own_place(self):
+        payload = {'text': "Great", 'rating': 5, 'place_id': str(self.place_id)}
+        with self.assertMaxQueries(1):
+            response = self.client.post('/api/v1/reviews/', json=payload, headers=self.owner)
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post('/api/v1/reviews/', json=dict(payload, place_id='9999'), headers=self.guest)
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import unittest
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from tests.helpers import ApiTestCase, InMemoryTestConfig, DUMMY_PASSWORD_HASH
+
+
+class SmallChunkConfig(InMemoryTestConfig):
+    BULK_CHUNK_SIZE = 2
+    BULK_MAX_ROWS = 10
+
+
+class TestBulkImport(ApiTestCase):
+    config_class = SmallChunkConfig
+
+    def setUp(self):
+        super().setUp()
+        self.owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                          password=DUMMY_PASSWORD_HASH)
+        self.guest = User(first_name="Guest", last_name="Two", email="guest@example.com",
+                          password=DUMMY_PASSWORD_HASH)
+        self.wifi = Amenity(name="WiFi")
+        db.session.add_all([self.owner, self.guest, self.wifi])
+        db.session.commit()
+
+    def place_row(self, i, **extra):
+        return dict(dict(title=f"Place {i}", description="", price=10.0 * i, latitude=1.0, longitude=2.0), **extra)
+
+    def test_places_bulk_reports_row_errors(self):
+        rows = [self.place_row(1, amenities=[self.wifi.id]),
+                self.place_row(2, price=-5),
+                "not an object",
+                self.place_row(3, amenities=[999]),
+                self.place_row(4)]
+        headers, owner_id, wifi_id = self.auth_headers(self.owner), self.owner.id, self.wifi.id
+        # Requêtes par tranche constantes, indépendantes du nombre de lignes
+        with self.assertMaxQueries(12):
+            response = self.client.post('/api/v1/places/bulk', json=rows, headers=headers)
+        report = response.json
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((report['created'], report['failed']), (2, 3))
+        self.assertEqual([error['index'] for error in report['errors']], [1, 2, 3])
+        self.assertIsNone(report['ids'][1])
+
+        place = db.session.get(Place, report['ids'][0])
+        self.assertEqual([a.id for a in place.amenities], [wifi_id])
+        self.assertEqual(place.owner_id, owner_id)
+        self.assertEqual(Place.query.count(), 2)
+
+    def test_ndjson_body_and_row_limit(self):
+        body = "\n".join(json.dumps({'name': name}) for name in ["Pool", "WiFi", "Pool"]) + "\n{oops\n"
+        response = self.client.post('/api/v1/amenities/bulk', data=body,
+                                    content_type='application/x-ndjson',
+                                    headers=self.auth_headers(self.owner))
+        report = response.json
+        self.assertEqual((report['created'], report['unchanged'], report['failed']), (1, 2, 1))
+        self.assertEqual(report['ids'][1], self.wifi.id)
+        self.assertEqual(report['ids'][0], report['ids'][2])
+
+        response = self.client.post('/api/v1/amenities/bulk', json=[{'name': 'x'}] * 11,
+                                    headers=self.auth_headers(self.owner))
+        self.assertEqual(response.status_code, 400)
+
+    def test_reviews_bulk_upsert_keeps_aggregates(self):
+        places = [Place(title=f"P{i}", description="", price=1, latitude=0, longitude=0, owner=self.owner)
+                  for i in range(3)]
+        db.session.add_all(places)
+        db.session.add(Review(text="Meh", rating=2, place=places[0], user=self.guest))
+        # Agrégats cohérents avec l'avis existant
+        places[0].review_count, places[0].rating_sum, places[0].rating_2_count = 1, 2, 1
+        db.session.commit()
+        ids = [place.id for place in places]
+
+        rows = [{'place_id': ids[0], 'text': "Better now", 'rating': 5},
+                {'place_id': ids[1], 'text': "Good", 'rating': 4},
+                {'place_id': ids[1], 'text': "Twice", 'rating': 1},
+                {'place_id': ids[2], 'text': "", 'rating': 3}]
+        response = self.client.post('/api/v1/reviews/bulk', json=rows,
+                                    headers=self.auth_headers(self.guest))
+        report = response.json
+        self.assertEqual((report['created'], report['updated'], report['failed']), (1, 1, 2))
+
+        db.session.expire_all()
+        first, second = db.session.get(Place, ids[0]), db.session.get(Place, ids[1])
+        self.assertEqual((first.review_count, first.average_rating), (1, 5.0))
+        self.assertEqual(first.rating_histogram['2'], 0)
+        self.assertEqual((second.review_count, second.average_rating), (1, 4.0))
+
+        # Le propriétaire ne peut pas noter ses propres places
+        response = self.client.post('/api/v1/reviews/bulk', json=rows[:1],
+                                    headers=self.auth_headers(self.owner))
+        self.assertEqual(response.json['errors'][0]['error'], "You cannot review your own place")
+
+    def test_reviews_bulk_from_a_deleted_user(self):
+        headers = self.auth_headers(self.guest)
+        db.session.delete(self.guest)
+        db.session.commit()
+        response = self.client.post('/api/v1/reviews/bulk', json=[{'place_id': 1, 'text': "Hi", 'rating': 3}],
+                                    headers=headers)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json['error'], "User not found")
+
+
+if __name__ == '__main__':
+    unittest.main()
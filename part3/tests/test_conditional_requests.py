@@ -0,0 +1,88 @@
+import unittest
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from tests.helpers import ApiTestCase, CachedConfig, DUMMY_PASSWORD_HASH
+
+
+class TestConditionalRequests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                          password=DUMMY_PASSWORD_HASH)
+        self.wifi = Amenity(name="WiFi")
+        self.place = Place(title="Loft", description="", price=50,
+                           latitude=0, longitude=0, owner=self.owner)
+        db.session.add_all([self.owner, self.wifi, self.place])
+        db.session.commit()
+        self.headers = self.auth_headers(self.owner)
+
+    def test_resource_304_on_matching_etag(self):
+        url = f'/api/v1/places/{self.place.id}'
+        response = self.client.get(url)
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        response = self.client.get(url, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_with_amenities(self):
+        url = f'/api/v1/places/{self.place.id}'
+        etag = self.client.get(url).headers['ETag']
+        self.client.put(url, json={'amenities': [self.wifi.id]}, headers=self.headers)
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['amenities'], [self.wifi.id])
+
+    def test_collection_304(self):
+        response = self.client.get('/api/v1/amenities/')
+        etag = response.headers['ETag']
+        self.assertEqual(self.client.get('/api/v1/amenities/', headers={'If-None-Match': etag}).status_code, 304)
+
+        db.session.add(Amenity(name="Pool"))
+        db.session.commit()
+        self.assertEqual(self.client.get('/api/v1/amenities/', headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_collection_has_no_last_modified(self):
+        response = self.client.get('/api/v1/amenities/')
+        self.assertNotIn('Last-Modified', response.headers)
+        # If-Modified-Since seul ne suffit pas à obtenir un 304 périmé
+        # If-Modified-Since alone cannot produce a stale 304
+        since = {'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'}
+        self.assertEqual(self.client.get('/api/v1/amenities/', headers=since).status_code, 200)
+
+    def test_if_match_on_put(self):
+        url = f'/api/v1/places/{self.place.id}'
+        etag = self.client.get(url).headers['ETag']
+
+        response = self.client.put(url, json={'price': 60}, headers=dict(self.headers, **{'If-Match': etag}))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+        # Deuxième écriture avec l'ancien ETag : perdue sinon
+        response = self.client.put(url, json={'price': 70}, headers=dict(self.headers, **{'If-Match': etag}))
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(db.session.get(Place, self.place.id).price, 60)
+
+
+class TestConditionalCachedRequests(ApiTestCase):
+    config_class = CachedConfig
+
+    def test_cache_hit_keeps_validators(self):
+        db.session.add(Amenity(name="WiFi"))
+        db.session.commit()
+        first = self.client.get('/api/v1/amenities/')
+        second = self.client.get('/api/v1/amenities/')
+        self.assertEqual(first.headers['ETag'], second.headers['ETag'])
+        response = self.client.get('/api/v1/amenities/', headers={'If-None-Match': first.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+
+if __name__ == '__main__':
+    unittest.main()
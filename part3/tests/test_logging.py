@@ -0,0 +1,70 @@
+import io
+import json
+import logging
+import unittest
+from app.logging_setup import DebugSampler, shutdown_logging
+from tests.helpers import ApiTestCase, InMemoryTestConfig
+
+
+class JsonDebugConfig(InMemoryTestConfig):
+    LOG_LEVEL = 'DEBUG'
+    LOG_LEVELS = 'tests.quiet=ERROR'
+    LOG_FORMAT = 'json'
+
+
+class TestStructuredLogging(ApiTestCase):
+    config_class = JsonDebugConfig
+
+    def setUp(self):
+        super().setUp()
+        self.output = io.StringIO()
+        self.app.extensions['log_listener'].handlers[0].setStream(self.output)
+        self.addCleanup(logging.getLogger().setLevel, logging.WARNING)
+
+    def records(self):
+        # Arrêter l'écouteur vide la file / Stopping the listener drains the queue
+        shutdown_logging()
+        return [json.loads(line) for line in self.output.getvalue().splitlines()]
+
+    def test_records_are_json_with_request_id(self):
+        logger = logging.getLogger('tests.logging')
+
+        @self.app.route('/log-probe')
+        def probe():
+            logger.info("Probe %s", 42)
+            return 'ok'
+
+        response = self.client.get('/log-probe', headers={'X-Request-ID': 'abc-123'})
+        self.assertEqual(response.headers['X-Request-ID'], 'abc-123')
+        generated = self.client.get('/log-probe', headers={'X-Request-ID': 'bad id!'})
+        self.assertRegex(generated.headers['X-Request-ID'], r'^[0-9a-f]{32}$')
+        logging.getLogger('tests.quiet').warning("Filtered by LOG_LEVELS")
+
+        records = self.records()
+        self.assertNotIn('tests.quiet', [r['logger'] for r in records])
+        probes = [r for r in records if r['logger'] == 'tests.logging']
+        self.assertEqual(probes[0]['message'], "Probe 42")
+        self.assertEqual(probes[0]['request_id'], 'abc-123')
+        self.assertEqual(probes[1]['request_id'], generated.headers['X-Request-ID'])
+
+    def test_passwords_are_not_logged(self):
+        self.client.post('/api/v1/users/', json={
+            'first_name': "Ada", 'last_name': "L", 'email': "ada@example.com", 'password': "hunter2-secret"})
+        records = self.records()
+        self.assertTrue(any(r['logger'] == 'app.services.facade' for r in records))
+        self.assertNotIn("hunter2-secret", self.output.getvalue())
+
+
+class TestDebugSampler(unittest.TestCase):
+
+    def test_only_debug_records_are_sampled(self):
+        sampler = DebugSampler(0.0)
+        debug = logging.LogRecord('x', logging.DEBUG, __file__, 1, "m", None, None)
+        info = logging.LogRecord('x', logging.INFO, __file__, 1, "m", None, None)
+        self.assertFalse(sampler.filter(debug))
+        self.assertTrue(sampler.filter(info))
+        self.assertTrue(DebugSampler(1.0).filter(debug))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+from app.api.v1 import facade
+from app.extensions import db, limiter
+from app.models.user import User
+from app.ratelimit import RedisRateLimitBackend
+from tests.helpers import ApiTestCase, FakeRedis, InMemoryTestConfig
+
+
+class TightLimitsConfig(InMemoryTestConfig):
+    RATELIMIT_LOGIN_IP = (5, 60)
+    RATELIMIT_LOGIN_EMAIL = (3, 60)
+
+
+class TestLoginRateLimit(ApiTestCase):
+    config_class = TightLimitsConfig
+
+    def setUp(self):
+        super().setUp()
+        self.now = 960.0
+        patcher = mock.patch.object(type(limiter), 'clock', staticmethod(lambda: self.now))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        db.session.add(User(first_name="Ada", last_name="L", email="ada@example.com", password="secret123"))
+        db.session.commit()
+
+    def login(self, email="ada@example.com", password="wrong"):
+        return self.client.post('/api/v1/auth/login', json={'email': email, 'password': password})
+
+    def test_email_limit_answers_429_before_any_bcrypt_work(self):
+        for _ in range(3):
+            self.assertEqual(self.login().status_code, 401)
+        with mock.patch.object(facade, 'authenticate') as authenticate:
+            response = self.login("ADA@example.com ")
+        authenticate.assert_not_called()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '60')
+        # Une autre adresse reste permise jusqu'à la limite par IP
+        self.assertEqual(self.login("bob@example.com").status_code, 401)
+        self.assertEqual(self.login("eve@example.com").status_code, 429)
+
+    def test_sliding_window_and_reset_on_success(self):
+        self.app.config['RATELIMIT_LOGIN_IP'] = (100, 60)
+        for _ in range(2):
+            self.login()
+        self.assertEqual(self.login(password="secret123").status_code, 200)
+        self.assertEqual(self.login().status_code, 401)
+
+        # 3 échecs en fin de fenêtre : ils pèsent encore au début de la suivante
+        self.now = 960.0 + 60
+        for _ in range(2):
+            self.login()
+        self.now += 30
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.now += int(response.headers['Retry-After'])
+        self.assertEqual(self.login().status_code, 401)
+
+    def test_redis_protocol_backend(self):
+        client = FakeRedis()
+        limiter.init_app(self.app, RedisRateLimitBackend(client))
+        for _ in range(3):
+            self.assertEqual(limiter.hit('login_email', 'ada'), 0)
+        self.assertGreater(limiter.hit('login_email', 'ada'), 0)
+        limiter.reset('login_email', 'ada')
+        self.assertEqual(limiter.hit('login_email', 'ada'), 0)
+        self.assertEqual(client.data, {'hbnb:ratelimit:login_email:ada:16': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from app.extensions import db
+from app.metrics import MetricsRegistry, MultiProcessStore, merge, render
+from app.models.amenity import Amenity
+from tests.helpers import ApiTestCase, CachedConfig
+
+
+class TestMetricsEndpoint(ApiTestCase):
+    config_class = CachedConfig
+
+    def sample(self, text, prefix):
+        for line in text.splitlines():
+            if line.startswith(prefix):
+                return float(line.rsplit(' ', 1)[1])
+        return 0.0
+
+    def test_route_latency_status_and_cache(self):
+        db.session.add(Amenity(name="WiFi"))
+        db.session.commit()
+        before = self.client.get('/metrics').get_data(as_text=True)
+        self.client.get('/api/v1/amenities/1')
+        self.client.get('/api/v1/amenities/1')
+        self.client.get('/api/v1/amenities/999')
+        response = self.client.get('/metrics')
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+
+        route = 'method="GET",namespace="amenities",route="/api/v1/amenities/<amenity_id>"'
+        ok = f'hbnb_http_requests_total{{{route},status="200"}}'
+        self.assertEqual(self.sample(text, ok) - self.sample(before, ok), 2)
+        self.assertIn(f'hbnb_http_requests_total{{{route},status="404"}}', text)
+        self.assertIn(f'hbnb_http_request_duration_seconds_bucket{{{route},le="+Inf"}}', text)
+        self.assertIn('# TYPE hbnb_http_request_duration_seconds histogram', text)
+        hits = 'hbnb_cache_requests_total{result="hit"}'
+        self.assertEqual(self.sample(text, hits) - self.sample(before, hits), 1)
+        self.assertIn('hbnb_password_hash_in_flight 0', text)
+        self.assertIn('hbnb_db_pool_checkouts_total{engine="primary"}', text)
+
+
+class TestMultiProcessMetrics(unittest.TestCase):
+
+    def test_files_of_all_workers_are_added_up(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = MultiProcessStore(directory)
+            worker = MetricsRegistry()
+            worker.inc('hbnb_http_requests_total', route='/a', status='200')
+            worker.add('hbnb_http_requests_in_flight', 1)
+            worker.observe('hbnb_http_request_duration_seconds', 0.02, route='/a')
+            store.flush(worker)
+            # Un worker arrêté : ses compteurs restent, ses jauges non
+            # A stopped worker: its counters stay, its gauges do not
+            os.replace(os.path.join(directory, f'metrics-{os.getpid()}.json'),
+                       os.path.join(directory, 'metrics-999999999.json'))
+            store.flush(worker)
+
+            text = render(merge(store.read_all()))
+        self.assertIn('hbnb_http_requests_total{route="/a",status="200"} 2', text)
+        self.assertIn('hbnb_http_requests_in_flight 1', text)
+        self.assertIn('hbnb_http_request_duration_seconds_bucket{route="/a",le="0.01"} 0', text)
+        self.assertIn('hbnb_http_request_duration_seconds_bucket{route="/a",le="0.025"} 2', text)
+        self.assertIn('hbnb_http_request_duration_seconds_count{route="/a"} 2', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
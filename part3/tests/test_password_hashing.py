@@ -0,0 +1,64 @@
+import threading
+import unittest
+from app.extensions import db
+from app.hashing import password_hasher
+from app.models.user import User
+from tests.helpers import ApiTestCase, InMemoryTestConfig
+
+
+class TinyPoolConfig(InMemoryTestConfig):
+    PASSWORD_HASH_WORKERS = 1
+    PASSWORD_HASH_QUEUE_SIZE = 0
+
+
+class TestPasswordHashing(ApiTestCase):
+    config_class = TinyPoolConfig
+
+    def login(self, password="secret123"):
+        return self.client.post('/api/v1/auth/login', json={'email': "ada@example.com", 'password': password})
+
+    def test_hash_runs_in_pool_with_configured_cost(self):
+        user = User(first_name="Ada", last_name="L", email="ada@example.com", password="secret123")
+        self.assertTrue(user.password.startswith('$2b$04$'))
+        self.assertTrue(user.verify_password("secret123"))
+        stats = password_hasher.stats()
+        self.assertEqual((stats['completed'], stats['in_flight'], stats['capacity']), (2, 0, 1))
+
+    def test_login_rehashes_a_hash_of_another_cost(self):
+        # Hash créé avec un ancien coût
+        self.app.config['BCRYPT_LOG_ROUNDS'] = 5
+        db.session.add(User(first_name="Ada", last_name="L", email="ada@example.com", password="secret123"))
+        db.session.commit()
+        self.app.config['BCRYPT_LOG_ROUNDS'] = 4
+
+        self.assertEqual(self.login("wrong").status_code, 401)
+        self.assertTrue(User.query.one().password.startswith('$2b$05$'))
+        self.assertEqual(self.login().status_code, 200)
+        db.session.expire_all()
+        self.assertTrue(User.query.one().password.startswith('$2b$04$'))
+
+    def test_saturated_pool_answers_503(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash(*args):
+            started.set()
+            release.wait(5)
+            return b'$2b$04$' + b'x' * 53
+
+        # Un hachage lent occupe l'unique place du pool
+        worker = threading.Thread(target=self.app.extensions['password_hasher'].run, args=(slow_hash,))
+        worker.start()
+        started.wait(5)
+        try:
+            response = self.client.post('/api/v1/users/', json={
+                'first_name': "Ada", 'last_name': "L", 'email': "ada@example.com", 'password': "secret123"})
+        finally:
+            release.set()
+            worker.join()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+        self.assertEqual(password_hasher.stats()['rejected'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
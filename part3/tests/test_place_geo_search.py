@@ -0,0 +1,72 @@
+import unittest
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.services.geo import haversine_km, parse_bbox, radius_bounding_box
+from tests.helpers import ApiTestCase, DUMMY_PASSWORD_HASH
+
+# (title, latitude, longitude)
+CITIES = [
+    ("Paris", 48.8566, 2.3522),
+    ("Versailles", 48.8049, 2.1204),
+    ("Lyon", 45.7640, 4.8357),
+    ("Suva", -18.1248, 178.4501),
+    ("Apia", -13.8507, -171.7514),
+]
+
+
+class TestGeoHelpers(unittest.TestCase):
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine_km(48.8566, 2.3522, 45.7640, 4.8357), 392, delta=2)
+
+    def test_radius_box_wraps_antimeridian(self):
+        _, lng_ranges = radius_bounding_box(-16, 179.5, 200)
+        self.assertEqual(len(lng_ranges), 2)
+
+    def test_parse_bbox(self):
+        with self.assertRaises(ValueError):
+            parse_bbox("1,2,3")
+        with self.assertRaises(ValueError):
+            parse_bbox("0,50,1,40")
+
+
+class TestPlaceGeoSearch(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        db.session.add(owner)
+        db.session.add_all([Place(title=title, description="", price=10, latitude=lat,
+                                  longitude=lng, owner=owner) for title, lat, lng in CITIES])
+        db.session.commit()
+
+    def titles(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [p['title'] for p in response.json]
+
+    def test_radius_ordered_by_distance(self):
+        response = self.client.get('/api/v1/places/search?lat=48.80&lng=2.13&radius_km=50')
+        self.assertEqual(self.titles(response), ["Versailles", "Paris"])
+        self.assertLess(response.json[0]['distance_km'], response.json[1]['distance_km'])
+
+        response = self.client.get('/api/v1/places/search?lat=48.80&lng=2.13&radius_km=500&limit=1')
+        self.assertEqual(self.titles(response), ["Versailles"])
+
+    def test_radius_across_antimeridian(self):
+        response = self.client.get('/api/v1/places/search?lat=-16&lng=179.9&radius_km=1500')
+        self.assertEqual(self.titles(response), ["Suva", "Apia"])
+
+    def test_bbox(self):
+        response = self.client.get('/api/v1/places/search?bbox=-5,40,10,50')
+        self.assertEqual(sorted(self.titles(response)), ["Lyon", "Paris", "Versailles"])
+        response = self.client.get('/api/v1/places/search?bbox=170,-20,-170,-10')
+        self.assertEqual(sorted(self.titles(response)), ["Apia", "Suva"])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/v1/places/search?lat=1').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/search?lat=95&lng=0&radius_km=1').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/search?bbox=a,b,c,d').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
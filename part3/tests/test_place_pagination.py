@@ -0,0 +1,61 @@
+import unittest
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from tests.helpers import ApiTestCase, DUMMY_PASSWORD_HASH
+
+
+class TestPlacePagination(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="John", last_name="Doe", email="john.doe@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        other = User(first_name="Jane", last_name="Roe", email="jane.roe@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        wifi = Amenity(name="WiFi")
+        db.session.add_all([owner, other, wifi])
+        db.session.flush()
+        for i in range(5):
+            place = Place(title=f"Place {i}", description=None, price=10 * (i + 1),
+                          latitude=0, longitude=0, owner=owner if i % 2 == 0 else other)
+            if i < 3:
+                place.add_amenity(wifi)
+            db.session.add(place)
+        db.session.commit()
+        self.owner_id = owner.id
+        self.wifi_id = wifi.id
+
+    def test_pages_follow_cursor(self):
+        response = self.client.get('/api/v1/places/?limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['title'] for p in response.json], ["Place 0", "Place 1"])
+        cursor = response.headers['X-Next-Cursor']
+        self.assertIn('rel="next"', response.headers['Link'])
+
+        seen = [p['id'] for p in response.json]
+        while cursor:
+            response = self.client.get(f'/api/v1/places/?limit=2&after={cursor}')
+            seen += [p['id'] for p in response.json]
+            cursor = response.headers.get('X-Next-Cursor')
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(seen, sorted(seen))
+
+    def test_filters(self):
+        response = self.client.get('/api/v1/places/?min_price=20&max_price=40')
+        self.assertEqual([p['price'] for p in response.json], [20.0, 30.0, 40.0])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+        response = self.client.get(f'/api/v1/places/?owner_id={self.owner_id}')
+        self.assertEqual([p['title'] for p in response.json], ["Place 0", "Place 2", "Place 4"])
+
+        response = self.client.get(f'/api/v1/places/?amenity={self.wifi_id}&owner_id={self.owner_id}')
+        self.assertEqual([p['title'] for p in response.json], ["Place 0", "Place 2"])
+
+    def test_invalid_limit(self):
+        self.assertEqual(self.client.get('/api/v1/places/?limit=0').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/?limit=abc').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
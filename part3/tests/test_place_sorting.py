@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from tests.helpers import ApiTestCase, DUMMY_PASSWORD_HASH
+
+# (title, price, ratings, latitude, longitude)
+PLACES = [
+    ("Paris", 120, [5, 4], 48.8566, 2.3522),
+    ("Versailles", 80, [3], 48.8049, 2.1204),
+    ("Lyon", 80, [], 45.7640, 4.8357),
+    ("Marseille", 60, [5], 43.2965, 5.3698),
+    ("Lille", 150, [2, 2, 5], 50.6292, 3.0573),
+]
+
+
+class TestPlaceSorting(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        db.session.add(owner)
+        start = datetime(2024, 1, 1)
+        for day, (title, price, ratings, lat, lng) in enumerate(PLACES):
+            place = Place(title=title, description="", price=price, latitude=lat, longitude=lng, owner=owner)
+            place.created_at = start + timedelta(days=day)
+            place.review_count, place.rating_sum = len(ratings), sum(ratings)
+            db.session.add(place)
+        db.session.commit()
+
+    def walk(self, query, limit=2):
+        """Titres de toutes les pages, en suivant X-Next-Cursor / Titles of every page."""
+        titles, cursor = [], None
+        while True:
+            url = f'/api/v1/places/?limit={limit}&{query}' + (f'&after={cursor}' if cursor else '')
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.json)
+            titles += [p['title'] for p in response.json]
+            cursor = response.headers.get('X-Next-Cursor')
+            if cursor is None:
+                return titles
+
+    def test_sorts_paginate_in_key_then_id_order(self):
+        # Égalités de prix (Versailles, Lyon) départagées par l'id
+        self.assertEqual(self.walk('sort=price'), ["Marseille", "Versailles", "Lyon", "Paris", "Lille"])
+        self.assertEqual(self.walk('sort=-price'), ["Lille", "Paris", "Lyon", "Versailles", "Marseille"])
+        # Moyennes 4.5, 3, 0 (sans avis), 5, 3 ; en décroissant, l'id aussi décroît
+        self.assertEqual(self.walk('sort=-rating'), ["Marseille", "Paris", "Lille", "Versailles", "Lyon"])
+        self.assertEqual(self.walk('sort=-created_at', limit=3),
+                         ["Lille", "Marseille", "Lyon", "Versailles", "Paris"])
+        self.assertEqual(self.walk('sort=price&max_price=100'), ["Marseille", "Versailles", "Lyon"])
+
+    def test_sorted_pages_seek_the_index(self):
+        cursor = self.client.get('/api/v1/places/?limit=2&sort=-rating').headers['X-Next-Cursor']
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().startswith('SELECT') and 'places' in statement:
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            self.client.get(f'/api/v1/places/?limit=2&sort=-rating&after={cursor}')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        statement, parameters = statements[0]
+        with db.engine.connect() as connection:
+            plan = [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+        self.assertTrue(plan[0].startswith('SEARCH places USING INDEX ix_places_rating_id'), plan)
+        self.assertFalse(any('TEMP B-TREE' in step for step in plan), plan)
+
+    def test_distance_sort(self):
+        self.assertEqual(self.walk('sort=distance&lat=48.80&lng=2.13'),
+                         ["Versailles", "Paris", "Lille", "Lyon", "Marseille"])
+        response = self.client.get('/api/v1/places/?sort=distance&lat=48.80&lng=2.13&radius_km=50')
+        self.assertEqual([p['title'] for p in response.json], ["Versailles", "Paris"])
+        self.assertLess(response.json[0]['distance_km'], response.json[1]['distance_km'])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/v1/places/?sort=title').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/?sort=distance&lat=48.8').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/?sort=price&after=garbage').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/?after=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/?sort=price&stream=1').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from sqlalchemy import event
+from app.commands import rebuild_search_index_command
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.search_index import to_match_query
+from tests.helpers import ApiTestCase, DUMMY_PASSWORD_HASH
+
+
+class TestPlaceTextSearch(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        db.session.add(owner)
+        self.places = [
+            Place(title="Seaside villa", description="Quiet house by the beach",
+                  price=200, latitude=0, longitude=0, owner=owner),
+            Place(title="City loft", description="Walk to the beach in ten minutes",
+                  price=90, latitude=0, longitude=0, owner=owner),
+            Place(title="Mountain chalet", description="Ski in, ski out",
+                  price=150, latitude=0, longitude=0, owner=owner),
+        ]
+        db.session.add_all(self.places)
+        db.session.commit()
+
+    def search(self, query):
+        response = self.client.get(f'/api/v1/places/search?q={query}')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_ranking_and_snippet(self):
+        response = self.search('beach')
+        self.assertEqual([p['title'] for p in response.json], ["Seaside villa", "City loft"])
+        self.assertIn('<mark>beach</mark>', response.json[0]['snippet'])
+
+        # Un mot du titre l'emporte sur la description
+        self.db_place(1).title = "Beach loft"
+        db.session.commit()
+        self.assertEqual(self.search('beach').json[0]['title'], "Beach loft")
+
+    def test_index_follows_writes(self):
+        self.assertEqual(self.search('chalet').json[0]['title'], "Mountain chalet")
+        db.session.delete(self.db_place(2))
+        db.session.commit()
+        self.assertEqual(self.search('chalet').json, [])
+
+    def test_pagination_and_prefix(self):
+        response = self.client.get('/api/v1/places/search?q=bea&limit=1')
+        self.assertEqual(len(response.json), 1)
+        self.assertEqual(response.headers['X-Next-Cursor'], '1')
+        response = self.client.get('/api/v1/places/search?q=bea&limit=1&offset=1')
+        self.assertEqual(response.json[0]['title'], "City loft")
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_user_input_is_escaped(self):
+        self.assertEqual(to_match_query('"beach" OR'), '"beach"* "OR"*')
+        self.assertEqual(self.search('"').json, [])
+
+    def test_rebuild_command(self):
+        result = self.app.test_cli_runner().invoke(rebuild_search_index_command)
+        self.assertIn("3 place(s) indexed", result.output)
+        self.assertEqual(len(self.search('beach').json), 2)
+
+    def test_availability_is_not_queried_per_search(self):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            self.search('beach')
+            self.search('ski')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertFalse([s for s in statements if 'sqlite_master' in s], statements)
+
+    def db_place(self, index):
+        return db.session.get(Place, self.places[index].id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.models.review import Review
+from tests.helpers import ApiTestCase, DUMMY_PASSWORD_HASH
+
+
+class TestListQueryCounts(ApiTestCase):
+    """Le nombre de requêtes des listes ne dépend pas du nombre de lignes."""
+
+    ROWS = 20
+
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        amenities = [Amenity(name=f"Amenity {i}") for i in range(3)]
+        db.session.add(owner)
+        db.session.add_all(amenities)
+        places = []
+        for i in range(self.ROWS):
+            place = Place(title=f"Place {i}", description="", price=i,
+                          latitude=0, longitude=0, owner=owner)
+            for amenity in amenities:
+                place.add_amenity(amenity)
+            places.append(place)
+        db.session.add_all(places)
+        for i in range(self.ROWS):
+            reviewer = User(first_name=f"User{i}", last_name="Reviewer",
+                            email=f"user{i}@example.com", password=DUMMY_PASSWORD_HASH)
+            db.session.add(Review(text="Nice", rating=4, place=places[0], user=reviewer))
+        db.session.commit()
+        self.place_id = places[0].id
+
+    def test_list_places(self):
+        # page de places + amenities (IN)
+        with self.assertMaxQueries(2):
+            response = self.client.get('/api/v1/places/')
+        self.assertEqual(len(response.json), self.ROWS)
+        self.assertEqual(len(response.json[0]['amenities']), 3)
+
+    def test_list_reviews(self):
+        with self.assertMaxQueries(1):
+            response = self.client.get('/api/v1/reviews/')
+        self.assertEqual(len(response.json), self.ROWS)
+
+    def test_list_reviews_by_place(self):
+        # place + reviews jointes à leur auteur
+        with self.assertMaxQueries(2):
+            response = self.client.get(f'/api/v1/reviews/places/{self.place_id}/reviews')
+        self.assertEqual(len(response.json), self.ROWS)
+        self.assertEqual(response.json[0]['user_name'], "User0 Reviewer")
+
+    def test_reviews_by_place_pages(self):
+        url = f'/api/v1/reviews/places/{self.place_id}/reviews?limit=8'
+        seen = []
+        while url:
+            with self.assertMaxQueries(2):
+                response = self.client.get(url)
+            self.assertLessEqual(len(response.json), 8)
+            seen += [r['id'] for r in response.json]
+            cursor = response.headers.get('X-Next-Cursor')
+            url = f'/api/v1/reviews/places/{self.place_id}/reviews?limit=8&after={cursor}' if cursor else None
+        self.assertEqual(len(seen), self.ROWS)
+        self.assertEqual(len(set(seen)), self.ROWS)
+
+    def test_reviews_of_unknown_place(self):
+        response = self.client.get('/api/v1/reviews/places/9999/reviews')
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from app.commands import rebuild_rating_stats_command
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from tests.helpers import ApiTestCase, DUMMY_PASSWORD_HASH
+
+
+class TestRatingStats(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        self.reviewers = [User(first_name=f"User{i}", last_name="Reviewer",
+                               email=f"user{i}@example.com", password=DUMMY_PASSWORD_HASH)
+                          for i in range(3)]
+        self.place = Place(title="Loft", description="", price=50,
+                           latitude=0, longitude=0, owner=owner)
+        db.session.add_all([owner, self.place] + self.reviewers)
+        db.session.commit()
+        self.place_id = self.place.id
+
+    def post_review(self, reviewer, rating):
+        response = self.client.post('/api/v1/reviews/', headers=self.auth_headers(reviewer),
+                                    json={'text': 'Nice', 'rating': rating, 'place_id': str(self.place_id)})
+        self.assertEqual(response.status_code, 201)
+        return response.json['id']
+
+    def place_payload(self):
+        return self.client.get(f'/api/v1/places/{self.place_id}').json
+
+    def test_stats_follow_review_writes(self):
+        first = self.post_review(self.reviewers[0], 5)
+        self.post_review(self.reviewers[1], 3)
+        payload = self.place_payload()
+        self.assertEqual(payload['review_count'], 2)
+        self.assertEqual(payload['average_rating'], 4.0)
+        self.assertEqual(payload['rating_histogram'], {'1': 0, '2': 0, '3': 1, '4': 0, '5': 1})
+
+        headers = self.auth_headers(self.reviewers[0])
+        self.client.put(f'/api/v1/reviews/{first}', json={'rating': 1}, headers=headers)
+        payload = self.place_payload()
+        self.assertEqual(payload['average_rating'], 2.0)
+        self.assertEqual(payload['rating_histogram']['5'], 0)
+        self.assertEqual(payload['rating_histogram']['1'], 1)
+
+        self.client.delete(f'/api/v1/reviews/{first}', headers=headers)
+        payload = self.place_payload()
+        self.assertEqual(payload['review_count'], 1)
+        self.assertEqual(payload['average_rating'], 3.0)
+
+        listed = self.client.get('/api/v1/places/').json[0]
+        self.assertEqual(listed['review_count'], 1)
+
+    def test_non_integer_ratings_are_rejected(self):
+        first = self.post_review(self.reviewers[0], 5)
+        headers = self.auth_headers(self.reviewers[0])
+        for rating in (4.5, True, "4", 0, 6):
+            response = self.client.put(f'/api/v1/reviews/{first}', json={'rating': rating}, headers=headers)
+            self.assertEqual(response.status_code, 400, rating)
+        response = self.client.post('/api/v1/reviews/', headers=self.auth_headers(self.reviewers[1]),
+                                    json={'text': 'Nice', 'rating': True, 'place_id': str(self.place_id)})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.place_payload()['rating_histogram'], {'1': 0, '2': 0, '3': 0, '4': 0, '5': 1})
+
+    def test_review_cannot_move_to_another_place(self):
+        other = Place(title="Cabin", description="", price=80, latitude=0, longitude=0,
+                      owner=self.reviewers[0])
+        db.session.add(other)
+        db.session.commit()
+        other_id = other.id
+        first = self.post_review(self.reviewers[0], 5)
+
+        response = self.client.put(f'/api/v1/reviews/{first}', headers=self.auth_headers(self.reviewers[0]),
+                                   json={'place_id': other_id, 'user_id': self.reviewers[1].id, 'rating': 2})
+        self.assertEqual(response.status_code, 200)
+        payload = self.place_payload()
+        self.assertEqual(payload['review_count'], 1)
+        self.assertEqual(payload['rating_histogram'], {'1': 0, '2': 1, '3': 0, '4': 0, '5': 0})
+        other_payload = self.client.get(f'/api/v1/places/{other_id}').json
+        self.assertEqual(other_payload['review_count'], 0)
+        self.assertEqual(self.client.get(f'/api/v1/reviews/places/{other_id}/reviews').json, [])
+
+    def test_rebuild_repairs_drift(self):
+        self.post_review(self.reviewers[0], 4)
+        place = db.session.get(Place, self.place_id)
+        place.review_count = 7
+        place.rating_4_count = 0
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(rebuild_rating_stats_command)
+        self.assertIn("1 place(s) repaired", result.output)
+        payload = self.place_payload()
+        self.assertEqual(payload['review_count'], 1)
+        self.assertEqual(payload['rating_histogram']['4'], 1)
+
+        result = self.app.test_cli_runner().invoke(rebuild_rating_stats_command)
+        self.assertIn("0 place(s) repaired", result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
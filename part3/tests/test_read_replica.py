@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+from app.api.v1 import facade
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence import routing
+from app.persistence.unit_of_work import unit_of_work
+from tests.helpers import ApiTestCase, InMemoryTestConfig, DUMMY_PASSWORD_HASH
+
+
+class TestReadReplicaRouting(ApiTestCase):
+    """Primaire et réplique sur deux fichiers SQLite distincts."""
+
+    def setUp(self):
+        handle, self.primary_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        handle, self.replica_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        # La réplique a son propre contenu : on voit ainsi où part chaque lecture
+        replica = create_engine(f'sqlite:///{self.replica_path}')
+        db.metadata.create_all(replica)
+        with replica.begin() as connection:
+            connection.execute(insert(Amenity.__table__).values(id=1, name="From replica"))
+        replica.dispose()
+
+        class ReplicaConfig(InMemoryTestConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{self.primary_path}'
+            SQLALCHEMY_REPLICA_URI = f'sqlite:///{self.replica_path}'
+            DB_POOL_SIZE = 3
+            DB_POOL_PRE_PING = True
+
+        self.config_class = ReplicaConfig
+        super().setUp()
+        db.session.add(Amenity(name="From primary"))
+        db.session.commit()
+        db.session.remove()
+
+    def tearDown(self):
+        engines = list(db.engines.values())
+        super().tearDown()
+        for engine in engines:
+            engine.dispose()
+        # db est global : la métadonnée du bind ne doit pas fuir vers les autres tests
+        db.metadatas.pop(routing.REPLICA, None)
+        os.remove(self.primary_path)
+        os.remove(self.replica_path)
+
+    def test_facade_reads_go_to_the_replica(self):
+        self.assertEqual(facade.get_amenity(1).name, "From replica")
+        response = self.client.get('/api/v1/amenities/1')
+        self.assertEqual(response.json['name'], "From replica")
+        # Hors get_* (ici une requête directe), la primaire répond
+        db.session.remove()
+        self.assertEqual(Amenity.query.get(1).name, "From primary")
+
+    def test_read_your_writes_after_a_write(self):
+        with self.app.test_request_context():
+            facade.update_amenity(1, {'name': "Renamed"})
+            db.session.expire_all()
+            self.assertEqual(facade.get_amenity(1).name, "Renamed")
+        db.session.remove()
+        # Nouvelle requête : la réplique (pas encore répliquée) est relue
+        with self.app.test_request_context():
+            routing.reset(db.session)
+            self.assertEqual(facade.get_amenity(1).name, "From replica")
+
+    def test_replica_loaded_instances_are_expired_before_a_write(self):
+        with self.app.test_request_context():
+            amenity = facade.get_amenity(1)
+            self.assertEqual(amenity.name, "From replica")
+            with unit_of_work():
+                # Même instance, relue sur la primaire / Same instance, re-read from the primary
+                self.assertEqual(amenity.name, "From primary")
+
+    def test_place_owner_is_read_on_the_primary(self):
+        owner = User(first_name="Ada", last_name="Owner", email="owner@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        place = Place(title="Loft", description="", price=50, latitude=0, longitude=0, owner=owner)
+        db.session.add_all([owner, place])
+        db.session.commit()
+        owner_id, place_id = owner.id, place.id
+        db.session.remove()
+        # Même appelée depuis une lecture de réplique (où la place n'existe pas encore)
+        # Even when called from a replica read (where the place does not exist yet)
+        with self.app.test_request_context(), routing.reading_from_replica():
+            self.assertEqual(facade.get_place_owner_id(place_id), owner_id)
+
+    def test_review_update_reads_the_primary_despite_a_lagging_replica(self):
+        author = User(first_name="Ada", last_name="Author", email="ada@example.com",
+                      password=DUMMY_PASSWORD_HASH)
+        place = Place(title="Loft", description="", price=50, latitude=0, longitude=0, owner=author)
+        place.review_count, place.rating_sum, place.rating_5_count = 1, 5, 1
+        db.session.add_all([author, place, Review(text="Great", rating=5, place=place, user=author)])
+        db.session.commit()
+        headers, place_id = self.auth_headers(author), place.id
+        # Réplique en retard : l'avis y vaut encore 3 / Lagging replica: the review is still 3 there
+        replica = create_engine(f'sqlite:///{self.replica_path}')
+        with replica.begin() as connection:
+            for table in (User.__table__, Place.__table__, Review.__table__):
+                rows = db.session.execute(select(table)).mappings().all()
+                connection.execute(insert(table), [dict(row) for row in rows])
+            connection.execute(Review.__table__.update().values(rating=3))
+            connection.execute(Place.__table__.update().values(rating_sum=3, rating_3_count=1,
+                                                               rating_5_count=0))
+        replica.dispose()
+        db.session.remove()
+
+        response = self.client.put('/api/v1/reviews/1', headers=headers, json={'rating': 4})
+        self.assertEqual(response.status_code, 200)
+        db.session.remove()
+        place = Place.query.get(place_id)
+        self.assertEqual((place.review_count, place.rating_sum), (1, 4))
+        self.assertEqual([place.rating_3_count, place.rating_4_count, place.rating_5_count], [0, 1, 0])
+
+    def test_replica_is_read_only_and_pool_configured(self):
+        with self.assertRaises(OperationalError):
+            with db.engines[routing.REPLICA].begin() as connection:
+                connection.execute(insert(Amenity.__table__).values(name="Oops"))
+        self.assertEqual(db.engine.pool.size(), 3)
+        self.assertTrue(db.engine.pool._pre_ping)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from app.cache import MemoryCacheBackend, RedisCacheBackend
+from app.extensions import cache, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from tests.helpers import ApiTestCase, CachedConfig, FakeRedis, DUMMY_PASSWORD_HASH
+
+
+class TestMemoryBackend(unittest.TestCase):
+    def test_lru_eviction_and_ttl(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set('a', 1, {}, ttl=60)
+        backend.set('b', 2, {}, ttl=60)
+        backend.get('a')
+        backend.set('c', 3, {}, ttl=60)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('a')[0], 1)
+        backend.set('d', 4, {}, ttl=-1)
+        self.assertIsNone(backend.get('d'))
+
+    def test_tag_versions_are_bounded(self):
+        backend = MemoryCacheBackend(max_tags=2)
+        kept = backend.tag_versions(['place:1'])
+        backend.set('a', 1, kept, ttl=60)
+        stale = backend.tag_versions(['place:2'])
+        backend.set('b', 2, stale, ttl=60)
+        backend.bump(['place:2'])
+        backend.bump([f'place:{i}' for i in range(3, 10)])
+        self.assertEqual(len(backend._tag_versions), 2)
+        # place:2 évincé après son invalidation : l'entrée reste périmée
+        # place:2 evicted after its invalidation: the entry stays stale
+        self.assertNotEqual(backend.tag_versions(['place:2']), backend.get('b')[1])
+        backend.bump(['place:1'])
+        self.assertNotEqual(backend.tag_versions(['place:1']), backend.get('a')[1])
+
+
+class TestResponseCache(ApiTestCase):
+    config_class = CachedConfig
+
+    def setUp(self):
+        super().setUp()
+        self.owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                          password=DUMMY_PASSWORD_HASH)
+        self.place = Place(title="Loft", description="", price=50,
+                           latitude=0, longitude=0, owner=self.owner)
+        db.session.add_all([self.owner, self.place, Amenity(name="WiFi")])
+        db.session.commit()
+        self.headers = self.auth_headers(self.owner)
+
+    def test_reads_are_served_from_cache(self):
+        self.client.get('/api/v1/places/')
+        with self.assertMaxQueries(0):
+            response = self.client.get('/api/v1/places/')
+        self.assertEqual(response.json[0]['title'], "Loft")
+
+    def test_writes_invalidate_collection_and_detail(self):
+        place_id = self.place.id
+        self.client.get('/api/v1/places/')
+        self.client.get(f'/api/v1/places/{place_id}')
+        response = self.client.put(f'/api/v1/places/{place_id}', json={'title': "Renamed"},
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/v1/places/').json[0]['title'], "Renamed")
+        self.assertEqual(self.client.get(f'/api/v1/places/{place_id}').json['title'], "Renamed")
+        self.assertEqual(self.client.get(f'/api/v1/places/0{place_id}').json['title'], "Renamed")
+
+    def test_amenity_invalidation(self):
+        self.client.get('/api/v1/amenities/')
+        self.client.post('/api/v1/amenities/', json={'name': "Pool"}, headers=self.headers)
+        names = [a['name'] for a in self.client.get('/api/v1/amenities/').json]
+        self.assertEqual(names, ["WiFi", "Pool"])
+
+    def test_review_invalidates_place_reviews(self):
+        reviewer = User(first_name="Rev", last_name="Iewer", email="rev@example.com",
+                        password=DUMMY_PASSWORD_HASH)
+        db.session.add(reviewer)
+        db.session.commit()
+        place_id = self.place.id
+        self.assertEqual(self.client.get(f'/api/v1/reviews/places/{place_id}/reviews').json, [])
+        self.client.post('/api/v1/reviews/', headers=self.auth_headers(reviewer),
+                         json={'text': 'Good', 'rating': 4, 'place_id': str(place_id)})
+        self.assertEqual(len(self.client.get(f'/api/v1/reviews/places/{place_id}/reviews').json), 1)
+        self.assertEqual(self.client.get(f'/api/v1/places/{place_id}').json['review_count'], 1)
+
+    def test_redis_backend(self):
+        cache.init_app(self.app, backend=RedisCacheBackend(FakeRedis()))
+        first = self.client.get('/api/v1/places/').json
+        with self.assertMaxQueries(0):
+            self.assertEqual(self.client.get('/api/v1/places/').json, first)
+        self.client.put(f'/api/v1/places/{first[0]["id"]}', json={'price': 75},
+                        headers=self.headers)
+        self.assertEqual(self.client.get('/api/v1/places/').json[0]['price'], 75.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from unittest import mock
+from app.api.v1 import facade
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from tests.helpers import ApiTestCase, DUMMY_PASSWORD_HASH
+
+
+class TestReviewUniqueness(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        self.reviewer = User(first_name="Rev", last_name="Iewer", email="rev@example.com",
+                             password=DUMMY_PASSWORD_HASH)
+        self.place = Place(title="Loft", description="", price=50,
+                           latitude=0, longitude=0, owner=owner)
+        db.session.add_all([owner, self.reviewer, self.place])
+        db.session.commit()
+        self.payload = {'text': 'Great', 'rating': 5, 'place_id': str(self.place.id)}
+
+    def test_has_already_reviewed_is_single_query(self):
+        self.assertFalse(facade.has_already_reviewed(self.reviewer.id, self.place.id))
+        db.session.add(Review(text="Ok", rating=3, place=self.place, user=self.reviewer))
+        db.session.commit()
+        user_id, place_id = str(self.reviewer.id), str(self.place.id)
+        with self.assertMaxQueries(1):
+            self.assertTrue(facade.has_already_reviewed(user_id, place_id))
+
+    def test_second_review_rejected(self):
+        headers = self.auth_headers(self.reviewer)
+        response = self.client.post('/api/v1/reviews/', json=self.payload, headers=headers)
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/api/v1/reviews/', json=dict(self.payload), headers=headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['error'], "You have already reviewed this place")
+
+    def test_race_closed_by_unique_constraint(self):
+        headers = self.auth_headers(self.reviewer)
+        self.client.post('/api/v1/reviews/', json=self.payload, headers=headers)
+        # Simule une requête concurrente qui a passé la vérification avant l'insertion
+        with mock.patch.object(facade, 'has_already_reviewed', side_effect=[False, True]):
+            response = self.client.post('/api/v1/reviews/', json=dict(self.payload), headers=headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['error'], "You have already reviewed this place")
+        self.assertEqual(Review.query.count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.persistence import schema_check, search_index
+from tests.helpers import InMemoryTestConfig
+
+SETUP_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'setup.sql')
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        handle, path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+
+        class MigratedConfig(InMemoryTestConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+            DB_AUTO_CREATE = False
+            METRICS_ENABLED = False
+
+        self.app = create_app(MigratedConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.addCleanup(self.ctx.pop)
+        self.addCleanup(db.engine.dispose)
+
+    def test_upgrade_builds_the_models_schema(self):
+        # Sans DB_AUTO_CREATE, rien n'est créé au démarrage
+        self.assertEqual(schema_check.describe(db.engine), {})
+
+        upgrade()
+        models = schema_check.describe(schema_check.engine_from_metadata(db.metadata))
+        self.assertEqual(schema_check.describe(db.engine), models)
+        self.assertIn(('owner_id',), models['places']['indexes'])
+        self.assertIn(('amenity_id', 'place_id'), models['place_amenity_association']['indexes'])
+        # Index plein texte créé par la migration, pas au démarrage
+        # Full-text index created by the migration, not at startup
+        self.assertTrue(search_index.install())
+
+        downgrade(revision='base')
+        self.assertEqual(schema_check.describe(db.engine), {})
+        with db.engine.connect() as connection:
+            leftovers = connection.execute(text(
+                "SELECT name FROM sqlite_master WHERE name LIKE 'places_fts%'")).scalars().all()
+        self.assertEqual(leftovers, [])
+
+
+    def seed_baseline(self, reviews):
+        """Base au schéma d'avant les migrations, avec des avis / Pre-migration schema with reviews."""
+        upgrade(revision='0001_baseline')
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO users (id, first_name, last_name, email, password, created_at, updated_at) "
+                "VALUES (1, 'A', 'B', 'a@example.com', 'x', '2024-01-01', '2024-01-01'), "
+                "(2, 'C', 'D', 'c@example.com', 'x', '2024-01-01', '2024-01-01')"))
+            connection.execute(text(
+                "INSERT INTO places (id, title, price, latitude, longitude, owner_id, created_at, updated_at) "
+                "VALUES (1, 'Loft', 50, 0, 0, 1, '2024-01-01', '2024-01-01')"))
+            for user_id, rating in reviews:
+                connection.execute(text(
+                    "INSERT INTO reviews (text, rating, place_id, user_id, created_at, updated_at) "
+                    "VALUES ('ok', :rating, 1, :user_id, '2024-01-01', '2024-01-01')"),
+                    {'rating': rating, 'user_id': user_id})
+
+    def test_baseline_database_upgrades_with_backfilled_aggregates(self):
+        self.seed_baseline([(1, 5), (2, 2)])
+        upgrade()
+        with db.engine.connect() as connection:
+            stats = connection.execute(text(
+                "SELECT review_count, rating_sum, rating_2_count, rating_5_count FROM places")).one()
+        self.assertEqual(tuple(stats), (2, 7, 1, 1))
+        with db.engine.connect() as connection:
+            hits = connection.execute(text(
+                "SELECT rowid FROM places_fts WHERE places_fts MATCH 'loft'")).scalars().all()
+        self.assertEqual(hits, [1])
+        models = schema_check.describe(schema_check.engine_from_metadata(db.metadata))
+        self.assertEqual(schema_check.describe(db.engine), models)
+
+    def test_duplicate_reviews_stop_the_upgrade(self):
+        self.seed_baseline([(1, 5), (1, 4)])
+        # Flask-Migrate journalise l'erreur et sort / Flask-Migrate logs the error and exits
+        with self.assertRaises(SystemExit):
+            upgrade()
+        with db.engine.connect() as connection:
+            version = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        self.assertEqual(version, '0001_baseline')
+
+
+class TestSchemaCheck(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(InMemoryTestConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.addCleanup(self.ctx.pop)
+        self.models = schema_check.engine_from_metadata(db.metadata)
+
+    def test_setup_sql_has_every_model_index(self):
+        with open(SETUP_SQL) as handle:
+            script = schema_check.engine_from_sql(handle.read())
+        problems = schema_check.diff_schemas(schema_check.describe(self.models),
+                                             schema_check.describe(script))
+        self.assertEqual([problem for problem in problems if 'missing from setup.sql' in problem], [])
+
+    def test_diff_reports_missing_and_extra_indexes(self):
+        script = schema_check.engine_from_sql(
+            "CREATE TABLE places (id INTEGER PRIMARY KEY, price REAL, extra TEXT);"
+            "CREATE UNIQUE INDEX ix_extra ON places (extra);")
+        problems = schema_check.diff_schemas(
+            {'places': {'columns': {'id', 'price'}, 'indexes': {('price',): False}}},
+            schema_check.describe(script))
+        self.assertEqual(problems, ["places.extra: column not in the models",
+                                    "places(extra): index not in the models",
+                                    "places(price): index missing from setup.sql"])
+
+    def test_query_log_reports_full_scans_only(self):
+        log = [
+            "Slow request GET /api/v1/places/ -> 200: 900.0 ms total, 2 queries in 880.0 ms",
+            "  [3x, 850.00 ms] SELECT places.id FROM places WHERE places.owner_id = ? AND places.id > ?",
+            "      SEARCH places USING INDEX ix_places_owner_id (owner_id=? AND rowid>?)",
+            '{"logger": "app.slow_requests", "message": "Slow request\\n'
+            '  [2x, 30.00 ms] SELECT reviews.id FROM reviews WHERE reviews.rating = ?"}',
+        ]
+        statements = schema_check.read_query_log(log)
+        self.assertEqual(list(statements.values()), [3, 2])
+
+        report = schema_check.missing_indexes(self.models, statements)
+        self.assertEqual(len(report), 1)
+        statement, executions, findings = report[0]
+        self.assertTrue(statement.startswith('SELECT reviews.id'))
+        self.assertEqual((executions, findings), (2, ['full scan of reviews (filtered on rating)']))
+
+
+if __name__ == '__main__':
+    unittest.main()
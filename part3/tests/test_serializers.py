@@ -0,0 +1,50 @@
+import json
+import unittest
+from app.extensions import db
+from app.models.user import User
+from app.models.review import Review
+from app.models.place import Place
+from app.serializers import compile_serializer, encoding
+from app.serializers.review import REVIEW_COLUMNS, serialize_review
+from tests.helpers import ApiTestCase, DUMMY_PASSWORD_HASH
+
+
+class TestCompileSerializer(unittest.TestCase):
+    def test_fields_and_expressions(self):
+        class Obj:
+            id = 3
+            name = "WiFi"
+            tags = ["a", "b"]
+
+        serialize = compile_serializer('serialize_obj', ('id', 'name', ('tag_count', 'count(o.tags)')),
+                                       count=len)
+        self.assertEqual(serialize(Obj()), {'id': 3, 'name': "WiFi", 'tag_count': 2})
+        self.assertEqual(serialize.many([Obj(), Obj()]), [serialize(Obj())] * 2)
+
+    def test_encoder_matches_stdlib(self):
+        data = [{'id': 1, 'title': "Café", 'price': 12.5, 'histogram': {'1': 0}}, None]
+        self.assertEqual(json.loads(encoding.dumps(data)), data)
+        self.assertEqual(encoding.dumps({'b': 1, 'a': 2}, sort_keys=True), b'{"a":2,"b":1}')
+
+
+class TestRowSerialization(ApiTestCase):
+    def test_rows_and_instances_serialize_alike(self):
+        owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        guest = User(first_name="Guest", last_name="Two", email="guest@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        place = Place(title="Loft", description="", price=50, latitude=0, longitude=0, owner=owner)
+        review = Review(text="Great", rating=5, place=place, user=guest)
+        db.session.add_all([owner, guest, place, review])
+        db.session.commit()
+
+        rows = db.session.execute(db.select(*[getattr(Review, c) for c in REVIEW_COLUMNS])).all()
+        self.assertEqual(serialize_review.many(rows), [serialize_review(review)])
+
+        response = self.client.get('/api/v1/reviews/')
+        self.assertEqual(response.json, [serialize_review(review)])
+        self.assertEqual(response.mimetype, 'application/json')
+
+
+if __name__ == '__main__':
+    unittest.main()
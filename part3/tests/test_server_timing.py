@@ -0,0 +1,54 @@
+import unittest
+from app.extensions import db
+from app.models.amenity import Amenity
+from tests.helpers import ApiTestCase, InMemoryTestConfig
+
+
+class TimingConfig(InMemoryTestConfig):
+    SERVER_TIMING = True
+    SLOW_REQUEST_MS = 0
+
+
+class TestServerTiming(ApiTestCase):
+    config_class = TimingConfig
+
+    def setUp(self):
+        super().setUp()
+        db.session.add_all([Amenity(name="WiFi"), Amenity(name="Pool")])
+        db.session.commit()
+
+    def test_header_reports_queries_and_phases(self):
+        response = self.client.get('/api/v1/amenities/')
+        timing = response.headers['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="1 queries"', timing)
+        for phase in ('ser;dur=', 'app;dur=', 'total;dur='):
+            self.assertIn(phase, timing)
+
+
+class SlowLogConfig(InMemoryTestConfig):
+    SERVER_TIMING = False
+    # Toute requête est « lente » / Every request is "slow"
+    SLOW_REQUEST_MS = 0.001
+
+
+class TestSlowRequestLog(ApiTestCase):
+    config_class = SlowLogConfig
+
+    def test_slow_request_logged_with_plan(self):
+        db.session.add(Amenity(name="WiFi"))
+        db.session.commit()
+        with self.assertLogs('app.slow_requests', level='WARNING') as logs:
+            response = self.client.get('/api/v1/amenities/1')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response.headers)
+        entry = logs.output[0]
+        self.assertIn('Slow request GET /api/v1/amenities/1 -> 200', entry)
+        self.assertIn('[1x, ', entry)
+        self.assertIn('FROM amenities', entry)
+        # Plan SQLite : recherche par clé primaire / SQLite plan: primary key lookup
+        self.assertIn('SEARCH amenities USING INTEGER PRIMARY KEY', entry)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from app.persistence import sqlite_pragmas
+from config import ProductionConfig
+
+PROFILE = dict(ProductionConfig.SQLITE_PRAGMAS, query_only=False)
+
+
+class TestSqlitePragmas(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.engines = []
+
+    def tearDown(self):
+        for engine in self.engines:
+            engine.dispose()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def engine(self, pragmas, url=None):
+        engine = create_engine(url or f'sqlite:///{self.path}')
+        self.engines.append(engine)
+        self.assertTrue(sqlite_pragmas.install(engine, pragmas))
+        return engine
+
+    def test_profile_applied_to_every_connection(self):
+        engine = self.engine(PROFILE)
+        with self.assertLogs('app.persistence.sqlite_pragmas', 'INFO') as logs:
+            effective = sqlite_pragmas.self_check(engine, PROFILE)
+        self.assertEqual(effective['journal_mode'], 'wal')
+        self.assertEqual((effective['synchronous'], effective['temp_store']), (1, 2))
+        self.assertEqual(effective['cache_size'], PROFILE['cache_size'])
+        self.assertNotIn('WARNING', "".join(logs.output))
+
+        # Une seconde connexion du pool reçoit aussi le profil
+        with engine.connect() as first, engine.connect() as second:
+            for connection in (first, second):
+                self.assertEqual(connection.exec_driver_sql("PRAGMA busy_timeout").scalar(), 5000)
+
+    def test_query_only_replica_rejects_writes(self):
+        with self.engine(PROFILE).begin() as connection:
+            connection.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        replica = self.engine(dict(PROFILE, query_only=True))
+        with replica.connect() as connection:
+            self.assertEqual(connection.exec_driver_sql("SELECT COUNT(*) FROM t").scalar(), 0)
+            with self.assertRaises(OperationalError):
+                connection.exec_driver_sql("INSERT INTO t VALUES (1)")
+
+    def test_self_check_warns_when_sqlite_ignores_a_value(self):
+        engine = self.engine({'journal_mode': 'WAL'}, url='sqlite://')
+        with self.assertLogs('app.persistence.sqlite_pragmas', 'WARNING'):
+            self.assertEqual(sqlite_pragmas.self_check(engine, {'journal_mode': 'WAL'}),
+                             {'journal_mode': 'memory'})
+
+    def test_invalid_profile_rejected(self):
+        engine = create_engine('sqlite://')
+        with self.assertRaises(ValueError):
+            sqlite_pragmas.install(engine, {'journal_mode': 'WAL; DROP TABLE users'})
+        with self.assertRaises(ValueError):
+            sqlite_pragmas.install(engine, {'foreign_keys': 1})
+        self.assertFalse(sqlite_pragmas.install(engine, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import unittest
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from tests.helpers import ApiTestCase, InMemoryTestConfig, DUMMY_PASSWORD_HASH
+
+NDJSON = {'Accept': 'application/x-ndjson'}
+
+
+class SmallBatchConfig(InMemoryTestConfig):
+    STREAM_BATCH_SIZE = 2
+    CACHE_TYPE = 'memory'
+
+
+class TestNdjsonStreaming(ApiTestCase):
+    config_class = SmallBatchConfig
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User(first_name="Admin", last_name="Root", email="admin@example.com",
+                          password=DUMMY_PASSWORD_HASH, is_admin=True)
+        guest = User(first_name="Guest", last_name="Two", email="guest@example.com",
+                     password=DUMMY_PASSWORD_HASH)
+        wifi = Amenity(name="WiFi")
+        db.session.add_all([self.admin, guest, wifi])
+        for i in range(5):
+            place = Place(title=f"Place {i}", description="", price=10 * (i + 1),
+                          latitude=0, longitude=0, owner=self.admin)
+            place.add_amenity(wifi)
+            db.session.add_all([place, Review(text="Nice", rating=4, place=place, user=guest)])
+        db.session.commit()
+
+    def lines(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        return [json.loads(line) for line in response.data.splitlines()]
+
+    def test_places_stream_with_filters_and_resume(self):
+        # Le cache ne doit pas servir la page JSON à une demande NDJSON
+        self.client.get('/api/v1/places/?min_price=20')
+        places = self.lines(self.client.get('/api/v1/places/?min_price=20', headers=NDJSON))
+        self.assertEqual([p['price'] for p in places], [20.0, 30.0, 40.0, 50.0])
+        self.assertTrue(all(p['amenities'] for p in places))
+
+        resumed = self.lines(self.client.get(f'/api/v1/places/?stream=1&after={places[1]["id"]}'))
+        self.assertEqual([p['id'] for p in resumed], [p['id'] for p in places[2:]])
+
+    def test_reviews_and_users_stream(self):
+        reviews = self.lines(self.client.get('/api/v1/reviews/?stream=1'))
+        self.assertEqual(len(reviews), 5)
+        self.assertEqual(set(reviews[0]), {'id', 'text', 'rating', 'user_id', 'place_id'})
+
+        users = self.lines(self.client.get('/api/v1/users/', headers=dict(NDJSON, **self.auth_headers(self.admin))))
+        self.assertEqual([u['email'] for u in users], ["admin@example.com", "guest@example.com"])
+        self.assertNotIn('password', users[0])
+
+    def test_json_remains_default(self):
+        response = self.client.get('/api/v1/reviews/', headers={'Accept': '*/*'})
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(len(response.json), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest import mock
+from app.extensions import db
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+from app.tokens import RevocationList, token_blocklist
+from tests.helpers import ApiTestCase, InMemoryTestConfig
+
+
+class TestTokenRefresh(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = User(first_name="Ada", last_name="L", email="ada@example.com", password="secret123")
+        db.session.add(user)
+        db.session.commit()
+        self.me = f'/api/v1/users/{user.id}'
+        response = self.client.post('/api/v1/auth/login',
+                                    json={'email': "ada@example.com", 'password': "secret123"})
+        self.tokens = response.json
+
+    def bearer(self, token):
+        return {'Authorization': f'Bearer {token}'}
+
+    def refresh(self, token):
+        return self.client.post('/api/v1/auth/refresh', headers=self.bearer(token))
+
+    def test_refresh_rotates_and_rejects_replay(self):
+        response = self.refresh(self.tokens['refresh_token'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.json['refresh_token'], self.tokens['refresh_token'])
+        self.assertEqual(self.refresh(self.tokens['refresh_token']).status_code, 401)
+        self.assertEqual(self.refresh(response.json['refresh_token']).status_code, 200)
+        # Un jeton d'accès ne rafraîchit pas
+        self.assertEqual(self.refresh(self.tokens['access_token']).status_code, 422)
+
+    def test_logout_revokes_access_token(self):
+        headers = self.bearer(self.tokens['access_token'])
+        self.assertEqual(self.client.get(self.me, headers=headers).status_code, 200)
+        self.assertEqual(self.client.post('/api/v1/auth/logout', headers=headers).status_code, 200)
+        # Le jeton est dans le cache de vérification mais la révocation est vérifiée
+        self.assertEqual(self.client.get(self.me, headers=headers).status_code, 401)
+
+    def test_verified_tokens_are_cached(self):
+        cache = self.app.extensions['jwt_verify_cache']
+        headers = self.bearer(self.tokens['access_token'])
+        self.client.get(self.me, headers=headers)
+        hits = cache.hits
+        self.client.get(self.me, headers=headers)
+        self.assertEqual(cache.hits, hits + 1)
+        tampered = self.tokens['access_token'][:-2] + ('AA' if not self.tokens['access_token'].endswith('AA') else 'BB')
+        self.assertEqual(self.client.get(self.me, headers=self.bearer(tampered)).status_code, 422)
+
+
+class TestRevocationList(unittest.TestCase):
+
+    def test_entries_are_evicted_when_the_token_expires(self):
+        revoked = RevocationList()
+        with mock.patch('app.tokens.time.time', return_value=1000.0):
+            revoked.add('a', 1010.0)
+            revoked.add('b', 2000.0)
+        self.assertIn('a', revoked)
+        with mock.patch('app.tokens.time.time', return_value=1500.0):
+            revoked.add('c', 3000.0)
+        self.assertNotIn('a', revoked)
+        self.assertEqual(len(revoked), 2)
+
+
+class PersistentBlocklistConfig(InMemoryTestConfig):
+    JWT_BLOCKLIST_PERSIST = True
+
+
+class TestPersistentBlocklist(ApiTestCase):
+    config_class = PersistentBlocklistConfig
+
+    def test_revocations_are_shared_through_the_table(self):
+        with self.app.test_request_context():
+            token_blocklist.revoke({'jti': 'from-this-process', 'type': 'refresh', 'exp': 4102444800})
+        self.assertEqual(RevokedToken.query.count(), 1)
+        # Un autre processus : sa liste en mémoire se remplit depuis la table
+        other = RevocationList(persist=True)
+        self.assertEqual(other.sync(db.session), 1)
+        self.assertIn('from-this-process', other)
+        self.assertEqual(other.sync(db.session), 0)
+        self.assertEqual(token_blocklist.purge_expired(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
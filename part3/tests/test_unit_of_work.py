@@ -0,0 +1,83 @@
+import unittest
+from sqlalchemy import event
+from app.api.v1 import facade
+from app.extensions import db, cache
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.unit_of_work import UnitOfWorkAborted
+from tests.helpers import ApiTestCase, InMemoryTestConfig, DUMMY_PASSWORD_HASH
+
+
+class MemoryCacheConfig(InMemoryTestConfig):
+    CACHE_TYPE = 'memory'
+
+
+class TestUnitOfWork(ApiTestCase):
+    config_class = MemoryCacheConfig
+
+    def setUp(self):
+        super().setUp()
+        self.owner = User(first_name="Owner", last_name="One", email="owner@example.com",
+                          password=DUMMY_PASSWORD_HASH)
+        self.guest = User(first_name="Guest", last_name="Two", email="guest@example.com",
+                          password=DUMMY_PASSWORD_HASH)
+        db.session.add_all([self.owner, self.guest])
+        db.session.commit()
+
+    def place_data(self, **extra):
+        return dict(dict(title="Loft", description="", price=50.0, latitude=0.0, longitude=0.0,
+                         owner_id=self.owner.id), **extra)
+
+    def test_single_commit_for_several_writes(self):
+        commits = []
+
+        def _record(conn):
+            commits.append(conn)
+
+        event.listen(db.engine, 'commit', _record)
+        try:
+            with facade.unit_of_work():
+                amenity = facade.create_amenity({'name': "WiFi"})
+                place = facade.create_place(self.place_data(amenities=[amenity.id]))
+                facade.create_review({'text': "Nice", 'rating': 4,
+                                      'user_id': self.guest.id, 'place_id': place.id})
+        finally:
+            event.remove(db.engine, 'commit', _record)
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(db.session.get(Place, place.id).review_count, 1)
+
+    def test_error_rolls_back_every_write(self):
+        with self.assertRaises(ValueError):
+            with facade.unit_of_work():
+                facade.create_amenity({'name': "WiFi"})
+                facade.create_place(self.place_data(price=-1))
+        self.assertEqual((Amenity.query.count(), Place.query.count()), (0, 0))
+
+    def test_swallowed_rollback_aborts_the_unit(self):
+        place = Place(title="Loft", description="", price=1, latitude=0, longitude=0, owner=self.owner)
+        db.session.add_all([place, Review(text="Ok", rating=3, place=place, user=self.guest)])
+        db.session.commit()
+        review = {'text': "Again", 'rating': 5, 'user_id': self.guest.id, 'place_id': place.id}
+        with self.assertRaises(UnitOfWorkAborted):
+            with facade.unit_of_work():
+                facade.create_amenity({'name': "Pool"})
+                try:
+                    facade.create_review(review)
+                except ValueError:
+                    pass
+        self.assertEqual(Amenity.query.count(), 0)
+
+    def test_cache_invalidated_after_commit_only(self):
+        self.client.get('/api/v1/amenities/')
+        versions = cache.backend.tag_versions(['amenities'])
+        with facade.unit_of_work():
+            facade.create_amenity({'name': "WiFi"})
+            self.assertEqual(cache.backend.tag_versions(['amenities']), versions)
+        self.assertNotEqual(cache.backend.tag_versions(['amenities']), versions)
+        self.assertEqual(len(self.client.get('/api/v1/amenities/').json), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -408,10 +408,32 @@ function logout() {
 // 8. INDEX PAGE - PLACES LIST
 // ============================================================================
 
-let allPlaces = [];
+/**
+ * Build the places query from the price filter and sort controls.
+ * Filtering and sorting happen on the server (keyset-paginated), not over
+ * a downloaded list.
+ * @returns {string} Query string, empty or starting with '?'
+ */
+function buildPlacesQuery() {
+    const params = new URLSearchParams();
+    const priceFilter = document.getElementById('price-filter');
+    const sortSelect = document.getElementById('sort-select');
+    
+    const maxPrice = priceFilter ? parseInt(priceFilter.value) : NaN;
+    if (!isNaN(maxPrice)) {
+        params.set('max_price', maxPrice);
+    }
+    if (sortSelect && sortSelect.value) {
+        params.set('sort', sortSelect.value);
+    }
+    
+    const query = params.toString();
+    return query ? `?${query}` : '';
+}
 
 /**
- * Fetch all places from API
+ * Fetch places from API, filtered and sorted server-side
+ * @returns {Promise<Array|null>} Places displayed, or null on error
  */
 async function fetchPlaces() {
     const loadingElement = document.getElementById('loading');
@@ -419,7 +441,7 @@ async function fetchPlaces() {
     const placesListElement = document.getElementById('places-list');
     const emptyState = document.getElementById('empty-state');
     
-    if (!placesListElement) return;
+    if (!placesListElement) return null;
     
     showLoading('loading');
     hideMessage('error');
@@ -429,18 +451,19 @@ async function fetchPlaces() {
     placesListElement.innerHTML = createSkeletonPlaceCards(6);
     
     try {
-        const places = await apiRequest('/places/', {
+        const places = await apiRequest(`/places/${buildPlacesQuery()}`, {
             method: 'GET',
             skipAuth: true
         });
         
-        allPlaces = places;
         displayPlaces(places);
         updatePlacesCount(places.length);
+        return places;
     } catch (error) {
         console.error('Error fetching places:', error);
         showMessage('error', 'Failed to load places. Please try again later.');
         placesListElement.innerHTML = '';
+        return null;
     } finally {
         hideLoading('loading');
     }
@@ -545,39 +568,19 @@ function updatePlacesCount(count) {
 }
 
 /**
- * Filter places by price
+ * Filter places by price (server-side max_price)
  */
-function filterPlacesByPrice() {
+async function filterPlacesByPrice() {
     const priceFilter = document.getElementById('price-filter');
     if (!priceFilter) return;
     
-    const selectedValue = priceFilter.value;
-    
-    // If 'all' is selected, show all places
-    if (selectedValue === 'all') {
-        displayPlaces(allPlaces);
-        updatePlacesCount(allPlaces.length);
-        return;
-    }
-    
-    const maxPrice = parseInt(selectedValue);
-    
-    if (isNaN(maxPrice)) {
-        displayPlaces(allPlaces);
-        updatePlacesCount(allPlaces.length);
-        return;
-    }
-    
-    const filteredPlaces = allPlaces.filter(place => {
-        const price = place.price || place.price_per_night || 0;
-        return price <= maxPrice;
-    });
-    
-    displayPlaces(filteredPlaces);
-    updatePlacesCount(filteredPlaces.length);
+    const places = await fetchPlaces();
+    const maxPrice = parseInt(priceFilter.value);
     
     // Show toast notification
-    showToast(`Showing places up to ${formatPrice(maxPrice)} per night`, 'info', 2000);
+    if (places && !isNaN(maxPrice)) {
+        showToast(`Showing places up to ${formatPrice(maxPrice)} per night`, 'info', 2000);
+    }
 }
 
 /**
@@ -593,6 +596,11 @@ function initIndexPage() {
     if (priceFilter) {
         priceFilter.addEventListener('change', filterPlacesByPrice);
     }
+    
+    const sortSelect = document.getElementById('sort-select');
+    if (sortSelect) {
+        sortSelect.addEventListener('change', fetchPlaces);
+    }
 }
 
 // ============================================================================
@@ -655,6 +663,9 @@ async function displayPlaceDetails(place) {
     document.getElementById('place-latitude').textContent = place.latitude || 'N/A';
     document.getElementById('place-longitude').textContent = place.longitude || 'N/A';
     
+    // Display review statistics (aggregated server-side)
+    updateReviewStats(place);
+    
     // Fetch and display reviews
     await fetchAndDisplayReviews(place.id);
     
@@ -756,9 +767,6 @@ function displayReviews(reviews) {
     }
     
     reviewsList.innerHTML = reviews.map(review => createReviewCard(review)).join('');
-    
-    // Update review statistics
-    updateReviewStats(reviews);
 }
 
 /**
@@ -793,24 +801,24 @@ function createReviewCard(review) {
 }
 
 /**
- * Update review statistics
- * @param {Array} reviews - Array of reviews
+ * Update review statistics from the aggregates carried by the place
+ * @param {Object} place - Place object (review_count, average_rating)
  */
-function updateReviewStats(reviews) {
+function updateReviewStats(place) {
     const averageRatingElement = document.getElementById('average-rating');
     const totalReviewsElement = document.getElementById('total-reviews');
     
-    if (!reviews || reviews.length === 0) return;
+    const reviewCount = place.review_count || 0;
+    if (reviewCount === 0 || place.average_rating == null) return;
     
-    const totalRating = reviews.reduce((sum, review) => sum + (review.rating || 0), 0);
-    const averageRating = (totalRating / reviews.length).toFixed(1);
+    const averageRating = Number(place.average_rating).toFixed(1);
     
     if (averageRatingElement) {
         averageRatingElement.textContent = `${averageRating} ★`;
     }
     
     if (totalReviewsElement) {
-        totalReviewsElement.textContent = `(${reviews.length} ${reviews.length === 1 ? 'review' : 'reviews'})`;
+        totalReviewsElement.textContent = `(${reviewCount} ${reviewCount === 1 ? 'review' : 'reviews'})`;
     }
 }
 